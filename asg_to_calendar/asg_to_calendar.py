@@ -10,10 +10,14 @@
 import logging
 from logger import logger as log
 
-from settings import COMMANDS, PROMPTS
+from settings import COMMANDS, PROMPTS, JOBS, RATE_LIMIT, RETRY_BUDGET, init_dirs
+from settings import CSV_ENGINES, CSV_ENGINE, OUTPUT_FORMATS, OUTPUT_FORMAT, TIMEZONE
+from settings import CALENDAR_ID, INGEST_PROCESSES
 
 import argparse
 
+import time
+
 # Calendar methods
 from events import Events
 
@@ -25,6 +29,7 @@ from rich import print
 
 # Display functions
 from events import display_cmds, display_error, display_panel, display_prompt
+from events import benchmark_engines
 from events import Events, ExitProgram
 
 
@@ -36,18 +41,36 @@ from events import Events, ExitProgram
 
 # ::CORE LOGIC --------------------------------------------------------------------- #
 def main(
-    verbose: str = False
+    verbose: str = False,
+    jobs: int = JOBS,
+    rate_limit: float = RATE_LIMIT,
+    retry_budget: int = RETRY_BUDGET,
+    csv_engine: str = CSV_ENGINE,
+    output_format: str = OUTPUT_FORMAT,
+    timezone: str | None = TIMEZONE,
+    calendar_id: str = CALENDAR_ID,
+    processes: int = INGEST_PROCESSES
 ):
     '''
     Driver for program14, providing CLI to user for Calendar methods
     ---
     Args:
         verbose (str): Enables debugging logs.  Defaults to false
+        jobs (int): Worker threads used to send create/delete batches
+        rate_limit (float): Calendar requests per second across all workers
+        retry_budget (int): Rate limit/server errors retried before giving up
+        csv_engine (str): Parser used to import csv files
+        output_format (str): "json", "jsonl" or "archive" for saved event files
+        timezone (str | None): IANA zone for json due dates, None for local time
+        calendar_id (str): Calendar the commands read from and write to
+        processes (int): Worker processes parsing files for the ingest command
     Returns:
         None
     '''
     # ::Parse Args ---------------------------------------------------------------- #
-    if args.verbose:
+    init_dirs()
+
+    if verbose:
         log.setLevel(logging.DEBUG)
         log.debug('Verbose mode has been selected. Switching to logging.DEBUG level')
 
@@ -71,19 +94,65 @@ def main(
     except ExitProgram:
         user_cmd = choices[-1]
 
+    # One Calendar object is shared by every command in the session. It is only
+    # created by the first command that needs it, so "help" and "exit" start fast.
+    service = None
+
+    def benchmark() -> bool:
+        # Times the csv engines locally, then uses the fastest for later imports
+        nonlocal csv_engine
+        engine = benchmark_engines()
+
+        if engine is None:
+            return False
+
+        csv_engine = engine
+
+        if service is not None:
+            service.csv_engine = engine
+
+        return True
+
+    # Commands that run without a Calendar connection
+    local_cmds = {
+        'display_cmds': lambda: display_cmds() or True,
+        'benchmark_engines': benchmark
+    }
+
     # Continue while choice != 'exit'
     while user_cmd != choices[-1]:
         success: bool = False
         args = None
+        method = commands[user_cmd]['method']
+        started = time.perf_counter()
 
-        # Initialize Calendar object
-        try:
-            service = Events()
-        except HttpError as e:
-            log.debug(e, stack_info=True, exc_info=True)
+        if method in local_cmds:
+            call_method = local_cmds[method]
+        else:
+            if service is None:
+                try:
+                    service = Events(
+                        jobs=jobs,
+                        rate_limit=rate_limit,
+                        retry_budget=retry_budget,
+                        csv_engine=csv_engine,
+                        output_format=output_format,
+                        timezone=timezone,
+                        calendar_id=calendar_id,
+                        processes=processes
+                    )
+                    log.debug(
+                        'Setup: ' + ', '.join(
+                            f'{step} {secs:.3f}s' for step, secs in service.timings.items()
+                        )
+                    )
+                except HttpError as e:
+                    log.debug(e, stack_info=True, exc_info=True)
+                    display_error('Could not connect to Google Calendar')
+                    break
 
-        # Retrieve the Events method
-        call_method = getattr(service, commands[user_cmd]['method'])
+            # Retrieve the Events method
+            call_method = getattr(service, method)
 
         try:
             success = call_method()
@@ -97,6 +166,8 @@ def main(
             log.debug(e, stack_info=True, exc_info=True)
             display_error('Exception occured. Try again')
 
+        log.debug(f'Command "{user_cmd}" took {time.perf_counter() - started:.3f}s')
+
         if success:
             title = 'Process Completed'
             msg_style = 'bright_green'
@@ -148,4 +219,41 @@ def main(
 
 # ::EXECUTE ------------------------------------------------------------------------ #
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Adds assignments to a Google Calendar')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enables debugging logs')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=JOBS,
+        help=f'Worker threads used to send create/delete batches (default: {JOBS})'
+    )
+    parser.add_argument(
+        '-r', '--rate', type=float, default=RATE_LIMIT,
+        help=f'Calendar requests per second, 0 for no limit (default: {RATE_LIMIT})'
+    )
+    parser.add_argument(
+        '--retry-budget', type=int, default=RETRY_BUDGET,
+        help=f'Rate limit/server errors to retry per run (default: {RETRY_BUDGET})'
+    )
+    parser.add_argument(
+        '-e', '--engine', choices=CSV_ENGINES, default=CSV_ENGINE,
+        help=f'Parser used to import csv files (default: {CSV_ENGINE})'
+    )
+    parser.add_argument(
+        '-o', '--output-format', choices=OUTPUT_FORMATS, default=OUTPUT_FORMAT,
+        help=f'Format of saved event files (default: {OUTPUT_FORMAT})'
+    )
+    parser.add_argument(
+        '-z', '--timezone', default=TIMEZONE,
+        help='IANA time zone for gradebook due dates, e.g. America/Chicago (default: local)'
+    )
+    parser.add_argument(
+        '-c', '--calendar-id', default=CALENDAR_ID,
+        help=f'Calendar to read from and write to (default: {CALENDAR_ID})'
+    )
+    parser.add_argument(
+        '-p', '--processes', type=int, default=INGEST_PROCESSES,
+        help=f'Worker processes parsing files for ingest (default: {INGEST_PROCESSES})'
+    )
+    args = parser.parse_args()
+
+    main(args.verbose, args.jobs, args.rate, args.retry_budget, args.engine,
+         args.output_format, args.timezone, args.calendar_id, args.processes)
\ No newline at end of file
@@ -0,0 +1,4 @@
+from .events import Events, ExitProgram
+from .events import display_cmds, display_error, display_panel, display_prompt
+from .events import benchmark_engines
+from .credentials import AuthRequired
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# Program Name:         archive.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Compressed event archives with an index by event id, course and start date,
+#   so single events can be read without decompressing the whole archive
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import gzip
+
+import json
+
+import os
+
+import zlib
+
+from typing import Generator, Iterable
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+class ArchiveWriter:
+    '''
+    Writes events as gzip members of block_size events each, one JSON object
+    per line. Concatenated gzip members are a valid gzip file, so the archive
+    still reads with zcat. close() writes the gzipped JSON index next to it
+    (path + ".idx").
+    ---
+    Args:
+        path (str): Archive file, e.g. "output/events.jsonl.gz"
+        block_size (int): Events per compressed block
+    '''
+    def __init__(self, path: str, block_size: int = 1000) -> None:
+        self.path = path
+        self.block_size = max(1, block_size)
+        self.count = 0
+        self.__tmp_path = path + '.tmp'
+        self.__file = open(self.__tmp_path, 'wb')
+        self.__block: list[bytes] = []
+        self.__dates: list[str] = []
+        self.__index = {'version': 1, 'blocks': [], 'ids': {}, 'courses': {}}
+
+    def __enter__(self) -> 'ArchiveWriter':
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.__file.close()
+            os.remove(self.__tmp_path)
+
+    def write(self, events: Iterable[dict]) -> int:
+        '''
+        Adds events to the archive, compressing each block as it fills
+        ---
+        Returns
+            count (int): Number of events written
+        '''
+        count = 0
+
+        for event in events:
+            block = len(self.__index['blocks'])
+
+            if event.get('id'):
+                self.__index['ids'][event['id']] = block
+
+            course = event_course(event)
+            blocks = self.__index['courses'].setdefault(course, [])
+
+            if not blocks or blocks[-1] != block:
+                blocks.append(block)
+
+            self.__block.append(
+                json.dumps(event, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            )
+            self.__dates.append(event_date(event))
+            count += 1
+
+            if len(self.__block) >= self.block_size:
+                self.__flush()
+
+        self.count += count
+
+        return count
+
+    def close(self) -> None:
+        '''
+        Compresses the last block and swaps the archive and its index in
+        '''
+        if self.__file.closed:
+            return
+
+        self.__flush()
+        self.__file.close()
+
+        tmp_index = self.path + '.idx.tmp'
+
+        with gzip.open(tmp_index, 'wt', encoding='utf-8') as out_file:
+            json.dump(self.__index, out_file, separators=(',', ':'))
+
+        os.replace(self.__tmp_path, self.path)
+        os.replace(tmp_index, self.path + '.idx')
+
+    def __flush(self) -> None:
+        '''
+        Writes the pending events as one gzip member and records where it is
+        '''
+        if not self.__block:
+            return
+
+        data = gzip.compress(b'\n'.join(self.__block) + b'\n', mtime=0)
+        dates = [date for date in self.__dates if date]
+
+        self.__index['blocks'].append({
+            'offset': self.__file.tell(),
+            'length': len(data),
+            'count': len(self.__block),
+            'first': min(dates, default=''),
+            'last': max(dates, default='')
+        })
+        self.__file.write(data)
+        self.__block = []
+        self.__dates = []
+
+
+class ArchiveReader:
+    '''
+    Reads events from an archive, decompressing only the blocks the index
+    says can hold a match
+    ---
+    Args:
+        path (str): Archive file written by ArchiveWriter
+    '''
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+        with gzip.open(path + '.idx', 'rt', encoding='utf-8') as in_file:
+            self.index: dict = json.load(in_file)
+
+    def __len__(self) -> int:
+        return sum(block['count'] for block in self.index['blocks'])
+
+    def courses(self) -> list[str]:
+        '''
+        Returns the course keys in the archive
+        '''
+        return sorted(self.index['courses'])
+
+    def get(self, ids: Iterable[str]) -> list[dict]:
+        '''
+        Returns the events with the given ids, reading each needed block once
+        '''
+        wanted = set(ids)
+        blocks = sorted({self.index['ids'][id] for id in wanted if id in self.index['ids']})
+
+        return [event for event in self.__read(blocks) if event.get('id') in wanted]
+
+    def find(
+        self,
+        course: str | None = None,
+        start: str | None = None,
+        end: str | None = None
+    ) -> Generator[dict, None, None]:
+        '''
+        Yields events of a course and/or starting within [start, end]
+        ---
+        Args:
+            course (str | None): Course key, the summary prefix before ": "
+            start (str | None): First start date to include, "yyyy-mm-dd"
+            end (str | None): Last start date to include, "yyyy-mm-dd"
+        Returns
+            (Generator[dict, None, None]): Matching events in archive order
+        '''
+        if course is not None:
+            blocks = self.index['courses'].get(course, [])
+        else:
+            blocks = range(len(self.index['blocks']))
+
+        blocks = [
+            block for block in blocks
+            if (start is None or self.index['blocks'][block]['last'] >= start)
+            and (end is None or self.index['blocks'][block]['first'] <= end)
+        ]
+
+        for event in self.__read(blocks):
+            date = event_date(event)
+
+            if course is not None and event_course(event) != course:
+                continue
+            if (start is not None and date < start) or (end is not None and date > end):
+                continue
+
+            yield event
+
+    def __read(self, blocks: Iterable[int]) -> Generator[dict, None, None]:
+        '''
+        Seeks to and decompresses each block, yielding its events. A block cut
+        short (e.g. the archive was copied while being written) raises a
+        ValueError; the blocks before it still read.
+        '''
+        with open(self.path, 'rb') as in_file:
+            for block in blocks:
+                entry = self.index['blocks'][block]
+                in_file.seek(entry['offset'])
+                raw = in_file.read(entry['length'])
+
+                try:
+                    if len(raw) < entry['length']:
+                        raise EOFError(f'{len(raw)} of {entry["length"]} bytes')
+                    data = gzip.decompress(raw)
+                except (EOFError, gzip.BadGzipFile, zlib.error) as error:
+                    raise ValueError(
+                        f'Archive "{self.path}" is truncated or corrupt at block {block}: {error}'
+                    ) from error
+
+                for line in data.splitlines():
+                    if line:
+                        yield json.loads(line)
+
+
+# ::Functions --------------------------------------------------------------------- #
+def event_course(event: dict) -> str:
+    '''
+    Returns the course key of an event, the part of its summary before ": "
+    '''
+    summary = event.get('summary') or ''
+    return summary.split(': ', 1)[0] if ': ' in summary else ''
+
+def event_date(event: dict) -> str:
+    '''
+    Returns the start date of an event as "yyyy-mm-dd"
+    '''
+    start = event.get('start') or {}
+    return (start.get('date') or start.get('dateTime') or '')[:10]
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# Program Name:         cache.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Local copy of calendar events, kept current with Calendar sync tokens
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import heapq
+
+import json
+
+import os
+
+from datetime import datetime, timedelta, time
+
+from typing import Iterable
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+class EventCache:
+    '''
+    Events from one calendar and the sync token to fetch the next changes with
+    ---
+    Args:
+        path (str): JSON file the cache is loaded from and saved to
+    '''
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.sync_token: str | None = None
+        self.events: dict[str, dict] = {}
+
+        try:
+            with open(path, 'r', encoding='utf-8') as in_file:
+                data = json.load(in_file)
+                self.sync_token = data.get('sync_token')
+                self.events = data.get('events', {})
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            # A damaged cache is rebuilt by the next full sync
+            pass
+
+    def clear(self) -> None:
+        '''
+        Drops every event and the sync token, forcing a full sync
+        '''
+        self.sync_token = None
+        self.events = {}
+
+    def apply(self, changes: Iterable[dict]) -> int:
+        '''
+        Applies changed events from a list response. Cancelled events are removed.
+        ---
+        Args:
+            changes (Iterable[dict]): Event resources from the "items" of a page
+        Returns
+            count (int): Number of changes applied
+        '''
+        count = 0
+
+        for event in changes:
+            if event.get('status') == 'cancelled':
+                self.events.pop(event['id'], None)
+            else:
+                self.events[event['id']] = event
+            count += 1
+
+        return count
+
+    def upcoming(self, time_min: str, limit: int | None = None) -> list[dict]:
+        '''
+        Returns cached events that end after time_min, ordered by start, like
+        the timeMin filter of a list call. Times are compared as aware datetimes,
+        with all-day events running from local midnight to local midnight.
+        ---
+        Args:
+            time_min (str): RFC3339 timestamp, e.g. now in UTC
+            limit (int | None): Number of events to return. None returns every event
+        Returns
+            upcoming (list[dict]): Event resources ordered by start
+        '''
+        now = parse_time(time_min)
+        upcoming = (event for event in self.events.values() if event_end(event) > now)
+
+        # Only the first limit events are kept and sorted
+        if limit:
+            return heapq.nsmallest(limit, upcoming, key=event_start)
+
+        return sorted(upcoming, key=event_start)
+
+    def save(self) -> None:
+        '''
+        Writes the cache to a temporary file and swaps it in, so a crash never
+        leaves a half-written cache behind
+        '''
+        tmp_path = self.path + '.tmp'
+
+        with open(tmp_path, 'w', encoding='utf-8') as out_file:
+            json.dump(
+                {'sync_token': self.sync_token, 'events': self.events},
+                out_file,
+                ensure_ascii=False
+            )
+
+        os.replace(tmp_path, self.path)
+
+
+# ::Functions --------------------------------------------------------------------- #
+def event_start(event: dict) -> datetime:
+    '''
+    Returns the start of an event as an aware datetime, for both all-day and
+    timed events
+    '''
+    start = event.get('start', {})
+
+    if 'dateTime' in start:
+        return parse_time(start['dateTime'])
+    if 'date' in start:
+        return local_midnight(start['date'])
+
+    return datetime.min.replace(tzinfo=datetime.now().astimezone().tzinfo)
+
+def event_end(event: dict) -> datetime:
+    '''
+    Returns the end of an event as an aware datetime. All-day events end at
+    midnight after their last day, even if their end date equals the start date.
+    '''
+    end = event.get('end', {})
+    start = event_start(event)
+
+    if 'dateTime' in end:
+        return max(parse_time(end['dateTime']), start)
+    if 'date' in end:
+        return max(local_midnight(end['date']), start + timedelta(days=1))
+
+    return start + timedelta(days=1) if 'date' in event.get('start', {}) else start
+
+def parse_time(value: str) -> datetime:
+    '''
+    Parses an RFC3339 timestamp. Timestamps without an offset are local time.
+    '''
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone()
+
+def local_midnight(value: str) -> datetime:
+    '''
+    Returns the local midnight starting a "yyyy-mm-dd" date
+    '''
+    day = datetime.strptime(value[:10], '%Y-%m-%d').date()
+    return datetime.combine(day, time.min).astimezone()
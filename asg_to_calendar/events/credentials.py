@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# Program Name:         credentials.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Loads Google Calendar API credentials on demand and refreshes them before
+#   they expire, from one thread at a time
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+from __future__ import annotations
+
+import os
+
+import threading
+
+from datetime import datetime, timedelta, timezone
+
+from typing import TYPE_CHECKING
+
+# The google auth stack is slow to import, so it is imported on first use
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+class AuthRequired(Exception):
+    ''' Raised when there is no usable token and the OAuth flow is not allowed '''
+    pass
+
+class CredentialManager:
+    '''
+    Shares one set of credentials between threads. The token file is only read
+    when credentials are first needed, and the token is refreshed refresh_margin
+    seconds before it expires so long runs never send a request with an
+    expired token. One thread refreshes while the others wait for the result.
+    ---
+    Args:
+        token_file (str): Stores the user's access and refresh tokens
+        client_secrets (str): OAuth client file used when there is no usable token
+        scopes (list[str]): Scopes requested by the OAuth flow
+        refresh_margin (int): Seconds before expiry at which to refresh
+        allow_flow (bool): Open the browser OAuth flow when there is no usable
+            token. Headless runs pass False and get AuthRequired instead.
+    '''
+    def __init__(
+        self,
+        token_file: str,
+        client_secrets: str,
+        scopes: list[str],
+        refresh_margin: int = 300,
+        allow_flow: bool = True
+    ) -> None:
+        self.__token_file = token_file
+        self.__client_secrets = client_secrets
+        self.__scopes = scopes
+        self.__margin = timedelta(seconds=refresh_margin)
+        self.__allow_flow = allow_flow
+        self.__creds: Credentials | None = None
+        self.__lock = threading.Lock()
+
+    def get(self) -> Credentials:
+        '''
+        Returns valid credentials, loading, refreshing or running the OAuth flow
+        as needed
+        '''
+        creds = self.__creds
+
+        if creds is not None and not self.__needs_refresh(creds):
+            return creds
+
+        from google.auth.transport.requests import Request
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.oauth2.credentials import Credentials
+
+        with self.__lock:
+            # Another thread may have refreshed while this one waited
+            if self.__creds is None and os.path.exists(self.__token_file):
+                self.__creds = Credentials.from_authorized_user_file(
+                    self.__token_file, self.__scopes
+                )
+
+            creds = self.__creds
+
+            if creds is None or self.__needs_refresh(creds):
+                if creds and creds.refresh_token:
+                    creds.refresh(Request())
+                elif not self.__allow_flow:
+                    raise AuthRequired(
+                        f'No usable token in "{self.__token_file}". Log in once with '
+                        f'the interactive CLI before running headless.'
+                    )
+                else:
+                    flow = InstalledAppFlow.from_client_secrets_file(
+                        self.__client_secrets, self.__scopes
+                    )
+                    creds = flow.run_local_server(port=0)
+
+                self.__save(creds)
+                self.__creds = creds
+
+            return creds
+
+    def __needs_refresh(self, creds: Credentials) -> bool:
+        '''
+        Checks if the token is missing, invalid or about to expire
+        '''
+        if not creds.token or not creds.valid:
+            return True
+
+        if creds.expiry is None:
+            return False
+
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        return creds.expiry - self.__margin <= now
+
+    def __save(self, creds: Credentials) -> None:
+        '''
+        Writes the token to a temporary file and swaps it in, so an interrupted
+        write never corrupts token.json
+        '''
+        tmp_file = self.__token_file + '.tmp'
+
+        with open(tmp_file, 'w') as token:
+            token.write(creds.to_json())
+
+        os.replace(tmp_file, self.__token_file)
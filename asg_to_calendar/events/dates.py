@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# Program Name:         dates.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Infers the due_date format of a csv file, remembers it per file and parses
+#   date columns once per distinct value. Converts UTC due timestamps to local
+#   dates the same way.
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+from __future__ import annotations
+
+import csv
+
+import json
+
+import os
+
+from datetime import datetime
+
+from itertools import islice
+
+from typing import Iterable, TYPE_CHECKING
+
+# pandas is slow to import, so it is imported on first parse
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# ::GLOBALS ------------------------------------------------------------------------ #
+# Matches ISO 8601 timestamps that carry a UTC offset or "Z"
+UTC_OFFSET: str = r'T.*(?:[zZ]|[+-]\d{2}(?::?\d{2})?)$'
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+class DateFormatCache:
+    '''
+    Date formats of csv files, keyed by absolute path. An entry is only used
+    while the file's size and modification time are unchanged.
+    ---
+    Args:
+        path (str): JSON file the cache is loaded from and saved to
+    '''
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.formats: dict[str, dict] = {}
+
+        try:
+            with open(path, 'r', encoding='utf-8') as in_file:
+                self.formats = json.load(in_file)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            # A damaged cache only costs one inference per file
+            pass
+
+    def get(self, csv_file: str) -> str | None:
+        '''
+        Returns the cached format of csv_file, or None if it is unknown or stale
+        '''
+        entry = self.formats.get(os.path.abspath(csv_file))
+
+        if entry is None or entry.get('stamp') != file_stamp(csv_file):
+            return None
+
+        return entry.get('format')
+
+    def set(self, csv_file: str, date_format: str) -> None:
+        '''
+        Remembers the format of csv_file and saves the cache
+        '''
+        self.formats[os.path.abspath(csv_file)] = {
+            'stamp': file_stamp(csv_file),
+            'format': date_format
+        }
+        self.save()
+
+    def discard(self, csv_file: str) -> None:
+        '''
+        Forgets the format of csv_file, e.g. after it failed to parse
+        '''
+        if self.formats.pop(os.path.abspath(csv_file), None) is not None:
+            self.save()
+
+    def save(self) -> None:
+        '''
+        Writes the cache to a temporary file and swaps it in
+        '''
+        tmp_path = self.path + '.tmp'
+
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as out_file:
+                json.dump(self.formats, out_file, indent=4)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # Inference still works without an on-disk cache
+            pass
+
+
+class DueDateConverter:
+    '''
+    Converts ISO 8601 UTC timestamps, e.g. Blackboard "grading.due" values, into
+    local "yyyy-mm-dd" dates. Each distinct timestamp is converted once: new
+    ones are parsed and shifted to the zone in one vectorized pass per call,
+    and every result is remembered for later calls. Timestamps without an
+    offset are already local to the zone, as fromisoformat().astimezone() read
+    them, so they keep their own date.
+    ---
+    Args:
+        zone (str | None): IANA zone name, or None for the system's local zone
+    '''
+    def __init__(self, zone: str | None = None) -> None:
+        self.zone = resolve_zone(zone)
+        self.dates: dict[str, str] = {}
+
+    def convert(self, values: list[str | None]) -> list[str | None]:
+        '''
+        Returns the local date of each value, or None where a value is empty
+        '''
+        new = {value for value in values if value and value not in self.dates}
+
+        if new:
+            import pandas as pd
+
+            stamps = pd.Series(list(new))
+            aware = stamps.str.contains(UTC_OFFSET)
+            local = pd.Series('', index=stamps.index)
+
+            if aware.any():
+                local[aware] = (
+                    pd.to_datetime(stamps[aware], utc=True, format='ISO8601')
+                    .dt.tz_convert(self.zone)
+                    .dt.strftime('%Y-%m-%d')
+                )
+
+            if not aware.all():
+                local[~aware] = (
+                    pd.to_datetime(stamps[~aware], format='ISO8601')
+                    .dt.tz_localize(self.zone, ambiguous=True, nonexistent='shift_forward')
+                    .dt.strftime('%Y-%m-%d')
+                )
+
+            self.dates.update(zip(stamps, local))
+
+        dates = self.dates
+        return [dates[value] if value else None for value in values]
+
+
+# ::Functions --------------------------------------------------------------------- #
+def file_stamp(path: str) -> list[int]:
+    '''
+    Returns [size, mtime_ns] of a file, used to notice when it changed
+    '''
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def sample_column(csv_file: str, column: str, size: int, max_rows: int = 100_000) -> list[str]:
+    '''
+    Returns up to size distinct, non-empty values of a csv column, reading at
+    most max_rows rows
+    '''
+    values: dict[str, None] = {}
+
+    with open(csv_file, 'r', newline='', encoding='utf-8') as in_file:
+        for row in islice(csv.DictReader(in_file), max_rows):
+            value = (row.get(column) or '').strip()
+
+            if value:
+                values[value] = None
+
+                if len(values) >= size:
+                    break
+
+    return list(values)
+
+def infer_date_format(values: Iterable[str], formats: Iterable[str]) -> str | None:
+    '''
+    Returns the first format in formats that parses every value, or None
+    ---
+    Args:
+        values (Iterable[str]): Sampled date strings
+        formats (Iterable[str]): strftime formats to try, in order of preference
+    Returns
+        date_format (str | None): The matching format
+    '''
+    values = list(values)
+
+    if not values:
+        return None
+
+    for date_format in formats:
+        try:
+            for value in values:
+                datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+        return date_format
+
+    return None
+
+def parse_dates(column: pd.Series, date_format: str) -> pd.Series:
+    '''
+    Parses a column of date strings in one vectorized pass over its distinct
+    values, then maps the results back onto every row. Assignments share a few
+    dozen due dates, so this parses far fewer strings than the column holds.
+    Values are stripped first, the same as sample_column, so the format inferred
+    from a sample parses the column. Raises ValueError if a value does not match
+    date_format.
+    '''
+    import pandas as pd
+
+    if column.empty:
+        # Mapping onto an empty column fails on some dtypes; there is nothing to parse
+        return pd.to_datetime(column, format=date_format)
+
+    column = column.str.strip()
+    uniques = column.dropna().unique()
+    parsed = pd.Series(pd.to_datetime(uniques, format=date_format), index=uniques)
+
+    return column.map(parsed)
+
+def resolve_zone(name: str | None):
+    '''
+    Returns the tzinfo for an IANA zone name such as "America/Chicago", or the
+    system's local zone (with its DST rules) when name is empty
+    '''
+    if name:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+
+    from dateutil.tz import tzlocal
+    return tzlocal()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# Program Name:         engine.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Runs Calendar batch jobs on a bounded pool of worker threads, and file
+#   parsing on a pool of worker processes
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+from collections import deque
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from typing import Callable, Generator, Iterable
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def ordered_map(
+    func: Callable,
+    iterable: Iterable,
+    jobs: int = 1
+) -> Generator:
+    '''
+    Applies func to every item on a pool of worker threads and yields the
+    results in input order. At most 2 * jobs items are in flight, so a generator
+    is only read as fast as the workers can keep up.
+    ---
+    Args:
+        func (Callable): Function to run on each item
+        iterable (Iterable): Items to process
+        jobs (int): Number of worker threads. 1 runs everything on the caller's thread
+    Returns
+        (Generator): func(item) for each item, in input order
+    '''
+    if jobs <= 1:
+        yield from map(func, iterable)
+        return
+
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='events') as pool:
+        yield from bounded_map(pool, func, iterable, jobs * 2)
+
+def process_map(
+    func: Callable,
+    iterable: Iterable,
+    processes: int = 1
+) -> Generator:
+    '''
+    Like ordered_map, on a pool of worker processes, for CPU-bound work such as
+    parsing files. func, its items and its results must be picklable, so func
+    has to be a module-level function.
+    ---
+    Args:
+        func (Callable): Function to run on each item
+        iterable (Iterable): Items to process
+        processes (int): Number of worker processes. 1 runs everything in the
+            caller's process
+    Returns
+        (Generator): func(item) for each item, in input order
+    '''
+    if processes <= 1:
+        yield from map(func, iterable)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        yield from bounded_map(pool, func, iterable, processes * 2)
+
+def bounded_map(pool: Executor, func: Callable, iterable: Iterable, depth: int) -> Generator:
+    '''
+    Submits func(item) to pool for every item, keeping at most depth in
+    flight, and yields the results in input order
+    '''
+    pending = deque()
+
+    for item in iterable:
+        pending.append(pool.submit(func, item))
+
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
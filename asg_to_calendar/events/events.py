@@ -6,32 +6,78 @@
 #   Create an Events object that allows read and edit actions for Events
 
 # ::IMPORTS ------------------------------------------------------------------------ #
+from __future__ import annotations
+
 from logger import logger as log
 
 from datetime import datetime, timezone
 
-from settings import CREDS, SCOPES, SERVICE_NAME, SERVICE_VERSION, CSV_FIELDS, EVENT_MAP
+from settings import SCOPES, SERVICE_NAME, SERVICE_VERSION, CSV_FIELDS, EVENT_MAP
 from settings import FILE_MAP, COMMANDS, STRFTIME_COLS, STRFTIME_ROWS, PROMPTS, EVENTS_OUTFILE
-
-from typing import Generator
-
-# Manipulating csv file
-import pandas as pd
+from settings import SYNC_DB, EVENT_CACHE, LIST_PAGE_SIZE, LIST_FIELDS, DISCOVERY_CACHE
+from settings import SYNC_FIELDS
+from settings import TOKEN_FILE, CLIENT_SECRETS_FILE, TOKEN_REFRESH_MARGIN
+from settings import BATCH_SIZE, MAX_BATCH_SIZE, JOBS
+from settings import RATE_LIMIT, RATE_BURST, MAX_RETRIES, RETRY_BUDGET
+from settings import CSV_CHUNK_SIZE, CSV_ENGINES, CSV_ENGINE
+from settings import DATE_FORMATS, DATE_SAMPLE_SIZE, DATE_FORMAT_CACHE, JSON_PREVIEW_ITEMS
+from settings import OUTPUT_FORMAT, OUTPUT_SUFFIXES, EVENTS_JOURNAL, FSYNC_EVERY
+from settings import ARCHIVE_BLOCK_SIZE, TIMEZONE, JSON_CHUNK_SIZE, EVENT_FIELDS
+from settings import CALENDAR_ID, INGEST_PROCESSES, JSONL_RANGE_SIZE
+from settings import PREVIEW_HEAD, PREVIEW_TAIL, PREVIEW_SAMPLE, PREVIEW_PAGE_SIZE, PREVIEW_COURSES
+
+from events.engine import ordered_map, process_map
+from events.ratelimit import RateLimiter, RetryPolicy, is_retryable
+from events.sync import SyncStore, SyncPlan, plan_sync
+from events.cache import EventCache
+from events.service import build_service
+from events.credentials import CredentialManager
+from events.jsonstream import read_array, gradebook_fields, read_jsonl, write_jsonl
+from events.jsonstream import jsonl_ranges
+from events.sink import EventSink
+from events.archive import ArchiveReader
+from events.model import Event, as_body
+from events.preview import preview_positions, frame_stats, record_stats, record_columns
+from events.dates import DateFormatCache, sample_column, infer_date_format, parse_dates
+from events.dates import DueDateConverter
+
+from typing import Generator, Iterable, Iterator, TYPE_CHECKING
+
+# Splitting event data into batches, streaming chunks
+from itertools import chain, islice, repeat
+
+# Deterministic event ids
+import hashlib
+
+# Per-thread services for concurrent uploads
+import threading
+
+# Backing off between retried batch sub-requests, timing setup
+import time
 
 # Manipulating JSON files
 import json
 
+# Lean csv engine
+import csv
+
 # For path related functions
 from pathlib import Path
 
+# Expanding directories and globs of files to import
+import glob
+
 # Google Calendar API (REQUIRED)- For more information, go here:
 # https://developers.google.com/calendar/api/quickstart/python
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build, Resource
 from googleapiclient.errors import HttpError
 
+# pandas and the discovery/auth stack take hundreds of milliseconds to import,
+# so they are only imported by the methods that use them
+if TYPE_CHECKING:
+    import pandas as pd
+    from google.oauth2.credentials import Credentials
+    from googleapiclient.discovery import Resource
+
 # CLI output functions
 from rich import print
 from rich.prompt import Prompt, IntPrompt, Confirm
@@ -43,6 +89,11 @@ from rich.table import Table
 console = Console()
 
 # ::GLOBALS ------------------------------------------------------------------------ #
+# Values pandas reads as missing by default, so every csv engine agrees on them
+CSV_NA_VALUES: frozenset[str] = frozenset((
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+))
 
 
 # ::CORE LOGIC --------------------------------------------------------------------- #
@@ -55,16 +106,71 @@ class Events:
     __PROMPTS: dict[str:str] = PROMPTS
     __FILE_MAP: dict = FILE_MAP
     __EVENTS_OUTFILE: str = EVENTS_OUTFILE
+    __EVENTS_JOURNAL: str = EVENTS_JOURNAL
+    __FSYNC_EVERY: int = FSYNC_EVERY
+    __OUTPUT_SUFFIXES: dict[str, str] = OUTPUT_SUFFIXES
+    __ARCHIVE_BLOCK_SIZE: int = ARCHIVE_BLOCK_SIZE
+    __SYNC_DB: str = SYNC_DB
+    __EVENT_CACHE: str = EVENT_CACHE
+    __DATE_FORMAT_CACHE: str = DATE_FORMAT_CACHE
     __CSV_FIELDS: list[str] = CSV_FIELDS
+    __CSV_CHUNK_SIZE: int = CSV_CHUNK_SIZE
+    CSV_ENGINES: tuple[str] = CSV_ENGINES
+    __JSON_PREVIEW_ITEMS: int = JSON_PREVIEW_ITEMS
+    __EVENT_FIELDS: frozenset[str] = frozenset(EVENT_FIELDS)
     __EVENT_MAP: dict = EVENT_MAP
     SCOPES: list[str] = SCOPES
     SERVICE_NAME: str = SERVICE_NAME
     SERVICE_VERSION: str = SERVICE_VERSION
-
-    def __init__(self) -> None:
+    DISCOVERY_CACHE: str = DISCOVERY_CACHE
+    MAX_BATCH_SIZE: int = MAX_BATCH_SIZE
+    # Statuses returned when deleting an event that no longer exists
+    GONE_STATUSES: tuple[int] = (404, 410)
+    # Status returned when inserting an event id that already exists
+    CONFLICT_STATUS: int = 409
+    # Status returned when a sync token has expired
+    SYNC_EXPIRED_STATUS: int = 410
+
+    def __init__(
+        self,
+        jobs: int = JOBS,
+        rate_limit: float = RATE_LIMIT,
+        retry_budget: int = RETRY_BUDGET,
+        csv_engine: str = CSV_ENGINE,
+        output_format: str = OUTPUT_FORMAT,
+        timezone: str | None = TIMEZONE,
+        calendar_id: str = CALENDAR_ID,
+        interactive: bool = True,
+        processes: int = INGEST_PROCESSES
+    ) -> None:
         self._log = log
+        self.calendar_id = calendar_id
+        self.interactive = interactive
+        self.processes = max(1, processes)
+        self.csv_engine = csv_engine
+        self.output_format = output_format
+        self.timezone = timezone
+        self.__date_formats = DateFormatCache(Events.__DATE_FORMAT_CACHE)
         self.__now = naive_utcnow().isoformat() + "Z"  # 'Z' indicates UTC time
+        self.__jobs = max(1, jobs)
+        self.__limiter = RateLimiter(rate_limit, RATE_BURST)
+        self.__retry = RetryPolicy(MAX_RETRIES, retry_budget)
+        self.__local = threading.local()
+        self.__source_file = None
+        # Seconds spent on each setup step, for checking startup cost
+        self.timings: dict[str, float] = {}
+
+        start = time.perf_counter()
+        self.__credentials = CredentialManager(
+            TOKEN_FILE, CLIENT_SECRETS_FILE, Events.SCOPES, TOKEN_REFRESH_MARGIN,
+            allow_flow=interactive
+        )
+        self.__creds = self.__auth()
+        self.timings['auth'] = time.perf_counter() - start
+
+        start = time.perf_counter()
         self.__service = self.__set_service()
+        self.timings['service'] = time.perf_counter() - start
 
     def __auth(self) -> Credentials:
         '''
@@ -73,135 +179,619 @@ class Events:
         Args:
             None
         Returns
-            None
+            creds (Credentials): Valid credentials, shared by every thread
         '''
         self._log.debug('Starting self.__auth()')
-        creds = CREDS
-        # If there are no (valid) credentials available, let the user log in.
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                self._log.debug('__auth(): Creds expired...Refreshing Credentials')
-                creds.refresh(Request())
-            else:
-                self._log.debug('__auth(): Grabbing credentials.json for Creds')
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    "credentials.json", Events.SCOPES
-                )
-                creds = flow.run_local_server(port=0)
-            # Save the credentials for the next run
-            with open("token.json", "w") as token:
-                self._log.debug('__auth(): Writing token.json for Creds')
-                token.write(creds.to_json())
-
+        # Loads token.json, refreshes it or lets the user log in, as needed
+        creds = self.__credentials.get()
         self._log.debug('End  self.__auth()')
         return creds
 
     def __set_service(self) -> Resource:
         '''
         Construct a Resource object for interacting with an API. The serviceName and
-        version are the names from the Discovery service.
+        version are the names from the Discovery service. The discovery document
+        is loaded from a local cache instead of being fetched on every build.
         '''
         self._log.debug('Starting __set_service()')
         try:
             self._log.debug('End __set_service()')
-            return build(Events.SERVICE_NAME, Events.SERVICE_VERSION, credentials=self.__auth())
+            return build_service(
+                Events.SERVICE_NAME,
+                Events.SERVICE_VERSION,
+                self.__creds,
+                Events.DISCOVERY_CACHE
+            )
         except HttpError as error:
             raise
 
-    def display_events(self) -> bool:
+    def __get_service(self) -> Resource:
+        '''
+        Returns the Resource for the calling thread. httplib2 connections are not
+        thread-safe, so each worker thread builds its own transport on first use
+        and shares the credentials.
         '''
-        Displays events from the calendar
+        if threading.current_thread() is threading.main_thread():
+            return self.__service
+
+        service = getattr(self.__local, 'service', None)
+
+        if service is None:
+            self._log.debug(f'Building service for {threading.current_thread().name}')
+            service = self.__local.service = self.__set_service()
+
+        return service
+
+    def display_events(self, incremental: bool = False) -> bool:
+        '''
+        Displays events from the calendar, printing (and optionally writing)
+        each one as its page arrives. Pages are fetched lazily with only
+        LIST_FIELDS requested.
+        ---
+        Args:
+            incremental (bool): Read from the local event cache instead, fetching
+                only the changes since the last call
+        Returns
+            success (bool): True if any events were found
         '''
         success: bool = False
 
         try:
-            maxResults = display_IntPrompt('Enter the number of events to retrieve')
-            events = self.get_events(maxResults)
+            maxResults = display_IntPrompt('Enter the number of events to retrieve', max=None)
+            to_file = Confirm.ask('Would you like to save the event objects to a file?')
+
+            if incremental:
+                events = iter(self.get_events(maxResults, incremental=True))
+            else:
+                print(f'Getting the upcoming {maxResults} events')
+                events = self.iter_events(limit=maxResults, time_min=self.__now)
+
+            events = echo_events(events)
+
+            if to_file:
+                count = self.__write_events(events)
+            else:
+                count = sum(1 for _ in events)
         except ExitProgram:
             raise ExitProgram
         except HttpError:
             raise
         
-        if events:
-             # Prints the start and name of the next 10 events
-            for event in events:
-                start = event["start"].get("dateTime", event["start"].get("date"))
-                print(start, event["summary"])
-
+        if count:
             success = True
-            to_file = Confirm.ask('Would you like to save the event objects to a file?')
-
-            if to_file:
-                self.__write_events(events)
         else:
             print("No upcoming events found.")
 
         return success
 
-    def get_events(self, maxResults) -> bool:
+    def display_cached_events(self) -> bool:
         '''
-        Retrieves events from the Calendar
+        Displays upcoming events from the local event cache, fetching only the
+        changes since the last call. The first call lists the whole calendar,
+        so this pays off when the calendar is displayed again and again.
+        ---
+        Returns
+            success (bool): True if any events were found
+        '''
+        return self.display_events(incremental=True)
+
+    def list_to(self, limit: int | None = None, save: bool = True) -> dict:
+        '''
+        Lists upcoming events without prompting, for headless runs
+        ---
+        Args:
+            limit (int | None): Number of events to list. None lists every event
+            save (bool): Write the events to the output file
+        Returns
+            summary (dict): listed count and output (path or None)
+        '''
+        self._log.debug('Starting list_to()')
+
+        events = self.iter_events(limit=limit, time_min=self.__now)
+
+        if not save:
+            return {'listed': sum(1 for _ in events), 'output': None}
+
+        partial = self.__output_path() + '.partial'
+
+        with EventSink(partial, Events.__FSYNC_EVERY, append=False) as sink:
+            sink.write(events)
+
+        output, count = self.__finalize(sink)
+
+        return {'listed': count, 'output': output}
+
+    def get_events(self, maxResults, incremental: bool = False) -> list[dict]:
+        '''
+        Retrieves upcoming events from the Calendar
+        ---
+        Args:
+            maxResults (int): Number of events to return
+            incremental (bool): Bring the local event cache up to date with a
+                sync token and read the events from it
+        Returns
+            events (list[dict]): Event resources ordered by start
         '''
         self._log.debug('Starting get_events()')
         events: list[dict] = []
 
+        if incremental:
+            cache = self.sync_event_cache()
+            return cache.upcoming(self.__now, maxResults)
+
         try:
             # Call the Calendar API
             print(f'Getting the upcoming {maxResults} events')
-            events_result = (
-                self.__service.events()
-                .list(
-                    calendarId="primary",
-                    timeMin=self.__now,
-                    maxResults=maxResults,
-                    singleEvents=True,
-                    orderBy="startTime",
-                )
-                .execute()
-            )
-            events = events_result.get("items", [])
+            events = list(self.iter_events(limit=maxResults, time_min=self.__now))
         except HttpError:
             raise
         
         return events
 
-    def create_events(self) -> bool:
+    def iter_events(
+        self,
+        limit: int | None = None,
+        time_min: str | None = None,
+        time_max: str | None = None,
+        fields: str | None = LIST_FIELDS
+    ) -> Generator[dict, None, None]:
+        '''
+        Lazily yields events ordered by start, fetching the next page only when
+        the previous one has been consumed
+        ---
+        Args:
+            limit (int): Stop after this many events. None lists every event
+            time_min (str): RFC3339 lower bound for the event end time
+            time_max (str): RFC3339 upper bound for the event start time
+            fields (str): Partial response selector. None returns full resources
+        Returns
+            (Generator[dict, None, None]): Event resources
+        '''
+        self._log.debug('Starting iter_events()')
+        params = {
+            'calendarId': self.calendar_id,
+            'singleEvents': True,
+            'orderBy': 'startTime',
+            'maxResults': min(limit, LIST_PAGE_SIZE) if limit else LIST_PAGE_SIZE,
+            'timeMin': time_min,
+            'timeMax': time_max,
+            'fields': fields
+        }
+        params = {key: val for key, val in params.items() if val is not None}
+        count = 0
+
+        for page in self.__list_pages(**params):
+            for event in page.get('items', []):
+                yield event
+                count += 1
+
+                if limit and count >= limit:
+                    return
+
+    def sync_event_cache(self) -> EventCache:
+        '''
+        Updates the local event cache with the changes since the last call. The
+        first call, and any call after the sync token expires (410), lists the
+        whole calendar and stores the new sync token.
+        ---
+        Returns
+            cache (EventCache): The up to date cache
+        '''
+        self._log.debug('Starting sync_event_cache()')
+        cache = EventCache(calendar_path(Events.__EVENT_CACHE, self.calendar_id))
+
+        try:
+            changes = self.__list_changes(cache)
+        except HttpError as error:
+            if error.status_code != Events.SYNC_EXPIRED_STATUS:
+                raise
+            self._log.debug('Sync token expired...Running a full sync')
+            cache.clear()
+            changes = self.__list_changes(cache)
+
+        print(f'Fetched {changes} changed events since the last sync')
+        cache.save()
+
+        return cache
+
+    def __list_changes(self, cache: EventCache) -> int:
         '''
-        Create a Calendar event
+        Lists every page of changes since cache.sync_token (or every event when
+        there is no token) and applies them to the cache
+        '''
+        params = {
+            'calendarId': self.calendar_id,
+            'singleEvents': True,
+            'showDeleted': True,
+            'maxResults': LIST_PAGE_SIZE,
+            'fields': SYNC_FIELDS
+        }
+
+        if cache.sync_token:
+            params['syncToken'] = cache.sync_token
+        else:
+            cache.clear()
+
+        changes = 0
+
+        for page in self.__list_pages(**params):
+            changes += cache.apply(page.get('items', []))
+
+            if 'nextSyncToken' in page:
+                cache.sync_token = page['nextSyncToken']
+
+        return changes
+
+    def __list_pages(self, **params) -> Generator[dict, None, None]:
+        '''
+        Yields each page of an events().list call, following nextPageToken
+        '''
+        page_token = None
+
+        while True:
+            self.__credentials.get()
+            request = self.__service.events().list(pageToken=page_token, **params)
+            page = self.__retry.call(request.execute, self.__limiter)
+            yield page
+
+            page_token = page.get('nextPageToken')
+
+            if not page_token:
+                break
+
+    def create_events(self, batch_size: int = BATCH_SIZE) -> bool:
+        '''
+        Create Calendar events, sending the inserts as Calendar batch requests
+        ---
+        Args:
+            batch_size (int): Number of inserts per batch request. Capped at
+                MAX_BATCH_SIZE; a value of 1 sends each insert on its own.
+        Returns
+            created (bool): True if every event was created
         '''
         self._log.debug('Starting create_events()')
 
-        created = False
         events_gen = self.__get_data()
 
+        return self.__create_and_save(events_gen, batch_size)
+
+    def ingest_events(self, batch_size: int = BATCH_SIZE) -> bool:
+        '''
+        Create Calendar events from every csv, json and jsonl file in a directory
+        or glob. The files are parsed in parallel and their events sent as one
+        upload; files that fail to import are listed and skipped.
+        ---
+        Args:
+            batch_size (int): Number of inserts per batch request
+        Returns
+            created (bool): True if every file was imported and every event created
+        '''
+        self._log.debug('Starting ingest_events()')
+
+        pattern: str = display_prompt(Events.__PROMPTS['ingest'], help_func=display_cwd)
+        course_key: str = Prompt.ask(Events.__PROMPTS['course_key_ingest'], default='')
+        report = []
+
         try:
-            events_list = []
+            events = self.load_files(pattern, course_key=course_key or None, report=report)
+
+            # Only the first events are read ahead for the preview; the rest
+            # stream into the upload
+            preview = list(islice(events, Events.__JSON_PREVIEW_ITEMS))
+        except FileNotFoundError as e:
+            self._log.debug(e, stack_info=True, exc_info=True)
+            display_error(str(e))
+            return False
 
-            for item in events_gen:
-                try:
-                    event = self.__service.events().insert(calendarId='primary', body=item).execute()
-                    events_list.append(event)
-                    print(f'Event created: {event.get('htmlLink')}')
-                except Exception:
-                    raise
+        display_ingest_report(pattern, report)
 
-            display_panel('Created all events.', 'Success')
-            
-            to_file = Confirm.ask('Would you like to save the event objects to a file?')
+        if preview:
+            display_df('Transformed data', preview)
 
-            if to_file:
-                self.__write_events(events_list)
+        # Have user validate data
+        confirmation = Confirm.ask(
+            f'Confirm if the transformed data above is correct '
+            f'and to continue to add to calendar'
+        )
+
+        if not confirmation:
+            display_error(
+                'User has confirmed that the data is [bold bright_red]incorrect.\n'
+                'Exiting program...'
+            )
+            raise ExitProgram("User prompted to exit program.")
+
+        previewed = len(report)
+        created = self.__create_and_save(chain(preview, events), batch_size)
+
+        # Files read after the preview are reported once the upload is done
+        if len(report) > previewed:
+            display_ingest_report(pattern, report)
+
+        return created and not any(item['error'] for item in report)
+
+    def __create_and_save(self, events: Iterable, batch_size: int) -> bool:
+        '''
+        Creates events, reports the outcome and asks whether to save them. If
+        the file turns out to be bad part way through, the events created so
+        far are saved without asking, since they are already in the calendar.
+        '''
+        created = False
 
-            created = True
+        try:
+            sink, failed, source_error = self.__create(events, batch_size, echo=True)
+
+            if source_error:
+                self.__forget_date_format()
+                display_error(
+                    f'Stopped reading "{self.__source_file}" after creating {sink.count} '
+                    f'events: {source_error}'
+                )
+            elif failed:
+                display_error(f'Failed to create {len(failed)} of '
+                              f'{len(failed) + sink.count} events.')
+            else:
+                display_panel('Created all events.', 'Success')
+
+            if source_error and (sink.count or sink.resumed):
+                self.__write_events(sink=sink)
+            elif sink.count or sink.resumed:
+                to_file = Confirm.ask('Would you like to save the event objects to a file?')
+
+                if to_file:
+                    self.__write_events(sink=sink)
+                else:
+                    sink.discard()
+            else:
+                sink.discard()
+
+            created = not failed and not source_error
 
         except TypeError:
             raise
 
         return created
+
+    def create_from(self, events: Iterable, batch_size: int = BATCH_SIZE, save: bool = True) -> dict:
+        '''
+        Creates events without prompting, for headless runs
+        ---
+        Args:
+            events (Iterable): Events from load_events
+            batch_size (int): Number of inserts per batch request
+            save (bool): Finalize the created events into the output file;
+                otherwise the journal is removed. Events created before the
+                file turned out to be bad are always saved.
+        Returns
+            summary (dict): created, failed and output (path or None), plus
+                error if the file could not be read to the end
+        '''
+        self._log.debug('Starting create_from()')
+
+        sink, failed, source_error = self.__create(events, batch_size)
+        summary = {'created': sink.count, 'failed': len(failed), 'output': None}
+
+        if (save or source_error) and (sink.count or sink.resumed):
+            summary['output'], _ = self.__finalize(sink)
+        else:
+            sink.discard()
+
+        for item, error in failed:
+            self._log.error(f'Event failed: {item.get("summary")} - {error}')
+
+        if source_error:
+            self.__forget_date_format()
+            self._log.error(f'Stopped after creating {sink.count} events: {source_error}')
+            summary['error'] = str(source_error)
+
+        return summary
+
+    def __forget_date_format(self) -> None:
+        '''
+        Discards the cached date format of the source file after it failed to
+        parse, so the next run infers or asks again
+        '''
+        if self.__source_file and self.__source_file.endswith('.csv'):
+            self.__date_formats.discard(self.__source_file)
+
+    def __create(
+        self,
+        events: Iterable,
+        batch_size: int,
+        echo: bool = False
+    ) -> tuple[EventSink, list[tuple], ValueError | None]:
+        '''
+        Inserts events in batches across the worker threads. Created events go
+        straight to the journal, so a crash keeps their ids. Reading stops at
+        the first ValueError from events, e.g. a bad date in a later csv chunk,
+        and the events sent before it are kept.
+        ---
+        Args:
+            events (Iterable): Events to insert
+            batch_size (int): Number of inserts per batch request. Capped at
+                MAX_BATCH_SIZE; a value of 1 sends each insert on its own.
+            echo (bool): Print each created or failed event
+        Returns
+            sink (EventSink): The closed journal of created events
+            failed (list[tuple]): (item, error) for each event that failed
+            source_error (ValueError | None): Why events could not be read to the end
+        '''
+        batch_size = max(1, min(batch_size, Events.MAX_BATCH_SIZE))
+        source_errors = []
+        batches = chunked(until_error(events, source_errors), batch_size)
+        failed = []
+
+        with EventSink(
+            calendar_path(Events.__EVENTS_JOURNAL, self.calendar_id), Events.__FSYNC_EVERY
+        ) as sink:
+            if sink.resumed and echo:
+                display_console(f'Appending to events from an unfinished run in "{sink.path}"')
+
+            for results in ordered_map(self.__insert_batch, batches, self.__jobs):
+                batch_events = []
+
+                for item, event, error in results:
+                    if error:
+                        self._log.debug(error, exc_info=error)
+                        failed.append((item, error))
+
+                        if echo:
+                            print(f'[bright_red]Event failed: {item.get("summary")} - {error}')
+                    else:
+                        batch_events.append(event)
+
+                        if echo:
+                            print(f'Event created: {event.get("htmlLink")}')
+
+                sink.write(batch_events)
+
+        return sink, failed, next(iter(source_errors), None)
+
+    def __insert_batch(self, items: list[Event | dict]) -> list[tuple]:
+        '''
+        Inserts events as a single batch request
+        ---
+        Args:
+            items (list[Event | dict]): Events to insert
+        Returns
+            results (list[tuple]): (item, event, error) for each item, in order
+        '''
+        bodies = [as_body(item) for item in items]
+        requests = [
+            self.__get_service().events().insert(calendarId=self.calendar_id, body=body)
+            for body in bodies
+        ]
+
+        responses = self.__execute_batch(requests)
+
+        # Events carry deterministic ids, so a conflict means a previous run
+        # already created them
+        conflicts = [
+            i for i, (_, error) in enumerate(responses)
+            if isinstance(error, HttpError) and error.status_code == Events.CONFLICT_STATUS
+        ]
+
+        if conflicts:
+            resolved = self.__resolve_conflicts([bodies[i] for i in conflicts])
+
+            for i, response in zip(conflicts, resolved):
+                responses[i] = response
+
+        return [(item, event, error) for item, (event, error) in zip(items, responses)]
+
+    def __resolve_conflicts(self, items: list[dict]) -> list[tuple]:
+        '''
+        Fetches events whose id already exists. Events that were deleted since
+        (status "cancelled") still hold their id, so they are restored instead.
+        ---
+        Args:
+            items (list[dict]): Event bodies that failed to insert with a 409
+        Returns
+            results (list[tuple]): (event, error) for each item, in order
+        '''
+        service = self.__get_service()
+        results = self.__execute_batch([
+            service.events().get(calendarId=self.calendar_id, eventId=item['id'])
+            for item in items
+        ])
+
+        cancelled = [
+            i for i, (event, _) in enumerate(results)
+            if event and event.get('status') == 'cancelled'
+        ]
+
+        if cancelled:
+            restored = self.__execute_batch([
+                service.events().update(
+                    calendarId=self.calendar_id,
+                    eventId=items[i]['id'],
+                    body={**items[i], 'status': 'confirmed'}
+                )
+                for i in cancelled
+            ])
+
+            for i, response in zip(cancelled, restored):
+                results[i] = response
+
+        return results
+
+    def __execute_batch(self, requests: list) -> list[tuple]:
+        '''
+        Sends requests as a single Calendar batch request, or on its own when
+        there is only one request. Sub-requests that hit a rate limit or server
+        error are resent with backoff until the retry policy gives up. This is
+        the only place batch requests are retried.
+        ---
+        Args:
+            requests (list[HttpRequest]): Requests to send, at most MAX_BATCH_SIZE
+        Returns
+            results (list[tuple]): (response, exception) for each request, in order
+        '''
+        results: list[tuple] = [(None, None)] * len(requests)
+        pending = list(range(len(requests)))
+        attempt = 0
+
+        while pending:
+            self.__send_batch(requests, pending, results)
+
+            retry = [i for i in pending if is_retryable(results[i][1])]
+
+            if not retry:
+                break
+
+            delay = self.__retry.delay(attempt, results[retry[0]][1])
+
+            if delay is None:
+                break
+
+            self._log.debug(f'Retrying {len(retry)} requests in {delay:.2f}s')
+            time.sleep(delay)
+            pending = retry
+            attempt += 1
+
+        return results
+
+    def __send_batch(self, requests: list, pending: list[int], results: list[tuple]) -> None:
+        '''
+        Sends the pending requests once, storing each (response, exception) in
+        results. A failure of the batch request itself is stored for every
+        pending request; __execute_batch decides what to resend.
+        '''
+        # Refresh ahead of expiry here rather than on a 401 in the middle of a batch
+        self.__credentials.get()
+        self.__limiter.acquire(len(pending))
+
+        if len(pending) == 1:
+            i = pending[0]
+            try:
+                results[i] = (requests[i].execute(), None)
+            except HttpError as error:
+                results[i] = (None, error)
+            return
+
+        def callback(request_id, response, exception):
+            results[int(request_id)] = (response, exception)
+
+        batch = self.__get_service().new_batch_http_request(callback=callback)
+
+        for i in pending:
+            batch.add(requests[i], request_id=str(i))
+
+        try:
+            batch.execute()
+        except HttpError as error:
+            for i in pending:
+                results[i] = (None, error)
     
-    def delete_events(self) -> bool:
+    def delete_events(self, batch_size: int = BATCH_SIZE) -> bool:
         '''
-        Delete Google Calendar events
+        Delete Google Calendar events, sending the deletes as Calendar batch requests
+        ---
+        Args:
+            batch_size (int): Number of deletes per batch request. Capped at
+                MAX_BATCH_SIZE; a value of 1 sends each delete on its own.
+        Returns
+            deleted (bool): True if every event was deleted or was already gone
         '''
         self._log.debug('Starting delete_events()')
 
@@ -222,19 +812,285 @@ class Events:
             raise ExitProgram("User prompted to exit program.")
 
         if events_list and confirmation:
-            for sum, id in events_list:
-                print(f'Deleting event: "{sum} - [green]{id}"')
-                try:
-                    self.__service.events().delete(calendarId='primary', eventId=id).execute()
-                except Exception:
-                    raise
-
-            display_panel(f'Deleted all events.', 'Success')
-            deleted = True
+            gone, failed = self.__delete(events_list, batch_size, echo=True)
+
+            if gone:
+                print(f'[yellow]Already deleted ({len(gone)}): {[id for _, id in gone]}')
+
+            if failed:
+                display_error(f'Failed to delete {len(failed)} of {len(events_list)} events.')
+            else:
+                display_panel(f'Deleted all events.', 'Success')
+                deleted = True
         
         return deleted
 
+    def delete_from(self, items: list[tuple], batch_size: int = BATCH_SIZE) -> dict:
+        '''
+        Deletes events without prompting, for headless runs
+        ---
+        Args:
+            items (list[tuple]): (summary, id) of the events, see load_delete_items
+            batch_size (int): Number of deletes per batch request
+        Returns
+            summary (dict): deleted, gone (already deleted) and failed counts
+        '''
+        self._log.debug('Starting delete_from()')
+
+        gone, failed = self.__delete(items, batch_size)
+
+        for (sum, id), error in failed:
+            self._log.error(f'Delete failed: "{sum} - {id}" - {error}')
+
+        return {
+            'deleted': len(items) - len(gone) - len(failed),
+            'gone': len(gone),
+            'failed': len(failed)
+        }
+
+    def __delete(
+        self,
+        items: list[tuple],
+        batch_size: int,
+        echo: bool = False
+    ) -> tuple[list, list]:
+        '''
+        Deletes events in batches across the worker threads
+        ---
+        Args:
+            items (list[tuple]): (summary, id) of the events to delete
+            batch_size (int): Number of deletes per batch request. Capped at
+                MAX_BATCH_SIZE; a value of 1 sends each delete on its own.
+            echo (bool): Print each event as it is deleted
+        Returns
+            gone (list[tuple]): Items that were already deleted
+            failed (list[tuple]): (item, error) for items that could not be deleted
+        '''
+        batch_size = max(1, min(batch_size, Events.MAX_BATCH_SIZE))
+        gone = []
+        failed = []
+
+        batches = list(chunked(items, batch_size))
+        results = ordered_map(self.__delete_batch, batches, self.__jobs)
+
+        for batch, (batch_gone, batch_failed) in zip(batches, results):
+            if echo:
+                for sum, id in batch:
+                    print(f'Deleting event: "{sum} - [green]{id}"')
+
+            gone.extend(batch_gone)
+            failed.extend(batch_failed)
+
+        for (sum, id), error in failed:
+            self._log.debug(error, exc_info=error)
+
+            if echo:
+                print(f'[bright_red]Delete failed: "{sum} - {id}" - {error}')
+
+        return gone, failed
+
+    def __delete_batch(self, items: list[tuple]) -> tuple[list, list]:
+        '''
+        Deletes events as a batch request. Retries happen in __execute_batch.
+        ---
+        Args:
+            items (list[tuple]): (summary, id) of the events to delete
+        Returns
+            gone (list[tuple]): Items that were already deleted (404/410)
+            failed (list[tuple]): (item, error) for items that could not be deleted
+        '''
+        gone = []
+        failed = []
+
+        requests = [
+            self.__get_service().events().delete(calendarId=self.calendar_id, eventId=id)
+            for _, id in items
+        ]
+
+        for item, (_, error) in zip(items, self.__execute_batch(requests)):
+            if error is None:
+                continue
+            if isinstance(error, HttpError) and error.status_code in Events.GONE_STATUSES:
+                gone.append(item)
+            else:
+                failed.append((item, error))
+
+        return gone, failed
+
     
+    def sync_events(self, batch_size: int = BATCH_SIZE) -> bool:
+        '''
+        Syncs the calendar with a file. Records from previous syncs of the same
+        file are kept in a local SQLite table, so only new, changed and removed
+        assignments are sent to the API.
+        ---
+        Args:
+            batch_size (int): Number of requests per batch request
+        Returns
+            synced (bool): True if every change was applied
+        '''
+        self._log.debug('Starting sync_events()')
+
+        events_gen = self.__get_data()
+        plan, failed = self.__sync(events_gen, self.__source_file, batch_size, echo=True)
+
+        summary = (
+            f'Sent {plan.calls} requests, {plan.avoided} fewer than re-creating '
+            f'every event would have.'
+        )
+
+        if failed:
+            display_error(f'{failed} of {plan.calls} changes failed. {summary}')
+        else:
+            display_panel(f'Calendar is in sync. {summary}', 'Success')
+
+        return not failed
+
+    def sync_from(
+        self,
+        events: Iterable,
+        source_file: str,
+        batch_size: int = BATCH_SIZE,
+        source_id: str | None = None
+    ) -> dict:
+        '''
+        Syncs the calendar with a file without prompting, for headless runs
+        ---
+        Args:
+            events (Iterable): Events from load_events
+            source_file (str): The file the events came from
+            batch_size (int): Number of requests per batch request
+            source_id (str | None): Keys the stored records instead of the
+                file's absolute path, e.g. to keep syncing a file that moved
+        Returns
+            summary (dict): inserted, patched, deleted, unchanged, avoided and
+                failed counts
+        '''
+        self._log.debug('Starting sync_from()')
+
+        plan, failed = self.__sync(events, source_file, batch_size, source_id=source_id)
+
+        return {
+            'inserted': len(plan.inserts),
+            'patched': len(plan.patches),
+            'deleted': len(plan.deletes),
+            'unchanged': plan.unchanged,
+            'avoided': plan.avoided,
+            'failed': failed
+        }
+
+    def __sync(
+        self,
+        events: Iterable,
+        source_file: str,
+        batch_size: int,
+        echo: bool = False,
+        source_id: str | None = None
+    ) -> tuple[SyncPlan, int]:
+        '''
+        Plans the sync of a file against its stored records and sends the
+        inserts, patches and deletes in batches
+        ---
+        Args:
+            events (Iterable): Events of the file
+            source_file (str): The file; its absolute path keys the stored records
+            batch_size (int): Number of requests per batch request
+            echo (bool): Print the sync plan
+            source_id (str | None): Key for the stored records instead of the path
+        Returns
+            plan (SyncPlan): The planned changes
+            failed (int): Number of changes that failed
+        '''
+        # Files with the same name in different directories keep separate records
+        source = source_id or str(Path(source_file).resolve())
+
+        # Records are kept per calendar, so one file can be synced to several
+        if self.calendar_id != 'primary':
+            source = f'{self.calendar_id}/{source}'
+        batch_size = max(1, min(batch_size, Events.MAX_BATCH_SIZE))
+        failed = 0
+
+        with SyncStore(Events.__SYNC_DB) as store:
+            plan = plan_sync(map(as_body, events), store.records(source))
+
+            if echo:
+                print(
+                    f'Sync plan for [yellow]"{source}"[/yellow]: '
+                    f'{len(plan.inserts)} new, {len(plan.patches)} changed, '
+                    f'{len(plan.deletes)} removed, {plan.unchanged} unchanged'
+                )
+
+            # New records
+            batches = list(chunked(plan.inserts, batch_size))
+            bodies = ([body for _, _, body in batch] for batch in batches)
+            results = ordered_map(self.__insert_batch, bodies, self.__jobs)
+
+            for batch, batch_results in zip(batches, results):
+                rows = []
+                for (key, digest, _), (_, event, error) in zip(batch, batch_results):
+                    if error:
+                        self._log.debug(error, exc_info=error)
+                        failed += 1
+                    else:
+                        rows.append((key, digest, event['id']))
+                store.upsert(source, rows)
+
+            # Changed records
+            batches = list(chunked(plan.patches, batch_size))
+            results = ordered_map(self.__patch_batch, batches, self.__jobs)
+
+            for batch, batch_results in zip(batches, results):
+                rows = []
+                for (key, digest, _, _), (event, error) in zip(batch, batch_results):
+                    if error:
+                        self._log.debug(error, exc_info=error)
+                        failed += 1
+                    else:
+                        rows.append((key, digest, event['id']))
+                store.upsert(source, rows)
+
+            # Removed records
+            batches = list(chunked(plan.deletes, batch_size))
+            results = ordered_map(self.__delete_batch, batches, self.__jobs)
+
+            for batch, (_, errors) in zip(batches, results):
+                failed_keys = {key for (key, _), _ in errors}
+                store.delete(source, [key for key, _ in batch if key not in failed_keys])
+                failed += len(errors)
+
+        return plan, failed
+
+    def __patch_batch(self, items: list[tuple]) -> list[tuple]:
+        '''
+        Patches changed events as a single batch request. Events that were
+        deleted from the calendar by hand are created again.
+        ---
+        Args:
+            items (list[tuple]): (key, digest, event_id, body) for each changed record
+        Returns
+            results (list[tuple]): (event, error) for each item, in order
+        '''
+        service = self.__get_service()
+        results = self.__execute_batch([
+            service.events().patch(calendarId=self.calendar_id, eventId=event_id, body=body)
+            for _, _, event_id, body in items
+        ])
+
+        gone = [
+            i for i, (_, error) in enumerate(results)
+            if isinstance(error, HttpError) and error.status_code in Events.GONE_STATUSES
+        ]
+
+        if gone:
+            inserted = self.__insert_batch([
+                {**items[i][3], 'id': items[i][2]} for i in gone
+            ])
+
+            for i, (_, event, error) in zip(gone, inserted):
+                results[i] = (event, error)
+
+        return results
+
     def __get_data(self) -> Generator[dict, None, None]:
         '''
         Retrieves file from user, imports data and returns formatted event data
@@ -260,6 +1116,7 @@ class Events:
 
             data = import_method(user_file)
             events_gen = gen_method(data)
+            self.__source_file = user_file
             
             # Have user validate data
             confirmation = Confirm.ask(
@@ -294,11 +1151,136 @@ class Events:
             self._log.debug(e, stack_info=True, exc_info=True)
             display_error(f'Issue importing file: "{user_file}".')
 
-        if not success:
-            raise ExitProgram
+        if not success:
+            raise ExitProgram
+
+        return events_gen
+    
+    def load_events(
+        self,
+        user_file: str,
+        date_format: str | None = None,
+        course_key: str | None = None
+    ) -> Iterator:
+        '''
+        Imports a file without prompting or previews, for headless runs. The
+        first chunk or items are read now, so a bad file fails before anything
+        is sent to the calendar.
+        ---
+        Args:
+            user_file (str): csv, json or jsonl file
+            date_format (str | None): due_date format of a csv file; the cached
+                or inferred format is used if None
+            course_key (str | None): Course key of a Blackboard gradebook export.
+                json and jsonl files are read as Calendar events if None.
+        Returns
+            events (Iterator): Events of the file
+        '''
+        self._log.debug('Starting load_events()')
+
+        if not Path(user_file).is_file():
+            raise FileNotFoundError(f'"{user_file}" is not recognized as a file.')
+
+        file_ext = user_file.split('.')[-1]
+
+        if file_ext not in Events.__FILE_MAP:
+            raise ValueError(f'File "{user_file}" is not a supported filetype.')
+
+        self.__source_file = user_file
+
+        if file_ext == 'csv':
+            if date_format is None:
+                date_format = self.__date_formats.get(user_file) or csv_date_format(user_file)
+
+            try:
+                events_iter = csv_file_events(user_file, date_format, csv_engine=self.csv_engine)
+            except ValueError:
+                self.__date_formats.discard(user_file)
+                raise
+
+            self.__date_formats.set(user_file, date_format)
+
+            return events_iter
+
+        events_iter = json_file_events(
+            user_file, course_key=course_key, timezone=self.timezone, jobs=self.__jobs
+        )
+
+        # Decode the first items now so invalid JSON fails before uploading
+        preview = list(islice(events_iter, Events.__JSON_PREVIEW_ITEMS))
+
+        return chain(preview, events_iter)
+
+    def load_files(
+        self,
+        pattern: str,
+        date_format: str | None = None,
+        course_key: str | None = None,
+        report: list | None = None
+    ) -> Iterator:
+        '''
+        Imports every csv, json and jsonl file in a directory or matching a glob.
+        Files are parsed on a pool of worker processes and their events are
+        merged into one stream, file by file in path order. A file that fails
+        is logged and reported, and the other files carry on. Each file is
+        parsed whole, so at most 2 * processes files' events are in memory at
+        once, however many files match.
+        ---
+        Args:
+            pattern (str): Directory or glob, e.g. "input/*.csv" or "input/**/*.json"
+            date_format (str | None): due_date format of every csv file; the
+                cached or inferred format of each file is used if None
+            course_key (str | None): Course key of gradebook json/jsonl exports,
+                where "{stem}" is replaced by each file's name. json and jsonl
+                files are read as Calendar events if None.
+            report (list | None): Gets {"file", "events", "error"} for each file
+                as it is read
+        Returns
+            events (Iterator): Events of every file
+        '''
+        self._log.debug('Starting load_files()')
+
+        paths = expand_paths(pattern, Events.__FILE_MAP)
+        self.__source_file = pattern
+
+        if not paths:
+            raise FileNotFoundError(f'No csv, json or jsonl files match "{pattern}".')
+
+        tasks = (
+            (
+                path,
+                date_format or (self.__date_formats.get(path) if path.endswith('.csv') else None),
+                course_key.replace('{stem}', Path(path).stem) if course_key else None,
+                self.csv_engine,
+                self.timezone
+            )
+            for path in paths
+        )
+
+        return self.__merge_files(process_map(parse_file, tasks, self.processes), report)
+
+    def __merge_files(self, results: Iterable[dict], report: list | None) -> Generator:
+        '''
+        Yields the events of each parsed file, recording its outcome
+        '''
+        for result in results:
+            path, error = result['file'], result['error']
+
+            if report is not None:
+                report.append({'file': path, 'events': len(result['events']), 'error': error})
+
+            if error:
+                self._log.error(f'Skipped "{path}": {error}')
+
+                if path.endswith('.csv'):
+                    self.__date_formats.discard(path)
+                continue
+
+            if result['date_format']:
+                self.__date_formats.set(path, result['date_format'])
+
+            yield from result['events']
 
-        return events_gen
-    
     def __get_delete_data(self) -> list[str]:
         '''
         Gets JSON Event objects to delete
@@ -309,13 +1291,14 @@ class Events:
             display_error(f'"{user_file}" is not recognized as a file.')
             user_file = display_prompt(Events.__PROMPTS['file_delete'], help_func=display_cwd)
 
-        data: list[dict] = []
-        events: list[str] = []
+        course = None
+
+        if user_file.endswith('.gz'):
+            print(f'Courses in archive: {ArchiveReader(user_file).courses()}')
+            course = Prompt.ask('Course key to delete (blank for every event)', default='')
 
         try:
-            with open(user_file, 'r') as inFile:
-                data = json.load(inFile)
-                events = [(item.get('summary'), item.get('id')) for item in data]
+            events = self.load_delete_items(user_file, course or None)
         except FileNotFoundError:
             raise
         except TypeError:
@@ -328,122 +1311,170 @@ class Events:
         return events
 
 
-    def __import_csv(self, csv_file) -> pd.DataFrame:
+    def load_delete_items(self, user_file: str, course: str | None = None) -> list[tuple]:
+        '''
+        Reads the (summary, id) of each event in a file written by create
+        ---
+        Args:
+            user_file (str): json, jsonl or archive (.gz) file of created events
+            course (str | None): Only read the events of this course from an
+                archive; every event if None
+        Returns
+            events (list[tuple]): (summary, id) of each event
+        '''
+        if user_file.endswith('.gz'):
+            # Only the archive blocks holding the course are decompressed
+            return [
+                (item.get('summary'), item.get('id'))
+                for item in ArchiveReader(user_file).find(course=course)
+            ]
+
+        if user_file.endswith('.jsonl'):
+            items = read_jsonl_ranges(user_file, self.__jobs)
+        else:
+            items = read_array(user_file, key='items')
+
+        return [(item.get('summary'), item.get('id')) for item in json_objects(items, user_file)]
+
+    def __import_csv(self, csv_file) -> Iterator:
         '''
-        Retrieve data as a list from csv file
+        Retrieve data from csv file in chunks of CSV_CHUNK_SIZE rows, so memory
+        stays bounded and uploading can start before the whole file is parsed
         ---
         Args:
             csv_file (str): csv file to import
         Returns
-            df (pd.Dataframe): The data from the csv file
+            chunks (Iterator): The data from the csv file, one chunk at a time.
+                Chunks are DataFrames, or lists of rows for the stdlib engine.
 
         '''
         self._log.debug('Starting __get_csv()')
 
-        # Prompt user for date format
+        # Infer the date format, or prompt the user if no known format fits
         try:
-            date_format: str = display_prompt(
-                Events.__PROMPTS['date_format'],
-                help_func=display_strftime
-            )
+            date_format: str = self.__date_format(csv_file)
         except ExitProgram:
             raise
 
-        date_col = Events.__CSV_FIELDS[4]
-        str_cols = [col for col in Events.__CSV_FIELDS if col != date_col]
-
         try:
-            df = pd.read_csv(
-                csv_file,
-                header=0,
-                usecols=Events.__CSV_FIELDS,
-                parse_dates=[date_col],
-                date_format=date_format,
-                dtype={col: str for col in str_cols}
+            chunks = read_csv_chunks(
+                csv_file, date_format, self.csv_engine, Events.__CSV_CHUNK_SIZE
             )
-            if str(df['due_date'].dtype) == "datetime64[ns]":
-                display_panel(f'Retrieved "{csv_file}"', 'Success')
-                display_df(csv_file, df) # Display original csv data
-                return df
-            else:
-                raise ValueError
+
+            # Parse the first chunk now so a bad date format fails before uploading
+            first = next(chunks, None)
+
+            if first is None:
+                return iter([])
+
+            self.__date_formats.set(csv_file, date_format)
+            display_panel(f'Retrieved "{csv_file}" ({self.csv_engine} engine)', 'Success')
+            # Preview the first chunk of csv data
+            display_df(f'{csv_file} (first {len(first)} rows)', first, paging=True)
+            return chain([first], chunks)
         except ValueError:
+            self.__date_formats.discard(csv_file)
             raise
         except FileNotFoundError:
             raise
         except Exception:
             raise
 
-    def __get_csv_events(self, df) -> Generator[dict, None, None]:
+    def __date_format(self, csv_file: str) -> str:
+        '''
+        Returns the due_date format of a csv file: the cached format if the file
+        is unchanged, else one inferred from a sample of its dates, else the
+        format the user enters
+        '''
+        date_format = self.__date_formats.get(csv_file)
+
+        if date_format is None:
+            date_format = csv_date_format(csv_file)
+            self._log.debug(f'Inferred date format {date_format!r}')
+
+        if date_format is None:
+            return display_prompt(
+                Events.__PROMPTS['date_format'],
+                help_func=display_strftime
+            )
+
+        display_panel(f'Using date format [cyan1]{date_format}[/cyan1]', 'Date Format')
+        return date_format
+
+    def __get_csv_events(self, chunks) -> Generator[dict, None, None]:
         '''
-        Transform data into Google Calendar events objects
+        Transform data into Google Calendar events objects, one chunk at a time
         '''
         self._log.debug('Starting __create_events()')
 
         events_gen = None
-        summary_col = Events.__CSV_FIELDS[0:3:2]
-        desc_col = Events.__CSV_FIELDS[1:5:2]
+        chunks = iter(chunks)
+        first = next(chunks, None)
 
         # Extract subset of csv to create google event col/vals
-        if not df.empty:
-            events_df = df.iloc[:, 4:]
-            events_df['due_date'] = events_df['due_date'].map(lambda x: x.strftime('%Y-%m-%d'))
-            events_df['end'] = events_df['due_date']
-            events_df['summary'] = df[summary_col].agg(': '.join, axis=1)
-            events_df['description'] = df[desc_col].agg('<br>'.join, axis=1)
-            events_df = events_df.rename(columns=Events.__EVENT_MAP)
-
-            display_df('Transformed data', events_df)
-
-            # Set df to new events_df
-            events_list = events_df.to_dict(orient='records')
-            
-            # Change "start" date into a dictionary
-            for item in events_list:
-                item['start'] = {'date': item['start']}
-                item['end'] = {'date': item['end']}
-
-            events_gen = (event for event in events_list)
+        if first is not None and len(first):
+            # The preview shows the request bodies of the first chunk's events
+            first_events = chunk_to_events(first)
+            display_df('Transformed data', first_events)
+
+            events_gen = chain(
+                first_events,
+                chain.from_iterable(chunk_to_events(chunk) for chunk in chunks)
+            )
             
         return events_gen
-    
-    def __import_json(self, jsonFile) -> list[dict]:
+
+    def __import_json(self, jsonFile) -> Iterator[dict]:
         '''
-        Retrieve data as a list from json file
+        Retrieve data from json file one item at a time. Blackboard exports are
+        read from their "results" array and plain arrays as is, so only one
+        item is in memory at a time no matter how large the file is.
         ---
         Args:
             jsonFile (str) : The json file to load.
         Returns
-            data (list[dict]): Results data from file
-
+            data (Iterator[dict]): Results data from file
         '''
         self._log.debug('Starting __get_json()')
 
-        try:
-            with open(jsonFile, 'r') as in_file:
-                data = json.load(in_file)
-                display_panel(f'Retrieved "{jsonFile}"', 'Success')
-                display_console(f'Original JSON data: {jsonFile}')
+        items = json_objects(read_array(jsonFile, key='results'), jsonFile)
 
-                if isinstance(data, dict):
-                    data = data.get('results')
+        # Decode the first items now so invalid JSON fails before uploading
+        preview = list(islice(items, Events.__JSON_PREVIEW_ITEMS))
 
-                print(data)
+        display_panel(f'Retrieved "{jsonFile}"', 'Success')
+        display_df(f'{jsonFile} (first {len(preview)} items)', preview)
 
-                return data
-        except json.JSONDecodeError:
-            raise
-        except FileNotFoundError:
-            raise
-        except Exception:
-            raise
+        return chain(preview, items)
+
+    def __import_jsonl(self, jsonlFile) -> Iterator[dict]:
+        '''
+        Retrieve data from a JSON Lines file, one gradebook column or event
+        object per line, reading one line at a time
+        ---
+        Args:
+            jsonlFile (str) : The jsonl file to load.
+        Returns
+            data (Iterator[dict]): Objects from the file
+        '''
+        self._log.debug('Starting __import_jsonl()')
+
+        items = json_objects(read_jsonl_ranges(jsonlFile, self.__jobs), jsonlFile)
+
+        # Decode the first lines now so invalid JSON fails before uploading
+        preview = list(islice(items, Events.__JSON_PREVIEW_ITEMS))
+
+        display_panel(f'Retrieved "{jsonlFile}"', 'Success')
+        display_df(f'{jsonlFile} (first {len(preview)} items)', preview)
+
+        return chain(preview, items)
 
     def __get_json_events(self, data) -> Generator[dict, None, None]:
         '''
-        Transform data into Google Calendar events objects
+        Transform data into Google Calendar events objects, one item at a time
         ---
         Args:
-            course_key (str): The course key to append to the summary
+            data (Iterable[dict]): Gradebook columns or event objects
         Returns
             (Generator[dict, None, None]): Generator for event data
         '''
@@ -460,68 +1491,569 @@ class Events:
             except ExitProgram:
                 raise
 
-            parsed = []
-
-            if data:
-                for item in data:
-                    date_iso = item['grading'].get('due')
-
-                    if date_iso:
-                        summary = course_key + ': ' + item.get('name')
-                        date_utc = datetime.fromisoformat(date_iso)
-                        date_local = date_utc.astimezone().strftime('%Y-%m-%d')
-                        event = {
-                            "summary": summary,
-                            "start": {"date": date_local},
-                            "end": {"date": date_local},
-                            "location": "Blackboard"
-                        }
-                        parsed.append(event)
-
-                display_console(f'Transformed data')
-                print(parsed)
-
-                events_gen = (item for item in parsed)
+            columns = (gradebook_fields(item) for item in data or [])
+            events_iter = json_events(columns, course_key, DueDateConverter(self.timezone))
         else:
-            events_list = self.__strip_event_data(data)
+            events_iter = self.__strip_event_data(data)
 
-            display_console(f'Transformed data')
-            print(events_list)
+        preview = list(islice(events_iter, Events.__JSON_PREVIEW_ITEMS))
 
-            events_gen = (item for item in events_list)
+        display_df(f'Transformed data (first {len(preview)} events)', preview)
 
-        return events_gen
+        return chain(preview, events_iter)
     
-    def __write_events(self, events) -> None:
+    def __write_events(
+        self,
+        events: Iterable[dict] = (),
+        sink: EventSink | None = None
+    ) -> int:
         '''
-        Writes events to output file
+        Writes events to the output file. Events go through a journal one at a
+        time, so a generator is never held in memory, and the journal is then
+        finalized into an array of compact JSON objects, JSON Lines or an
+        indexed archive, depending on output_format.
+        ---
+        Args:
+            events (Iterable[dict]): Event resources to write
+            sink (EventSink | None): Journal the events were already written to
+        Returns
+            count (int): Number of events written
         '''
+        if sink is None:
+            out_path = self.__output_path()
+
+            with EventSink(out_path + '.partial', Events.__FSYNC_EVERY, append=False) as sink:
+                sink.write(events)
+
         try:
-            with open(Events.__EVENTS_OUTFILE, 'w', encoding='utf-8') as f:
-                json.dump(events, f, ensure_ascii=False, indent=4)
+            out_path, count = self.__finalize(sink)
         except FileNotFoundError:
             raise
 
-        display_panel(f'Wrote events to [yellow]"{Events.__EVENTS_OUTFILE}"', 'Success')
+        display_panel(f'Wrote {count} events to [yellow]"{out_path}"', 'Success')
+
+        return count
 
-    def __strip_event_data(self, data) -> list[dict]:
+    def __output_path(self) -> str:
         '''
-        Strips down existing event data into event template format
+        Returns EVENTS_OUTFILE with the suffix of the output format
         '''
-        events_list = []
+        suffix = Events.__OUTPUT_SUFFIXES[self.output_format]
+        return str(Path(Events.__EVENTS_OUTFILE).with_suffix(suffix))
 
-        for item in data:
-            new_event = {}
-            
-            for key, val in item.items():
-                if key in ['summary', 'start', 'end', 'location', 'description']:
-                    new_event[key] = val
+    def __finalize(self, sink: EventSink) -> tuple[str, int]:
+        '''
+        Turns a journal into the output file
+        ---
+        Returns
+            out_path (str): The output file
+            count (int): Number of events in it
+        '''
+        out_path = self.__output_path()
+        count = sink.finalize(out_path, self.output_format, Events.__ARCHIVE_BLOCK_SIZE)
 
-            events_list.append(new_event)
+        return out_path, count
 
-        return events_list
+    def __strip_event_data(self, data) -> Generator[dict, None, None]:
+        '''
+        Strips down existing event data into event template format, one event
+        at a time as the upload pipeline asks for it
+        '''
+        return strip_events(data, Events.__EVENT_FIELDS)
         
 # ::Functions --------------------------------------------------------------------- #
+def read_csv_chunks(
+    csv_file: str,
+    date_format: str,
+    engine: str = CSV_ENGINE,
+    chunksize: int = CSV_CHUNK_SIZE
+) -> Iterator:
+    '''
+    Reads the CSV_FIELDS columns of a csv file chunk by chunk with the given engine
+    ---
+    Args:
+        csv_file (str): csv file to import
+        date_format (str): strftime format of the due_date column
+        engine (str): One of CSV_ENGINES
+        chunksize (int): Rows per chunk
+    Returns
+        chunks (Iterator): DataFrames for the "c" and "pyarrow" engines, lists of
+            row dicts for the "stdlib" engine. due_date is parsed in both.
+    '''
+    readers = {
+        'c': read_csv_c,
+        'pyarrow': read_csv_pyarrow,
+        'stdlib': read_csv_stdlib
+    }
+
+    if engine not in readers:
+        raise ValueError(f'Unknown csv engine "{engine}". Choose from {list(readers)}.')
+
+    return readers[engine](csv_file, date_format, chunksize)
+
+def read_csv_c(csv_file: str, date_format: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    '''
+    Reads csv chunks with the pandas C engine
+    '''
+    import pandas as pd
+
+    date_col = CSV_FIELDS[4]
+
+    reader = pd.read_csv(
+        csv_file,
+        header=0,
+        usecols=CSV_FIELDS,
+        dtype=str,
+        chunksize=chunksize,
+        engine='c'
+    )
+
+    for chunk in reader:
+        chunk[date_col] = parse_dates(chunk[date_col], date_format)
+        yield check_dates(chunk, date_col)
+
+def read_csv_pyarrow(csv_file: str, date_format: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    '''
+    Reads csv record batches with pyarrow. String columns stay Arrow-backed,
+    which takes far less memory than Python str objects. Batches are sized by
+    bytes (about 1 MB), so chunksize is only a hint.
+    '''
+    import pandas as pd
+
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        raise ImportError('The "pyarrow" csv engine needs the pyarrow package installed.')
+
+    date_col = CSV_FIELDS[4]
+    reader = pa_csv.open_csv(
+        csv_file,
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=CSV_FIELDS,
+            column_types={col: pa.string() for col in CSV_FIELDS},
+            strings_can_be_null=True
+        )
+    )
+    arrow_strings = {pa.string(): pd.StringDtype('pyarrow')}.get
+
+    for batch in reader:
+        df = batch.to_pandas(types_mapper=arrow_strings)
+        df[date_col] = parse_dates(df[date_col], date_format)
+        yield check_dates(df, date_col)
+
+def read_csv_stdlib(csv_file: str, date_format: str, chunksize: int) -> Iterator[list[dict]]:
+    '''
+    Reads csv rows with the stdlib csv module, without importing pandas. Each
+    distinct due_date string is only parsed once.
+    '''
+    date_col = CSV_FIELDS[4]
+    dates: dict[str, datetime] = {}
+
+    with open(csv_file, 'r', newline='', encoding='utf-8') as in_file:
+        reader = csv.DictReader(in_file)
+        missing = [col for col in CSV_FIELDS if col not in (reader.fieldnames or [])]
+
+        if missing:
+            raise ValueError(f'Usecols do not match columns, columns expected but not found: {missing}')
+
+        for rows in chunked(reader, chunksize):
+            chunk = []
+
+            for row in rows:
+                record = {col: clean_csv_value(row.get(col)) for col in CSV_FIELDS}
+                value = record[date_col].strip()
+
+                if not value:
+                    raise missing_date_error(date_col)
+
+                if value not in dates:
+                    dates[value] = datetime.strptime(value, date_format)
+
+                record[date_col] = dates[value]
+                chunk.append(record)
+
+            yield chunk
+
+def clean_csv_value(value: str | None) -> str:
+    '''
+    Treats the values pandas reads as missing (NA, null, ...) as empty strings
+    '''
+    return '' if value is None or value in CSV_NA_VALUES else value
+
+def time_csv_engines(csv_file: str, date_format: str, engines: Iterable[str]) -> dict:
+    '''
+    Times reading and transforming a whole csv file with each engine
+    ---
+    Returns
+        timings (dict[str, float | None]): Seconds per engine, None if the
+            engine is not installed
+    '''
+    timings = {}
+
+    for engine in engines:
+        start = time.perf_counter()
+        try:
+            for chunk in read_csv_chunks(csv_file, date_format, engine):
+                chunk_to_events(chunk)
+            timings[engine] = time.perf_counter() - start
+        except ImportError as e:
+            log.debug(e)
+            timings[engine] = None
+
+    return timings
+
+def csv_file_events(
+    csv_file: str,
+    date_format: str | None,
+    course_key: str | None = None,
+    csv_engine: str = CSV_ENGINE,
+    timezone: str | None = None
+) -> Iterator[Event]:
+    '''
+    Imports a csv file as Event records, one chunk at a time. The first chunk
+    is parsed now, so a bad date format raises ValueError before any event is
+    used. course_key and timezone are unused; the signature is shared with
+    json_file_events, see FILE_PARSERS.
+    '''
+    if date_format is None:
+        raise ValueError(f'Could not infer the date format of "{csv_file}".')
+
+    chunks = read_csv_chunks(csv_file, date_format, csv_engine, CSV_CHUNK_SIZE)
+    first = next(chunks, None)
+
+    if first is None:
+        return iter([])
+
+    return chain.from_iterable(chunk_to_events(chunk) for chunk in chain([first], chunks))
+
+def json_file_events(
+    json_file: str,
+    date_format: str | None = None,
+    course_key: str | None = None,
+    csv_engine: str = CSV_ENGINE,
+    timezone: str | None = None,
+    jobs: int = 1
+) -> Iterator:
+    '''
+    Imports a json or jsonl file one item at a time: gradebook columns become
+    Event records when course_key is given, otherwise the items are stripped
+    Calendar events. jsonl lines are decoded on jobs worker threads.
+    date_format and csv_engine are unused.
+    '''
+    if json_file.endswith('.jsonl'):
+        items = read_jsonl_ranges(json_file, jobs)
+    else:
+        items = read_array(json_file, key='results')
+
+    items = json_objects(items, json_file)
+
+    if course_key:
+        columns = (gradebook_fields(item) for item in items)
+        return json_events(columns, course_key, DueDateConverter(timezone))
+
+    return strip_events(items, frozenset(EVENT_FIELDS))
+
+def json_objects(items: Iterable, json_file: str) -> Generator[dict, None, None]:
+    '''
+    Yields the items of a json or jsonl file, raising ValueError at the first
+    one that is not an object
+    '''
+    for i, item in enumerate(items, 1):
+        if not isinstance(item, dict):
+            raise ValueError(f'Item {i} of "{json_file}" is a {type(item).__name__}, not an object.')
+
+        yield item
+
+def read_jsonl_ranges(path: str, jobs: int = 1) -> Iterator[dict]:
+    '''
+    Yields the objects of a JSON Lines file in order. With more than one job,
+    the file is split into line-aligned byte ranges of about JSONL_RANGE_SIZE
+    bytes that the worker threads decode, and at most 2 * jobs ranges are
+    held in memory. One job reads one line at a time.
+    '''
+    if jobs <= 1:
+        return read_jsonl(path)
+
+    parts = -(-Path(path).stat().st_size // JSONL_RANGE_SIZE)
+    ranges = ordered_map(
+        lambda part: list(read_jsonl(path, *part)),
+        jsonl_ranges(path, max(parts, jobs)),
+        jobs
+    )
+
+    return chain.from_iterable(ranges)
+
+def csv_date_format(csv_file: str) -> str | None:
+    '''
+    Infers the due_date format of a csv file from a sample of its dates
+    '''
+    sample = sample_column(csv_file, CSV_FIELDS[4], DATE_SAMPLE_SIZE)
+    return infer_date_format(sample, DATE_FORMATS)
+
+# Parser of each FILE_MAP extension, called as parse(path, date_format,
+# course_key, csv_engine, timezone)
+FILE_PARSERS: dict = {
+    'csv': csv_file_events,
+    'json': json_file_events,
+    'jsonl': json_file_events
+}
+
+def parse_file(task: tuple) -> dict:
+    '''
+    Worker for Events.load_files: imports one file with its FILE_PARSERS parser.
+    Errors are returned rather than raised, so one bad file never stops the
+    others. A file's events are built into a list in the worker and pickled
+    back whole, so each file in flight costs its full event list in memory.
+    ---
+    Args:
+        task (tuple): (path, date_format, course_key, csv_engine, timezone)
+    Returns
+        result (dict): {"file", "events", "date_format", "error"}
+    '''
+    path, date_format, course_key, csv_engine, timezone = task
+    result = {'file': path, 'events': [], 'date_format': None, 'error': None}
+
+    try:
+        file_ext = path.split('.')[-1]
+
+        if file_ext == 'csv':
+            date_format = date_format or csv_date_format(path)
+            result['date_format'] = date_format
+
+        parse = FILE_PARSERS[file_ext]
+        result['events'] = list(parse(path, date_format, course_key, csv_engine, timezone))
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+
+    return result
+
+def expand_paths(pattern: str, extensions: Iterable[str]) -> list[str]:
+    '''
+    Returns the files with a supported extension in a directory or matching a
+    glob, sorted. "**" in a glob also matches subdirectories.
+    '''
+    if Path(pattern).is_dir():
+        pattern = str(Path(pattern) / '*')
+
+    suffixes = tuple(f'.{ext}' for ext in extensions)
+
+    return sorted(
+        path for path in glob.glob(pattern, recursive=True)
+        if path.endswith(suffixes) and Path(path).is_file()
+    )
+
+def benchmark_engines() -> str | None:
+    '''
+    Times every csv engine on a file the user picks. Only local parsing is
+    timed, so no Calendar connection is needed.
+    ---
+    Returns
+        engine (str | None): The fastest engine, or None if none could read the file
+    '''
+    log.debug('Starting benchmark_engines()')
+
+    user_file: str = display_prompt(PROMPTS['file'], help_func=display_cwd)
+
+    while not Path(user_file).is_file():
+        display_error(f'"{user_file}" is not recognized as a file.')
+        user_file = display_prompt(PROMPTS['file'], help_func=display_cwd)
+
+    date_format = csv_date_format(user_file) or display_prompt(
+        PROMPTS['date_format'],
+        help_func=display_strftime
+    )
+
+    timings = time_csv_engines(user_file, date_format, CSV_ENGINES)
+
+    table = Table(title=f'csv engines: {user_file}')
+    table.add_column('Engine', style='cyan')
+    table.add_column('Seconds', justify='right')
+
+    for engine, seconds in timings.items():
+        table.add_row(engine, f'{seconds:.3f}' if seconds is not None else 'unavailable')
+
+    console.print(table)
+
+    available = {engine: secs for engine, secs in timings.items() if secs is not None}
+
+    if not available:
+        display_error('No csv engine could read the file.')
+        return None
+
+    engine = min(available, key=available.get)
+    display_panel(f'Using the [cyan1]{engine}[/cyan1] engine for csv imports', 'Success')
+
+    return engine
+
+def chunk_to_events(chunk) -> list[Event]:
+    '''
+    Transforms a chunk from any csv engine into Event records
+    '''
+    if isinstance(chunk, list):
+        return rows_to_events(chunk)
+
+    return df_to_events(chunk)
+
+def rows_to_events(rows: list[dict]) -> list[Event]:
+    '''
+    Transforms stdlib csv rows into the same Event records as df_to_events
+    '''
+    dates = [row['due_date'].strftime('%Y-%m-%d') for row in rows]
+    ids = make_event_ids(
+        (row['course_key'] for row in rows), (row['asg_name'] for row in rows), dates
+    )
+
+    return [
+        Event(
+            event_id,
+            row['course_key'],
+            row['asg_name'],
+            date,
+            row['due_location'],
+            f"{row['course_name']}<br>{row['asg_desc']}"
+        )
+        for row, date, event_id in zip(rows, dates, ids)
+    ]
+
+def json_events(
+    columns: Iterable[dict],
+    course_key: str,
+    converter: DueDateConverter | None = None,
+    chunksize: int = JSON_CHUNK_SIZE
+) -> Generator[Event, None, None]:
+    '''
+    Transforms gradebook columns into Event records on their local due dates.
+    Columns are taken chunksize at a time and the due timestamps of a chunk are
+    converted together, then the events are built from the converted dates.
+    Columns without a due date are skipped.
+    ---
+    Args:
+        columns (Iterable[dict]): Gradebook columns with "name" and "grading.due"
+        course_key (str): The course key to prepend to the summary
+        converter (DueDateConverter | None): Converts and memoizes due dates;
+            defaults to one for the system's local zone
+        chunksize (int): Columns converted per pass
+    Returns
+        (Generator[Event, None, None]): Generator for event data
+    '''
+    converter = converter or DueDateConverter()
+
+    for chunk in chunked(columns, chunksize):
+        dates = converter.convert([item['grading'].get('due') for item in chunk])
+        due = [(item, date) for item, date in zip(chunk, dates) if date]
+        ids = make_event_ids(
+            repeat(course_key, len(due)),
+            (item.get('id') or item.get('name') for item, _ in due),
+            (date for _, date in due)
+        )
+
+        for (item, date_local), event_id in zip(due, ids):
+            yield Event(event_id, course_key, item.get('name'), date_local, 'Blackboard')
+
+def strip_events(events: Iterable[dict], fields: frozenset[str]) -> Generator[dict, None, None]:
+    '''
+    Yields a copy of each event holding only the whitelisted fields it has, in
+    the event's own key order
+    '''
+    for item in events:
+        yield {key: val for key, val in item.items() if key in fields}
+
+def check_dates(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
+    '''
+    Raises ValueError if the date column has empty values or did not parse
+    into datetimes
+    '''
+    import pandas as pd
+
+    if df[date_col].isna().any():
+        raise missing_date_error(date_col)
+
+    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+        raise ValueError(f'Column "{date_col}" did not match the date format.')
+
+    return df
+
+def missing_date_error(date_col: str) -> ValueError:
+    '''
+    The error every csv engine raises for a row without a due date
+    '''
+    return ValueError(f'Column "{date_col}" has empty values. Every row needs a due date.')
+
+def df_to_events(df: pd.DataFrame) -> list[Event]:
+    '''
+    Converts a chunk of csv data into Event records. The dates, ids and
+    descriptions are built with vectorized string/date operations on the source
+    columns, then each column is read once to build the records.
+    '''
+    course_key, course_name, asg_name, asg_desc, due_location = (
+        df[col].fillna('') for col in CSV_FIELDS if col != 'due_date'
+    )
+    dates = df['due_date'].dt.strftime('%Y-%m-%d')
+    ids = make_event_ids(course_key, asg_name, dates)
+    descriptions = course_name.str.cat(asg_desc, sep='<br>')
+
+    columns = (
+        col.to_numpy(dtype=object)
+        for col in (course_key, asg_name, dates, due_location, descriptions)
+    )
+
+    return [
+        Event(id, course, title, date, location, description)
+        for id, (course, title, date, location, description) in zip(ids, zip(*columns))
+    ]
+
+def make_event_ids(*columns: Iterable) -> list[str]:
+    '''
+    Derives stable Calendar event ids for whole columns at once, one id per row
+    of the fields that identify a source row. A hex digest only uses characters
+    allowed in event ids (base32hex).
+    '''
+    sha1 = hashlib.sha1
+    return [
+        sha1('\x1f'.join(map(str, parts)).encode('utf-8')).hexdigest()
+        for parts in zip(*columns)
+    ]
+
+def make_event_id(*parts) -> str:
+    '''
+    Derives the event id of a single source row, see make_event_ids
+    '''
+    return make_event_ids(*([part] for part in parts))[0]
+
+def until_error(items: Iterable, errors: list) -> Generator:
+    '''
+    Yields items until reading them raises ValueError, which is appended to
+    errors instead of propagating
+    '''
+    try:
+        yield from items
+    except ValueError as error:
+        errors.append(error)
+
+def chunked(iterable: Iterable, size: int) -> Generator[list, None, None]:
+    '''
+    Splits an iterable into lists of at most size items
+    '''
+    iterator = iter(iterable)
+
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def calendar_path(path: str, calendar_id: str) -> str:
+    '''
+    Returns the per-calendar variant of a local state file. The primary
+    calendar keeps the plain path, e.g. "output/event_cache.json" becomes
+    "output/event_cache.team_group_calendar_google_com.json" for another calendar.
+    '''
+    if calendar_id == 'primary':
+        return path
+
+    safe_id = ''.join(char if char.isalnum() else '_' for char in calendar_id)
+    path = Path(path)
+
+    return str(path.with_name(f'{path.stem}.{safe_id}{path.suffix}'))
+
 def naive_utcnow() -> datetime:
     '''
     Converts a timezone aware now datatime object to a naive now
@@ -530,6 +2062,15 @@ def naive_utcnow() -> datetime:
     naive_now = aware_now.replace(tzinfo=None)
     return naive_now
 
+def echo_events(events: Iterable[dict]) -> Generator[dict, None, None]:
+    '''
+    Prints the start and summary of each event as it passes through
+    '''
+    for event in events:
+        start = event["start"].get("dateTime", event["start"].get("date"))
+        print(start, event.get("summary"))
+        yield event
+
 def display_prompt(
     msg: str,
     choices=None,
@@ -569,7 +2110,8 @@ def display_IntPrompt(msg: str,
     help_func=None
 ) -> str:
     '''
-    Prompts user for an integer and allows them to exit program
+    Prompts user for an integer and allows them to exit program. A max of None
+    accepts any positive value.
     '''
     msg = (
         f'{msg} (or enter [cyan1]"-1"[/cyan1] to [bright_red]exit)[/bright_red]\n'
@@ -578,7 +2120,7 @@ def display_IntPrompt(msg: str,
     print()
     answer = IntPrompt.ask(msg, choices=choices)
 
-    while answer < -1 or answer > max or answer == 0:
+    while answer < -1 or (max is not None and answer > max) or answer == 0:
         display_error(f'Value cannot be less than -1 or exceed the max {max}')
         answer = IntPrompt.ask(msg, choices=choices)
 
@@ -677,24 +2219,114 @@ def display_strftime() -> None:
     
     console.print(table)
 
-def display_df(user_file: str, df):
+def display_ingest_report(pattern: str, report: list[dict]) -> None:
+    '''
+    Displays the events imported from each file of a directory or glob, and
+    the error of each file that was skipped
+    '''
+    log.debug('Starting display_ingest_report()...')
+    print()
+
+    table = Table(title=f'Files: {pattern}')
+    table.add_column('File', style='cyan')
+    table.add_column('Events', justify='right')
+    table.add_column('Error', style='bright_red')
+
+    for item in report:
+        table.add_row(item['file'], str(item['events']), item['error'] or '')
+
+    console.print(table)
+
+    skipped = sum(1 for item in report if item['error'])
+
+    if skipped:
+        display_error(f'Skipped {skipped} of {len(report)} files.')
+
+def display_df(user_file: str, df, paging: bool = False):
     '''
-    Displays a dataframe as a Rich table
+    Previews a dataframe, or a list of row dicts, as a Rich table. Only the first
+    PREVIEW_HEAD and last PREVIEW_TAIL rows and PREVIEW_SAMPLE random rows in
+    between are rendered, followed by the row count, rows per course and the
+    due date range. With paging, the user may then page through every row.
     '''
     log.debug('Starting display_df()...')
     print()
-    table = Table(title=user_file)
+
+    if isinstance(df, list):
+        df = [as_body(row) for row in df]
+        columns = None
+        stats = record_stats(df)
+    else:
+        columns = list(df.columns)
+        stats = frame_stats(df)
+
+    total = stats['rows']
+    positions = preview_positions(total, PREVIEW_HEAD, PREVIEW_TAIL, PREVIEW_SAMPLE)
+
+    # Print the table using the console
+    console.print(preview_table(user_file, columns, df, positions))
+
+    courses = ', '.join(
+        f'{course} ({count})' for course, count in islice(stats['courses'].items(), PREVIEW_COURSES)
+    )
+    more = len(stats['courses']) - PREVIEW_COURSES
+    summary = f'[cyan1]{total}[/cyan1] rows'
+
+    if stats['courses']:
+        summary += f' | {len(stats["courses"])} courses: {courses}' + (f' +{more} more' if more > 0 else '')
+    if stats['first']:
+        summary += f' | due {stats["first"]} to {stats["last"]}'
+
+    console.print(summary, justify='center')
+
+    if paging and total > len(positions):
+        if not Confirm.ask(f'Page through all {total} rows?', default=False):
+            return
+
+        for start in range(0, total, PREVIEW_PAGE_SIZE):
+            end = min(start + PREVIEW_PAGE_SIZE, total)
+            console.print(preview_table(
+                f'{user_file} (rows {start + 1}-{end} of {total})', columns, df, range(start, end)
+            ))
+
+            if end < total and not Confirm.ask('Next page?', default=True):
+                break
+
+def preview_table(title: str, columns: list | None, df, positions: Iterable[int]) -> Table:
+    '''
+    Builds a Rich table of the rows at positions, numbering each row and marking
+    skipped rows with an ellipsis. columns are a DataFrame's columns; a list of
+    row dicts is shown under every key of its rows at positions, with a blank
+    cell where a row lacks one.
+    '''
+    positions = list(positions)
+
+    if isinstance(df, list):
+        columns = record_columns(df, positions)
+
+    table = Table(title=title)
+    table.add_column('#', justify='right', style='dim')
 
     # Add columns to the table
-    for col in df.columns:
-        table.add_column(col)
+    for col in columns:
+        table.add_column(str(col))
+
+    if isinstance(df, list):
+        rows = [[df[i].get(col, '') for col in columns] for i in positions]
+    else:
+        rows = df.iloc[positions].values.tolist()
+
+    previous = -1
 
     # Add rows to the table
-    for row in df.values.tolist():
-        table.add_row(*[str(x) for x in row])
+    for position, row in zip(positions, rows):
+        if position != previous + 1:
+            table.add_row('…', *['…' for _ in columns])
 
-    # Print the table using the console
-    console.print(table)
+        table.add_row(str(position + 1), *[str(x) for x in row])
+        previous = position
+
+    return table
 
 def display_console(msg: str, justify="center") -> None:
     '''
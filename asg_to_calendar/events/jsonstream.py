@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# Program Name:         jsonstream.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Reads the items of a JSON array, or the lines of a JSON Lines file, one at
+#   a time, so large exports are never loaded into memory whole
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import json
+
+from typing import Generator, IO, Iterable
+
+
+# ::GLOBALS ------------------------------------------------------------------------ #
+# Characters read from the file at a time
+READ_SIZE: int = 1 << 16
+WHITESPACE: str = ' \t\n\r'
+_decoder = json.JSONDecoder()
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+class _Reader:
+    '''
+    A growing window over a text file that JSON values are decoded from
+    '''
+    def __init__(self, in_file: IO[str]) -> None:
+        self.in_file = in_file
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        '''
+        Drops consumed text and reads more. Returns False at end of file.
+        '''
+        if self.eof:
+            return False
+
+        text = self.in_file.read(max(READ_SIZE, len(self.buffer) - self.pos))
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        self.eof = not text
+
+        return not self.eof
+
+    def peek(self) -> str:
+        '''
+        Skips whitespace and returns the next character, or '' at end of file
+        '''
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        '''
+        Consumes char, raising JSONDecodeError if the next character differs
+        '''
+        if self.peek() != char:
+            raise json.JSONDecodeError(f'Expecting {char!r}', self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self):
+        '''
+        Decodes the next JSON value, reading more of the file until it is complete
+        '''
+        self.peek()
+
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+
+            # A number cut off by the end of the buffer decodes, but wrongly
+            if end == len(self.buffer) and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+
+# ::Functions --------------------------------------------------------------------- #
+def iter_array(in_file: IO[str], key: str | None = None) -> Generator:
+    '''
+    Yields the items of a JSON array one at a time
+    ---
+    Args:
+        in_file (IO[str]): File opened in text mode
+        key (str | None): When the document is an object, the top-level key that
+            holds the array, e.g. "results". A top-level array is read as is.
+    Returns
+        (Generator): Each decoded item of the array
+    '''
+    reader = _Reader(in_file)
+
+    if reader.peek() == '{':
+        reader.expect('{')
+
+        while True:
+            if reader.peek() == '}':
+                return
+
+            name = reader.value()
+            reader.expect(':')
+
+            if name == key and reader.peek() == '[':
+                break
+
+            reader.value() # Skip a value that is not the array
+
+            if reader.peek() == ',':
+                reader.expect(',')
+
+    reader.expect('[')
+
+    if reader.peek() == ']':
+        return
+
+    while True:
+        yield reader.value()
+
+        if reader.peek() == ']':
+            return
+
+        reader.expect(',')
+
+def read_array(path: str, key: str | None = None) -> Generator:
+    '''
+    Yields the items of a JSON array file one at a time, like iter_array. The
+    file is opened on the first item and closed when the items run out, an
+    error is raised or the generator is closed, so a caller that stops early
+    never leaks it.
+    ---
+    Args:
+        path (str): JSON file
+        key (str | None): Top-level key that holds the array, as in iter_array
+    Returns
+        (Generator): Each decoded item of the array
+    '''
+    with open(path, 'r', encoding='utf-8') as in_file:
+        yield from iter_array(in_file, key)
+
+def gradebook_fields(column: dict) -> dict:
+    '''
+    Keeps only the fields of a gradebook column that events are built from
+    '''
+    return {
+        'id': column.get('id'),
+        'name': column.get('name'),
+        'grading': {'due': (column.get('grading') or {}).get('due')}
+    }
+
+def read_jsonl(path: str, start: int = 0, end: int | None = None) -> Generator:
+    '''
+    Yields the objects of a JSON Lines file, one per non-blank line
+    ---
+    Args:
+        path (str): JSON Lines file
+        start (int): Byte offset of the first line to read
+        end (int | None): Byte offset to stop at, which must be a line boundary
+            such as those from jsonl_ranges. Reads to the end of file if None.
+    Returns
+        (Generator): Each decoded object
+    '''
+    with open(path, 'rb') as in_file:
+        in_file.seek(start)
+        pos = start
+
+        for line_no, line in enumerate(in_file, 1):
+            if end is not None and pos >= end:
+                return
+
+            pos += len(line)
+
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise json.JSONDecodeError(
+                        f'{e.msg} (line {line_no} after byte {start})', e.doc, e.pos
+                    ) from e
+
+def jsonl_ranges(path: str, parts: int) -> list[tuple[int, int]]:
+    '''
+    Splits a JSON Lines file into at most parts byte ranges that start and end
+    on line boundaries, so each range can be read on its own with read_jsonl
+    '''
+    with open(path, 'rb') as in_file:
+        size = in_file.seek(0, 2)
+        bounds = [0]
+
+        for i in range(1, max(1, parts)):
+            in_file.seek(max(size * i // parts, bounds[-1]))
+            in_file.readline() # Move to the start of the next line
+            pos = in_file.tell()
+
+            if pos < size and pos > bounds[-1]:
+                bounds.append(pos)
+
+    bounds.append(size)
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+def write_jsonl(out_file: IO[str], items: Iterable[dict]) -> int:
+    '''
+    Writes items to out_file one JSON object per line and returns the count
+    '''
+    count = 0
+
+    for item in items:
+        out_file.write(json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+        out_file.write('\n')
+        count += 1
+
+    return count
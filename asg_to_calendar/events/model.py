@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# Program Name:         model.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Compact record for the all-day assignment events built from csv and json
+#   imports. Events only become API request bodies when they are sent.
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+from sys import intern
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+class Event:
+    '''
+    An all-day event on an assignment's due date. Slots keep each record to a
+    handful of pointers, and the course, date and location strings shared by
+    thousands of assignments are interned, so every record points at one copy.
+    ---
+    Args:
+        id (str): Deterministic event id, see make_event_ids
+        course (str): Course key, the summary prefix
+        title (str): Assignment name
+        date (str): Due date, "yyyy-mm-dd"
+        location (str): Due location
+        description (str | None): Event description, left out of the body if None
+    '''
+    __slots__ = ('id', 'course', 'title', 'date', 'location', 'description')
+
+    def __init__(
+        self,
+        id: str,
+        course: str,
+        title: str,
+        date: str,
+        location: str = '',
+        description: str | None = None
+    ) -> None:
+        self.id = id
+        self.course = intern(course)
+        self.title = title
+        self.date = intern(date)
+        self.location = intern(location)
+        self.description = description
+
+    @property
+    def summary(self) -> str:
+        return f'{self.course}: {self.title}'
+
+    def get(self, key: str, default=None):
+        '''
+        Reads a field of the request body, like dict.get, without building it
+        '''
+        if key in ('id', 'summary', 'location'):
+            return getattr(self, key)
+        if key in ('start', 'end'):
+            return {'date': self.date}
+        if key == 'description' and self.description is not None:
+            return self.description
+
+        return default
+
+    def to_body(self) -> dict:
+        '''
+        Returns the Calendar API request body for the event
+        '''
+        body = {
+            'id': self.id,
+            'summary': self.summary,
+            'start': {'date': self.date},
+            'end': {'date': self.date},
+            'location': self.location
+        }
+
+        if self.description is not None:
+            body['description'] = self.description
+
+        return body
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Event):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in Event.__slots__)
+
+    def __hash__(self) -> int:
+        # Equal events share their id, so the id alone keeps hash and == consistent
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f'Event({self.to_body()!r})'
+
+    def __reduce__(self) -> tuple:
+        # Pickled events (e.g. from a parsing process) are rebuilt through
+        # __init__, so their shared strings are interned again
+        return Event, tuple(getattr(self, name) for name in Event.__slots__)
+
+
+# ::Functions --------------------------------------------------------------------- #
+def as_body(event: Event | dict) -> dict:
+    '''
+    Returns the request body of an Event; event dicts pass through unchanged
+    '''
+    return event.to_body() if isinstance(event, Event) else event
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# Program Name:         preview.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Picks the rows shown when previewing imported data and summarizes the
+#   rest, so a preview costs the same for ten rows or a million
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+from __future__ import annotations
+
+import random
+
+from collections import Counter
+
+from typing import Iterable, TYPE_CHECKING
+
+# pandas is slow to import, so it is only imported for DataFrame previews
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# ::GLOBALS ------------------------------------------------------------------------ #
+# Columns the summary reads the course key and the due date from, by preference
+COURSE_COLS: tuple[str] = ('course_key', 'summary')
+DATE_COLS: tuple[str] = ('due_date', 'start')
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def preview_positions(
+    total: int,
+    head: int,
+    tail: int,
+    sample: int,
+    seed: int | None = None
+) -> list[int]:
+    '''
+    Returns the sorted row positions to show: the first head rows, the last
+    tail rows and a random sample of the rows in between
+    ---
+    Args:
+        total (int): Number of rows
+        head (int): Rows shown from the start
+        tail (int): Rows shown from the end
+        sample (int): Rows drawn at random from the middle
+        seed (int | None): Seed for a repeatable sample
+    Returns
+        positions (list[int]): Row positions, in order
+    '''
+    if total <= head + tail + sample:
+        return list(range(total))
+
+    middle = range(head, total - tail)
+    picked = random.Random(seed).sample(middle, min(sample, len(middle)))
+
+    return [*range(head), *sorted(picked), *range(total - tail, total)]
+
+def frame_stats(df: pd.DataFrame) -> dict:
+    '''
+    Summarizes a DataFrame with vectorized operations
+    ---
+    Returns
+        stats (dict): {"rows": int, "courses": {course: rows}, "first": str,
+            "last": str}; courses and dates are empty if the columns are missing
+    '''
+    stats = {'rows': len(df), 'courses': {}, 'first': '', 'last': ''}
+
+    course_col = next((col for col in COURSE_COLS if col in df.columns), None)
+    date_col = next((col for col in DATE_COLS if col in df.columns), None)
+
+    if course_col:
+        courses = df[course_col].astype('string')
+
+        if course_col == 'summary':
+            courses = courses.str.split(': ', n=1).str[0]
+
+        stats['courses'] = courses.value_counts(sort=True).to_dict()
+
+    if date_col and len(df):
+        dates = df[date_col].dropna()
+
+        if len(dates):
+            stats['first'] = str(dates.min())[:10]
+            stats['last'] = str(dates.max())[:10]
+
+    return stats
+
+def record_stats(records: list[dict]) -> dict:
+    '''
+    Summarizes a list of row dicts or event bodies, like frame_stats
+    '''
+    courses = Counter()
+    dates = []
+
+    for record in records:
+        course = record.get('course_key')
+
+        if course is None and ': ' in (record.get('summary') or ''):
+            course = record['summary'].split(': ', 1)[0]
+
+        if course is not None:
+            courses[course] += 1
+
+        date = record.get('due_date') or (record.get('start') or {}).get('date')
+
+        if not date and isinstance(record.get('grading'), dict):
+            date = record['grading'].get('due')
+
+        if date:
+            dates.append(str(date)[:10])
+
+    return {
+        'rows': len(records),
+        'courses': dict(courses.most_common()),
+        'first': min(dates, default=''),
+        'last': max(dates, default='')
+    }
+
+def record_columns(records: list[dict], positions: Iterable[int]) -> list[str]:
+    '''
+    Returns the keys of the records at positions in the order they are first
+    seen, so rows with differing keys still line up under their own columns
+    '''
+    columns = {}
+
+    for i in positions:
+        columns.update(dict.fromkeys(records[i]))
+
+    return list(columns)
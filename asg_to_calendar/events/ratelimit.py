@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# Program Name:         ratelimit.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Token-bucket rate limiting and retry with exponential backoff for Calendar
+#   API calls
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import random
+
+import threading
+
+import time
+
+from typing import Callable
+
+from googleapiclient.errors import HttpError
+
+
+# ::GLOBALS ------------------------------------------------------------------------ #
+# 403 reasons that mean "slow down" rather than "not allowed"
+RATE_LIMIT_REASONS: tuple[str] = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+class RateLimiter:
+    '''
+    Thread-safe token bucket shared by every Calendar call
+    ---
+    Args:
+        rate (float): Requests per second. 0 disables the limiter
+        burst (int): Requests that may be sent at once after an idle period
+    '''
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.__rate = rate
+        self.__burst = max(1, burst)
+        self.__tokens = float(self.__burst)
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self, cost: int = 1) -> float:
+        '''
+        Takes cost tokens, sleeping until they are available. A cost larger than
+        the burst puts the bucket in debt, which later callers wait out.
+        ---
+        Args:
+            cost (int): Number of requests about to be sent
+        Returns
+            wait (float): Seconds spent waiting
+        '''
+        if self.__rate <= 0:
+            return 0.0
+
+        with self.__lock:
+            now = time.monotonic()
+            elapsed = now - self.__updated
+            self.__tokens = min(self.__burst, self.__tokens + elapsed * self.__rate)
+            self.__updated = now
+            self.__tokens -= cost
+            wait = -self.__tokens / self.__rate if self.__tokens < 0 else 0.0
+
+        if wait:
+            time.sleep(wait)
+
+        return wait
+
+
+class RetryPolicy:
+    '''
+    Exponential backoff with full jitter and a retry budget shared across threads
+    ---
+    Args:
+        max_retries (int): Retries allowed for a single call
+        budget (int): Retries allowed for the whole run
+        base (float): Delay in seconds before the first retry
+        cap (float): Longest delay in seconds between retries
+    '''
+    def __init__(
+        self,
+        max_retries: int,
+        budget: int,
+        base: float = 1.0,
+        cap: float = 64.0
+    ) -> None:
+        self.max_retries = max_retries
+        self.__budget = budget
+        self.__base = base
+        self.__cap = cap
+        self.__lock = threading.Lock()
+
+    @property
+    def budget(self) -> int:
+        ''' Retries left for the run '''
+        return self.__budget
+
+    def delay(self, attempt: int, error: Exception) -> float | None:
+        '''
+        Returns how long to wait before retrying, or None to give up
+        ---
+        Args:
+            attempt (int): Number of retries already made for this call
+            error (Exception): The error the call failed with
+        Returns
+            delay (float | None): Seconds to sleep before the next attempt
+        '''
+        if attempt >= self.max_retries or not is_retryable(error):
+            return None
+
+        with self.__lock:
+            if self.__budget <= 0:
+                return None
+            self.__budget -= 1
+
+        delay = random.uniform(0, min(self.__cap, self.__base * 2 ** attempt))
+
+        return max(delay, retry_after(error) or 0.0)
+
+    def call(
+        self,
+        func: Callable,
+        limiter: RateLimiter | None = None,
+        cost: int = 1
+    ):
+        '''
+        Calls func, retrying rate limit and server errors with backoff
+        ---
+        Args:
+            func (Callable): The API call, usually an HttpRequest.execute
+            limiter (RateLimiter): Limiter to take tokens from before each attempt
+            cost (int): Requests the call sends, e.g. the size of a batch
+        Returns
+            The result of func
+        '''
+        attempt = 0
+
+        while True:
+            if limiter:
+                limiter.acquire(cost)
+            try:
+                return func()
+            except HttpError as error:
+                delay = self.delay(attempt, error)
+
+                if delay is None:
+                    raise
+
+                time.sleep(delay)
+                attempt += 1
+
+
+# ::Functions --------------------------------------------------------------------- #
+def is_retryable(error: Exception) -> bool:
+    '''
+    Checks if a Calendar error is a rate limit (403/429) or server (5xx) error
+    '''
+    if not isinstance(error, HttpError):
+        return False
+
+    status = error.resp.status
+
+    if status == 403:
+        details = error.error_details if isinstance(error.error_details, list) else []
+        return any(
+            detail.get('reason') in RATE_LIMIT_REASONS
+            for detail in details
+            if isinstance(detail, dict)
+        ) or 'rate limit' in error.reason.lower()
+
+    return status == 429 or status >= 500
+
+
+def retry_after(error: Exception) -> float | None:
+    '''
+    Returns the seconds from a Retry-After header, if the response had one
+    '''
+    resp = getattr(error, 'resp', None)
+    value = resp.get('retry-after') if resp is not None else None
+
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
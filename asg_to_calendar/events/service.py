@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# Program Name:         service.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Builds Calendar API Resources from a cached discovery document
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+from __future__ import annotations
+
+import json
+
+import os
+
+import threading
+
+from typing import TYPE_CHECKING
+
+# googleapiclient.discovery is slow to import, so it is imported on first build
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+
+
+# ::GLOBALS ------------------------------------------------------------------------ #
+# Parsed discovery documents, keyed by (service name, version)
+_documents: dict[tuple[str, str], dict] = {}
+_lock = threading.Lock()
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def discovery_document(name: str, version: str, cache_file: str) -> dict:
+    '''
+    Returns the discovery document for an API. It is parsed once per process,
+    read from cache_file when present, and otherwise taken from the static copy
+    shipped with googleapiclient (then written to cache_file).
+    ---
+    Args:
+        name (str): API name, e.g. "calendar"
+        version (str): API version, e.g. "v3"
+        cache_file (str): On-disk copy of the document
+    Returns
+        document (dict): The parsed discovery document
+    '''
+    key = (name, version)
+
+    with _lock:
+        if key in _documents:
+            return _documents[key]
+
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as in_file:
+                document = json.load(in_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            from googleapiclient.discovery_cache import get_static_doc
+
+            content = get_static_doc(name, version)
+
+            if content is None:
+                raise ValueError(f'No discovery document for {name} {version}')
+
+            document = json.loads(content)
+
+            try:
+                tmp_file = cache_file + '.tmp'
+                with open(tmp_file, 'w', encoding='utf-8') as out_file:
+                    out_file.write(content)
+                os.replace(tmp_file, cache_file)
+            except OSError:
+                # The static copy still works without an on-disk cache
+                pass
+
+        _documents[key] = document
+
+        return document
+
+
+def build_service(name: str, version: str, credentials, cache_file: str) -> Resource:
+    '''
+    Constructs a Resource without fetching the discovery document over HTTP.
+    Each call gets its own HTTP transport.
+    '''
+    from googleapiclient.discovery import build_from_document
+
+    return build_from_document(
+        discovery_document(name, version, cache_file),
+        credentials=credentials
+    )
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# Program Name:         sink.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Writes events to disk as they are created, so a crash never loses the ids
+#   of events that already exist in the calendar
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import json
+
+import os
+
+from typing import Iterable
+
+from events.archive import ArchiveWriter
+from events.jsonstream import read_jsonl
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+class EventSink:
+    '''
+    Appends events to a JSON Lines journal, one compact object per line. The
+    journal is flushed after every write and fsynced every fsync_every events,
+    and it is left in place if the run crashes, so it can be passed to the
+    delete command or kept as a record. finalize() turns it into the output file.
+    Re-running a file after a crash resolves the events the unfinished run
+    already created as conflicts; their ids are read from the resumed journal
+    so they are not written twice. Ids are otherwise not tracked: they are
+    deterministic, so a run never creates the same event twice.
+    ---
+    Args:
+        path (str): Journal file
+        fsync_every (int): Events written between fsyncs
+        append (bool): Keep events an unfinished run left in the journal
+    '''
+    def __init__(self, path: str, fsync_every: int = 500, append: bool = True) -> None:
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.resumed = append and os.path.exists(path) and os.path.getsize(path) > 0
+
+        if self.resumed:
+            drop_partial_line(path)
+
+        # Only the ids already in a resumed journal are held, never new ones
+        self.resumed_ids: frozenset[str] = journal_ids(path) if self.resumed else frozenset()
+        self.count = 0
+        self.__unsynced = 0
+        self.__file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def __enter__(self) -> 'EventSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(self, events: Iterable[dict]) -> int:
+        '''
+        Appends events to the journal, skipping those of a resumed journal
+        ---
+        Args:
+            events (Iterable[dict]): Event resources, e.g. one batch of results
+        Returns
+            count (int): Number of events written
+        '''
+        count = 0
+
+        for event in events:
+            if event.get('id') in self.resumed_ids:
+                continue
+
+            self.__file.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')))
+            self.__file.write('\n')
+            count += 1
+
+        self.count += count
+        self.__unsynced += count
+        self.__file.flush()
+
+        if self.__unsynced >= self.fsync_every:
+            self.sync()
+
+        return count
+
+    def sync(self) -> None:
+        '''
+        Forces written events onto disk
+        '''
+        if not self.__file.closed:
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+            self.__unsynced = 0
+
+    def close(self) -> None:
+        '''
+        Syncs and closes the journal, leaving it on disk
+        '''
+        if not self.__file.closed:
+            self.sync()
+            self.__file.close()
+
+    def discard(self) -> None:
+        '''
+        Closes and removes the journal
+        '''
+        self.close()
+
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def finalize(
+        self,
+        out_path: str,
+        output_format: str = 'json',
+        block_size: int = 1000
+    ) -> int:
+        '''
+        Moves the journal to out_path: as is for "jsonl", as a JSON array with
+        one compact event per line for "json", or as an indexed archive of
+        block_size event blocks for "archive". The journal is removed afterwards.
+        ---
+        Returns
+            count (int): Number of events in the output file
+        '''
+        self.close()
+
+        if output_format == 'jsonl':
+            os.replace(self.path, out_path)
+            return count_lines(out_path)
+
+        if output_format == 'archive':
+            with ArchiveWriter(out_path, block_size) as archive:
+                count = archive.write(read_jsonl(self.path))
+
+            os.remove(self.path)
+            return count
+
+        count = 0
+        tmp_path = out_path + '.tmp'
+
+        with open(self.path, 'r', encoding='utf-8') as in_file, \
+                open(tmp_path, 'w', encoding='utf-8') as out_file:
+            out_file.write('[')
+
+            for line in in_file:
+                line = line.strip()
+
+                if line:
+                    out_file.write(',\n' if count else '\n')
+                    out_file.write(line)
+                    count += 1
+
+            out_file.write('\n]\n')
+            out_file.flush()
+            os.fsync(out_file.fileno())
+
+        os.replace(tmp_path, out_path)
+        os.remove(self.path)
+
+        return count
+
+
+# ::Functions --------------------------------------------------------------------- #
+def count_lines(path: str) -> int:
+    '''
+    Counts the non-blank lines of a file
+    '''
+    with open(path, 'rb') as in_file:
+        return sum(1 for line in in_file if line.strip())
+
+def journal_ids(path: str) -> frozenset[str]:
+    '''
+    Returns the ids of the events in a journal
+    '''
+    return frozenset(event['id'] for event in read_jsonl(path) if event.get('id') is not None)
+
+def drop_partial_line(path: str) -> None:
+    '''
+    Truncates a line left half-written by a crash from the end of a file
+    '''
+    with open(path, 'rb+') as in_file:
+        size = in_file.seek(0, 2)
+        end = size
+
+        while end > 0:
+            step = min(4096, end)
+            in_file.seek(end - step)
+            block = in_file.read(step)
+            newline = block.rfind(b'\n')
+
+            if newline != -1:
+                end = end - step + newline + 1
+                break
+
+            end -= step
+
+        if end < size:
+            in_file.truncate(end)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# Program Name:         sync.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Local SQLite state for incremental syncs.  Maps each source record to the
+#   Calendar event created for it, so reruns only send changed assignments.
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import hashlib
+
+import json
+
+import sqlite3
+
+from dataclasses import dataclass, field
+
+from datetime import datetime, timezone
+
+from typing import Iterable
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+@dataclass
+class SyncPlan:
+    '''
+    API calls needed to bring the calendar in line with a source file
+    '''
+    inserts: list[tuple] = field(default_factory=list)    # (key, digest, body)
+    patches: list[tuple] = field(default_factory=list)    # (key, digest, event_id, body)
+    deletes: list[tuple] = field(default_factory=list)    # (key, event_id)
+    unchanged: int = 0
+    events: int = 0     # Records in the source
+    stored: int = 0     # Records kept from previous syncs
+
+    @property
+    def calls(self) -> int:
+        ''' Calendar requests the plan will send '''
+        return len(self.inserts) + len(self.patches) + len(self.deletes)
+
+    @property
+    def full_calls(self) -> int:
+        ''' Calendar requests a full re-create would send: delete every stored
+        event, then insert every source record '''
+        return self.stored + self.events
+
+    @property
+    def avoided(self) -> int:
+        ''' Calendar requests saved compared to a full re-create '''
+        return self.full_calls - self.calls
+
+
+class SyncStore:
+    '''
+    SQLite table of synced records, keyed by source file and record key
+    ---
+    Args:
+        path (str): Database file. Created on first use
+    '''
+    __SCHEMA: str = (
+        'CREATE TABLE IF NOT EXISTS records ('
+        '    source TEXT NOT NULL,'
+        '    key TEXT NOT NULL,'
+        '    digest TEXT NOT NULL,'
+        '    event_id TEXT NOT NULL,'
+        '    updated TEXT NOT NULL,'
+        '    PRIMARY KEY (source, key)'
+        ')'
+    )
+
+    def __init__(self, path: str) -> None:
+        self.__conn = sqlite3.connect(path)
+        self.__conn.execute(SyncStore.__SCHEMA)
+        self.__conn.commit()
+
+    def __enter__(self) -> 'SyncStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def records(self, source: str) -> dict[str, tuple[str, str]]:
+        '''
+        Returns {key: (digest, event_id)} for every record synced from source
+        '''
+        rows = self.__conn.execute(
+            'SELECT key, digest, event_id FROM records WHERE source = ?', (source,)
+        )
+        return {key: (digest, event_id) for key, digest, event_id in rows}
+
+    def upsert(self, source: str, rows: Iterable[tuple]) -> None:
+        '''
+        Saves (key, digest, event_id) rows for source
+        '''
+        now = datetime.now(timezone.utc).isoformat()
+        with self.__conn:
+            self.__conn.executemany(
+                'INSERT INTO records (source, key, digest, event_id, updated) '
+                'VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (source, key) DO UPDATE SET '
+                'digest = excluded.digest, event_id = excluded.event_id, updated = excluded.updated',
+                [(source, key, digest, event_id, now) for key, digest, event_id in rows]
+            )
+
+    def delete(self, source: str, keys: Iterable[str]) -> None:
+        '''
+        Forgets the given keys for source
+        '''
+        with self.__conn:
+            self.__conn.executemany(
+                'DELETE FROM records WHERE source = ? AND key = ?',
+                [(source, key) for key in keys]
+            )
+
+    def close(self) -> None:
+        self.__conn.close()
+
+
+# ::Functions --------------------------------------------------------------------- #
+def record_key(event: dict, seen: dict[str, int]) -> str:
+    '''
+    Identifies a record by its summary ("course_key: asg_name"). Repeated
+    summaries in one file get a running suffix so each keeps its own event.
+    '''
+    summary = event.get('summary', '')
+    seen[summary] = seen.get(summary, 0) + 1
+
+    return summary if seen[summary] == 1 else f'{summary}#{seen[summary]}'
+
+
+def record_event(event: dict, key: str) -> dict:
+    '''
+    Gives a repeated record its own event id. Ids are derived from the course,
+    name and due date, so same-day repeats of a summary would otherwise share
+    one event, and deleting either record would delete it.
+    '''
+    if 'id' not in event or key == event.get('summary', ''):
+        return event
+
+    digest = hashlib.sha1(f'{event["id"]}\x1f{key}'.encode('utf-8')).hexdigest()
+
+    return {**event, 'id': digest}
+
+def content_hash(event: dict) -> str:
+    '''
+    Hashes the event body, ignoring the id, so any edited field is detected
+    '''
+    body = {key: val for key, val in event.items() if key != 'id'}
+    encoded = json.dumps(body, sort_keys=True, ensure_ascii=False, default=str)
+
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def plan_sync(events: Iterable[dict], records: dict[str, tuple[str, str]]) -> SyncPlan:
+    '''
+    Compares source events with the stored records
+    ---
+    Args:
+        events (Iterable[dict]): Event bodies from get_csv_events/get_json_events
+        records (dict): {key: (digest, event_id)} from SyncStore.records
+    Returns
+        plan (SyncPlan): Inserts for new records, patches for changed ones and
+            deletes for records no longer in the source
+    '''
+    plan = SyncPlan(stored=len(records))
+    seen: dict[str, int] = {}
+    keys = set()
+
+    for event in events:
+        key = record_key(event, seen)
+        digest = content_hash(event)
+        keys.add(key)
+        plan.events += 1
+
+        if key not in records:
+            plan.inserts.append((key, digest, record_event(event, key)))
+        elif records[key][0] != digest:
+            body = {k: v for k, v in event.items() if k != 'id'}
+            plan.patches.append((key, digest, records[key][1], body))
+        else:
+            plan.unchanged += 1
+
+    plan.deletes = [
+        (key, event_id) for key, (_, event_id) in records.items() if key not in keys
+    ]
+
+    return plan
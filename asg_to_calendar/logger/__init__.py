@@ -0,0 +1 @@
+from .logger import logger
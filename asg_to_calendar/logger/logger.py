@@ -18,7 +18,8 @@ logger = logging.getLogger(__name__)
 
 # the handler determines where the logs go: stdout/file
 shell_handler = RichHandler(rich_tracebacks=True)
-file_handler = logging.FileHandler(LOGFILE, mode='w')
+# delay=True opens the log file on the first record, after settings.init_dirs()
+file_handler = logging.FileHandler(LOGFILE, mode='w', delay=True)
 
 logger.setLevel(logging.INFO)
 shell_handler.setLevel(logging.DEBUG)
@@ -1,153 +1,342 @@
 #!/usr/bin/env python3
-# Program Name:         program14.py
+# Program Name:         main.py
 # Program Author:       Lew Kim
 # Date Created:         10/21/24
 # Program Description:
-#   Takes a spreadsheet of classes and assignments, and adds them as events to a
-#   google calendar
+#   Headless commands for creating, ingesting, deleting, listing and syncing
+#   Calendar events from scheduled jobs. Nothing is prompted; each command prints a JSON
+#   summary and exits with a status code.
 
 # ::IMPORTS ------------------------------------------------------------------------ #
 import logging
-# from asg_to_calendar.src import logger as log
-from utils import logger as log
-from utils import import_csv, display_strftime, display_error
+from logger import logger as log
+
+from settings import JOBS, RATE_LIMIT, RETRY_BUDGET, BATCH_SIZE, CALENDAR_ID, init_dirs
+from settings import CSV_ENGINES, CSV_ENGINE, OUTPUT_FORMATS, OUTPUT_FORMAT, TIMEZONE
+from settings import INGEST_PROCESSES
+
+import json
+
+import sqlite3
+
+import time
 
 import typer
+from typing import Callable
 from typing_extensions import Annotated
 
 from pathlib import Path
 
-# from asg_to_calendar.settings import COMMANDS, PROMPTS
-
-# # Calendar methods
-# from asg_to_calendar.events import Events
-
-# # Reporting google calendar http errors
-# from googleapiclient.errors import HttpError
+# Calendar methods
+from events import Events, AuthRequired
 
-# CLI output functions
-from rich import print
-from rich.prompt import Confirm
+# Reporting google calendar http and auth errors
+from googleapiclient.errors import HttpError
+from google.auth.exceptions import GoogleAuthError
+from httplib2.error import HttpLib2Error
 
-# # Display functions
-# from .events import display_cmds, display_error, display_panel, display_prompt
-# from .events import Events, ExitProgram
+# Logs go to stderr, so stdout only carries the summary
+from rich.console import Console
+from rich.logging import RichHandler
 
 
 # ::SETUP -------------------------------------------------------------------------- #
-# def callback(verbose: bool = False):
-#     """
-#     Manage users in the awesome CLI app.
-#     """
-#     print("Hello World again.")
-#     if verbose:
-#         log.setLevel(logging.DEBUG)
-#         log.debug('Verbose mode has been selected. Switching to logging.DEBUG level')
+app = typer.Typer(
+    help='Headless Calendar commands for scheduled and bulk runs.',
+    no_args_is_help=True
+)
+
+for handler in log.handlers:
+    if isinstance(handler, RichHandler):
+        handler.console = Console(stderr=True)
 
-app = typer.Typer(help="Awesome CLI user manager.")
 
 # ::GLOBALS ------------------------------------------------------------------------ #
+# Exit codes
+EXIT_OK: int = 0            # Every event was processed
+EXIT_FAILED: int = 1        # Some events or files failed
+EXIT_BAD_INPUT: int = 2     # The file or an option could not be used
+EXIT_API_ERROR: int = 3     # Authentication or the Calendar API failed
+EXIT_LOCAL_ERROR: int = 4   # A local file or the sync database could not be used
+
+FileOption = Annotated[
+    Path,
+    typer.Option(
+        '--file', '-f',
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        resolve_path=True,
+        help='csv, json or jsonl file to read'
+    )
+]
+DateFormatOption = Annotated[
+    str | None,
+    typer.Option(
+        '--date-format', '-d',
+        help='strftime format of the "due_date" column, e.g. "%Y-%m-%d". '
+             'Inferred from the file if omitted.'
+    )
+]
+CourseKeyOption = Annotated[
+    str | None,
+    typer.Option(
+        '--course-key', '-k',
+        help='Course key of a Blackboard gradebook json/jsonl export. Without it '
+             'json files are read as Calendar events.'
+    )
+]
+BatchSizeOption = Annotated[
+    int,
+    typer.Option('--batch-size', '-b', min=1, help='Requests per batch request')
+]
+SaveOption = Annotated[
+    bool,
+    typer.Option('--save/--no-save', help='Write the events to the output file')
+]
 
 
 # ::CORE LOGIC --------------------------------------------------------------------- #
-@app.command()
-def create_events(
-    file: Annotated[
-        Path,
-        typer.Option(
-            exists=True,
-            file_okay=True,
-            dir_okay=False,
-            writable=False,
-            readable=True,
-            resolve_path=True,
-        ),
-    ],
-    date_format: Annotated[
+@app.callback()
+def callback(
+    ctx: typer.Context,
+    calendar_id: Annotated[
+        str, typer.Option('--calendar-id', '-c', help='Calendar to use')
+    ] = CALENDAR_ID,
+    jobs: Annotated[
+        int, typer.Option('--jobs', '-j', min=1, help='Worker threads sending batches')
+    ] = JOBS,
+    rate_limit: Annotated[
+        float, typer.Option('--rate', '-r', help='Calendar requests per second')
+    ] = RATE_LIMIT,
+    retry_budget: Annotated[
+        int, typer.Option('--retry-budget', help='Retries allowed before giving up')
+    ] = RETRY_BUDGET,
+    csv_engine: Annotated[
+        str, typer.Option('--engine', '-e', help=f'csv parser: {", ".join(CSV_ENGINES)}')
+    ] = CSV_ENGINE,
+    output_format: Annotated[
         str,
         typer.Option(
-            help=display_strftime(), rich_help_panel="Customization and Utils"
-        ),
+            '--output-format', '-o', help=f'Saved file format: {", ".join(OUTPUT_FORMATS)}'
+        )
+    ] = OUTPUT_FORMAT,
+    timezone: Annotated[
+        str | None,
+        typer.Option('--timezone', '-z', help='IANA zone for json due dates')
+    ] = TIMEZONE,
+    processes: Annotated[
+        int,
+        typer.Option('--processes', '-p', min=1, help='Worker processes parsing files for ingest')
+    ] = INGEST_PROCESSES,
+    verbose: Annotated[
+        bool, typer.Option('--verbose', '-v', help='Enables debugging logs')
     ] = False
-) -> bool:
+) -> None:
     '''
-    Creates a Calendar event from a file
+    Options shared by every command. They go before the command name, e.g.
+    "main.py --calendar-id team@group.calendar.google.com create -f asg.csv"
     '''
-    log.debug('Starting create_events()')
+    init_dirs()
+
+    if verbose:
+        log.setLevel(logging.DEBUG)
+        log.debug('Verbose mode has been selected. Switching to logging.DEBUG level')
+
+    if csv_engine not in CSV_ENGINES:
+        raise typer.BadParameter(f'Choose from {CSV_ENGINES}', param_hint='--engine')
+    if output_format not in OUTPUT_FORMATS:
+        raise typer.BadParameter(f'Choose from {OUTPUT_FORMATS}', param_hint='--output-format')
+
+    ctx.obj = {
+        'calendar_id': calendar_id,
+        'jobs': jobs,
+        'rate_limit': rate_limit,
+        'retry_budget': retry_budget,
+        'csv_engine': csv_engine,
+        'output_format': output_format,
+        'timezone': timezone,
+        'processes': processes
+    }
 
-    # Import file
-    try:
-        file_type = str(file).split('.')[-1] # Retrieve file extension
-    except ValueError:
-        raise ValueError('Could not find file type.')
+@app.command()
+def create(
+    ctx: typer.Context,
+    file: FileOption,
+    date_format: DateFormatOption = None,
+    course_key: CourseKeyOption = None,
+    batch_size: BatchSizeOption = BATCH_SIZE,
+    save: SaveOption = True
+) -> None:
+    '''
+    Creates Calendar events from a file
+    '''
+    log.debug('Starting create()')
 
-    log.info(file_type)
+    run(ctx, 'create', lambda service: service.create_from(
+        service.load_events(str(file), date_format, course_key), batch_size, save
+    ))
 
-    # service = Events()
+@app.command()
+def ingest(
+    ctx: typer.Context,
+    pattern: Annotated[
+        str,
+        typer.Argument(help='Directory or glob of files, e.g. "input/*.csv" or "input/**/*.json"')
+    ],
+    date_format: DateFormatOption = None,
+    course_key: Annotated[
+        str | None,
+        typer.Option(
+            '--course-key', '-k',
+            help='Course key of gradebook json/jsonl exports; "{stem}" is replaced by '
+                 'each file name. Without it json files are read as Calendar events.'
+        )
+    ] = None,
+    batch_size: BatchSizeOption = BATCH_SIZE,
+    save: SaveOption = True
+) -> None:
+    '''
+    Creates Calendar events from every csv, json and jsonl file in a directory
+    or glob. Files that fail to import are reported and skipped.
+    '''
+    log.debug('Starting ingest()')
 
-    # created = False
-    # events_gen = service.get_data()
+    def action(service: Events) -> dict:
+        report = []
+        summary = service.create_from(
+            service.load_files(pattern, date_format, course_key, report), batch_size, save
+        )
+        summary['skipped'] = sum(1 for item in report if item['error'])
+        summary['files'] = report
 
-    # try:
-    #     events_list = []
+        return summary
 
-    #     for item in events_gen:
-    #         try:
-    #             event = service.events().insert(calendarId='primary', body=item).execute()
-    #             events_list.append(event)
-    #             log.info(f'Event created: {event.get('htmlLink')}')
-    #         except Exception:
-    #             raise
+    run(ctx, 'ingest', action)
 
-    #     display_panel('Created all events.', 'Success')
-        
-    #     to_file = Confirm.ask('Would you like to save the event objects to a file?')
+@app.command()
+def delete(
+    ctx: typer.Context,
+    file: Annotated[
+        Path,
+        typer.Option(
+            '--file', '-f',
+            exists=True,
+            dir_okay=False,
+            readable=True,
+            resolve_path=True,
+            help='json, jsonl or archive (.gz) file written by create'
+        )
+    ],
+    course: Annotated[
+        str | None,
+        typer.Option('--course', help='Only delete this course from an archive')
+    ] = None,
+    batch_size: BatchSizeOption = BATCH_SIZE
+) -> None:
+    '''
+    Deletes the Calendar events listed in a file written by create
+    '''
+    log.debug('Starting delete()')
+
+    run(ctx, 'delete', lambda service: service.delete_from(
+        service.load_delete_items(str(file), course), batch_size
+    ))
+
+@app.command('list')
+def list_events(
+    ctx: typer.Context,
+    limit: Annotated[
+        int | None,
+        typer.Option('--limit', '-n', min=1, help='Events to list. Lists every event if omitted')
+    ] = None,
+    save: SaveOption = True
+) -> None:
+    '''
+    Lists upcoming Calendar events
+    '''
+    log.debug('Starting list_events()')
 
-    #     if to_file:
-    #         service.write_events(events_list)
+    run(ctx, 'list', lambda service: service.list_to(limit, save))
 
-    #     created = True
+@app.command()
+def sync(
+    ctx: typer.Context,
+    file: FileOption,
+    date_format: DateFormatOption = None,
+    course_key: CourseKeyOption = None,
+    batch_size: BatchSizeOption = BATCH_SIZE,
+    source_id: Annotated[
+        str | None,
+        typer.Option(
+            '--source-id',
+            help='Keys the stored sync records instead of the file path, e.g. to '
+                 'keep syncing a file that moved'
+        )
+    ] = None
+) -> None:
+    '''
+    Syncs the calendar with a file, sending only new, changed and removed events
+    '''
+    log.debug('Starting sync()')
 
-    # except TypeError:
-    #     raise
+    run(ctx, 'sync', lambda service: service.sync_from(
+        service.load_events(str(file), date_format, course_key), str(file), batch_size,
+        source_id
+    ))
 
-    # return created
 
-def delete_events(self) -> bool:
+# ::Functions --------------------------------------------------------------------- #
+def run(ctx: typer.Context, command: str, action: Callable[[Events], dict]) -> None:
     '''
-    Delete Google Calendar events
+    Runs a command against a non-interactive Events object, prints its JSON
+    summary to stdout and exits with the matching exit code
+    ---
+    Args:
+        ctx (typer.Context): Holds the shared options from callback()
+        command (str): Command name for the summary
+        action (Callable[[Events], dict]): Does the work and returns its counts
+    Returns
+        None
     '''
-    self._log.debug('Starting delete_events()')
-
-    deleted = False
-    events_list = self.get_delete_data()
-
-    # # Have user validate data
-    # confirmation = Confirm.ask(
-    #     f'Confirm if the transformed data above is correct '
-    #     f'and to continue to delete from calendar'
-    # )
-
-    # if not confirmation:
-    #     display_error(
-    #         'User has confirmed that the data is [bold bright_red]incorrect.\n'
-    #         'Exiting program...'
-    #     )
-    #     raise ExitProgram("User prompted to exit program.")
-
-    # if events_list and confirmation:
-    #     for sum, id in events_list:
-    #         print(f'Deleting event: "{sum} - [green]{id}"')
-    #         try:
-    #             self.__service.events().delete(calendarId='primary', eventId=id).execute()
-    #         except Exception:
-    #             raise
-
-    #     display_panel(f'Deleted all events.', 'Success')
-    #     deleted = True
-    
-    return deleted
+    started = time.perf_counter()
+    summary = {'command': command, 'calendar_id': ctx.obj['calendar_id']}
+    code = EXIT_OK
+
+    try:
+        service = Events(interactive=False, **ctx.obj)
+        summary.update(action(service))
+
+        if summary.get('error'):
+            # The file went bad part way through; the events before it were created
+            code = EXIT_BAD_INPUT
+        elif summary.get('failed') or summary.get('skipped'):
+            code = EXIT_FAILED
+    except (FileNotFoundError, ValueError) as e:
+        log.debug(e, stack_info=True, exc_info=True)
+        code = EXIT_BAD_INPUT
+        summary['error'] = str(e)
+    except (
+        HttpError, HttpLib2Error, GoogleAuthError, AuthRequired, ConnectionError, TimeoutError
+    ) as e:
+        log.debug(e, stack_info=True, exc_info=True)
+        code = EXIT_API_ERROR
+        summary['error'] = str(e)
+    except (OSError, sqlite3.Error) as e:
+        # e.g. a PermissionError on the output directory or a locked sync database
+        log.debug(e, stack_info=True, exc_info=True)
+        code = EXIT_LOCAL_ERROR
+        summary['error'] = f'{type(e).__name__}: {e}'
+
+    summary['status'] = {EXIT_OK: 'ok', EXIT_FAILED: 'failed'}.get(code, 'error')
+    summary['seconds'] = round(time.perf_counter() - started, 3)
+
+    typer.echo(json.dumps(summary))
+
+    raise typer.Exit(code)
+
 
 # ::EXECUTE ------------------------------------------------------------------------ #
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    app()
@@ -10,34 +10,57 @@ import os
 
 import csv
 
-from google.oauth2.credentials import Credentials
-
 # ::SETUP -------------------------------------------------------------------------- #
 INPUT_DIR: str = 'input'
 OUTPUT_DIR: str = 'output'
 
-# Create the input/output directories
-for io_dir in [INPUT_DIR, OUTPUT_DIR]:
-    try:
-        os.mkdir(io_dir)
-    except FileExistsError:
-        pass
-    except PermissionError:
-        print(f"Permission denied: Unable to create '{io_dir}'.")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-
 # Google Calendar API Creds Setup
 SCOPES: list[str] = ["https://www.googleapis.com/auth/calendar.events"]
+# Calendar events are read from and written to; "primary" is the user's own
+CALENDAR_ID: str = "primary"
 SERVICE_NAME: str = "calendar"
 SERVICE_VERSION: str = "v3"
+DISCOVERY_CACHE: str = "output/calendar_v3_discovery.json"
 EVENTS_OUTFILE: str = "output/events.json"
-CREDS: Credentials = ''
+# Events are appended here as they are created and moved to EVENTS_OUTFILE when
+# saved. An unfinished run leaves it behind, ready for the delete command.
+EVENTS_JOURNAL: str = "output/events.partial.jsonl"
+# Events written to the journal between fsyncs
+FSYNC_EVERY: int = 500
+SYNC_DB: str = "output/sync.db"
+EVENT_CACHE: str = "output/event_cache.json"
+
+# Event listing. Pages are fetched lazily and only LIST_FIELDS are requested
+# (partial response), which keeps each page small.
+LIST_PAGE_SIZE: int = 250
+LIST_FIELDS: str = "nextPageToken,items(id,summary,description,location,start,end,htmlLink)"
+# Fields kept by the local event cache. Cancelled items only need their id and
+# status, and the last page carries the token for the next incremental sync.
+SYNC_FIELDS: str = (
+    "nextPageToken,nextSyncToken,"
+    "items(id,status,summary,description,location,start,end,htmlLink)"
+)
+
+# Calendar batch requests. The API accepts at most 50 calls in a single batch;
+# a batch size of 1 sends each call on its own.
+BATCH_SIZE: int = 50
+MAX_BATCH_SIZE: int = 50
+# Worker threads sending batches in parallel. 1 runs on the main thread only.
+JOBS: int = 1
+
+# Calendar quota handling. Requests per second are shared by every worker; the
+# retry budget caps how many rate limit/server errors are retried in one run.
+RATE_LIMIT: float = 10.0
+RATE_BURST: int = 50
+MAX_RETRIES: int = 5
+RETRY_BUDGET: int = 200
 # The file token.json stores the user's access and refresh tokens, and is
 # created automatically when the authorization flow completes for the first
-# time.
-if os.path.exists("token.json"):
-    CREDS = Credentials.from_authorized_user_file("token.json", SCOPES)
+# time. It is loaded on first use, not at import.
+TOKEN_FILE: str = "token.json"
+CLIENT_SECRETS_FILE: str = "credentials.json"
+# Refresh the access token this many seconds before it expires
+TOKEN_REFRESH_MARGIN: int = 300
 
 # Logger file
 LOGFILE: str = OUTPUT_DIR + '/debug.log'
@@ -48,6 +71,11 @@ COMMANDS: dict[str] = {
         'method': 'display_events',
         'description':'Displays Google Calendar events from today'
     },
+    'cached': {
+        'method': 'display_cached_events',
+        'description': 'Displays upcoming events from a local copy of the calendar, '
+                       'fetching only what changed since the last time'
+    },
     'create': {
         'method': 'create_events',
         'description': 'Creates Google Calendar events from either a .csv or .json file'
@@ -56,6 +84,18 @@ COMMANDS: dict[str] = {
         'method': 'delete_events',
         'description':'Deletes Google Calendar events from a .json file'
     },
+    'ingest': {
+        'method': 'ingest_events',
+        'description': 'Creates Google Calendar events from every file in a directory or glob'
+    },
+    'sync': {
+        'method': 'sync_events',
+        'description': 'Creates, updates and deletes events so the calendar matches a file'
+    },
+    'benchmark': {
+        'method': 'benchmark_engines',
+        'description': 'Times each csv engine on a file and uses the fastest'
+    },
     'help': {
         'method': 'display_cmds',
         'description':'Displays available commands'
@@ -71,13 +111,23 @@ PROMPTS = {
     "command": 'Enter a [bold cyan1]command[default]',
     "file": (
         f'\nEnter the [bold cyan1]filepath '
-        f'[default]for either a [bold yellow].csv[default] '
-        f'or [bold yellow].json[default] file to import'
+        f'[default]for a [bold yellow].csv[default], [bold yellow].json[default] '
+        f'or [bold yellow].jsonl[default] file to import'
     ),
     "file_delete": (
-        f'\nEnter the [bold yellow].json[default] [bold cyan1]filepath[default] '
+        f'\nEnter the [bold yellow].json[default] or [bold yellow].jsonl[default] '
+        f'[bold cyan1]filepath[default] '
         f'that contains the event objects to delete'
     ),
+    "ingest": (
+        f'\nEnter a [bold cyan1]directory[default] or [bold cyan1]glob[default], e.g. '
+        f'"input/*.csv" or "input/**/*.json", of files to import'
+    ),
+    "course_key_ingest": (
+        f'\nProvide the [yellow]course key[default] for gradebook/columns json files. '
+        f'"[bold cyan1]{{stem}}[default]" is replaced by each file name. Leave it\n'
+        f'blank if the json files already hold Google Calendar events'
+    ),
     "date_format": (
         f'\nProvide the [yellow]date format[default] for the supplied dates '
         f'in the "[bold cyan1]due_date[default]" column. Default is "%Y-%m-%d".\n'
@@ -85,7 +135,7 @@ PROMPTS = {
     ),
     "course_key": (
         f'\nProvide the [yellow]course key[default] for the gradebook/columns '
-        f'"[bold cyan1].json[default]" file'
+        f'"[bold cyan1].json[default]" or "[bold cyan1].jsonl[default]" file'
     ),
     "exit": ' (or type [bright_red]"exit"[default] to exit)\n'
 }
@@ -123,6 +173,9 @@ EVENT_MAP: dict = {
     "description": "description", # (str)	Description of the event. Can contain HTML. Optional.
     "due_location": "location"    # (str) Geographic location of the event as free-form text. Optional.
 }
+# Fields kept when re-importing event objects, e.g. a saved events.json. Add
+# "id" to re-create events under their original ids.
+EVENT_FIELDS: tuple[str] = ('summary', 'start', 'end', 'location', 'description')
 FILE_MAP: dict = {
     "csv": {
         "import": "_Events__import_csv",
@@ -131,11 +184,84 @@ FILE_MAP: dict = {
     "json": {
         "import": "_Events__import_json",
         "generate": "_Events__get_json_events"
+    },
+    "jsonl": {
+        "import": "_Events__import_jsonl",
+        "generate": "_Events__get_json_events"
     }
 }
+# Formats events are written in: a JSON array, JSON Lines, which can be
+# appended to, split and streamed, or a gzip archive indexed by id, course and date
+OUTPUT_FORMATS: tuple[str] = ('json', 'jsonl', 'archive')
+OUTPUT_FORMAT: str = 'json'
+OUTPUT_SUFFIXES: dict[str, str] = {
+    'json': '.json',
+    'jsonl': '.jsonl',
+    'archive': '.jsonl.gz'
+}
+# Events per compressed block of an archive
+ARCHIVE_BLOCK_SIZE: int = 1000
 TEMPLATE_CSV = 'input/template.csv'
+# Rows read per chunk when importing a csv file
+CSV_CHUNK_SIZE: int = 10_000
+# csv parsers: the pandas C engine, pyarrow (needs the optional pyarrow package,
+# keeps strings Arrow-backed) or a lean stdlib csv reader that skips pandas
+CSV_ENGINES: tuple[str] = ('c', 'pyarrow', 'stdlib')
+CSV_ENGINE: str = 'c'
+# due_date formats tried, in order, when inferring the format of a csv file.
+# Built from the STRFTIME_ROWS directives; month-first wins ambiguous dates.
+DATE_FORMATS: tuple[str] = (
+    '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%m/%d/%y', '%d/%m/%y', '%Y/%m/%d',
+    '%m-%d-%Y', '%d-%m-%Y', '%d.%m.%Y', '%b %d, %Y', '%B %d, %Y', '%d %b %Y',
+    '%d %B %Y', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f', '%m/%d/%Y %H:%M', '%m/%d/%Y %H:%M:%S'
+)
+# Distinct due_date values sampled to infer a format
+DATE_SAMPLE_SIZE: int = 200
+# Inferred formats per csv file, so reruns skip inference
+DATE_FORMAT_CACHE: str = 'output/date_formats.json'
+# Items of a json file read ahead for the previews before and after transforming it
+JSON_PREVIEW_ITEMS: int = 1000
+# Previews render the first PREVIEW_HEAD and last PREVIEW_TAIL rows, PREVIEW_SAMPLE
+# random rows in between and the PREVIEW_COURSES courses with the most rows
+PREVIEW_HEAD: int = 5
+PREVIEW_TAIL: int = 5
+PREVIEW_SAMPLE: int = 5
+PREVIEW_COURSES: int = 10
+# Rows per page when paging through a whole preview
+PREVIEW_PAGE_SIZE: int = 25
+# Bytes of a jsonl file each worker thread decodes at a time when importing with
+# more than one job. At most 2 * jobs ranges are held in memory at once.
+JSONL_RANGE_SIZE: int = 1 << 20
+# Gradebook columns whose due dates are converted per pass
+JSON_CHUNK_SIZE: int = 10_000
+# Worker processes parsing files in parallel when importing a directory or glob.
+# 1 parses every file on the main process.
+INGEST_PROCESSES: int = min(8, os.cpu_count() or 1)
+# IANA zone due dates are converted to, e.g. "America/Chicago". None uses the
+# system's local zone.
+TIMEZONE: str | None = None
+
+
+# ::Functions --------------------------------------------------------------------- #
+def init_dirs() -> None:
+    '''
+    Creates the input/output directories and writes the template csv. Called
+    by the entry points rather than at import, so importing settings is free.
+    '''
+    # Create the input/output directories
+    for io_dir in [INPUT_DIR, OUTPUT_DIR]:
+        try:
+            os.mkdir(io_dir)
+        except FileExistsError:
+            pass
+        except PermissionError:
+            print(f"Permission denied: Unable to create '{io_dir}'.")
+        except Exception as e:
+            print(f"An error occurred: {e}")
 
-# Write a template csv file to input dir
-with open(TEMPLATE_CSV, 'w', newline='') as outcsv:
-    writer = csv.writer(outcsv)
-    writer.writerow(CSV_FIELDS)
\ No newline at end of file
+    # Write a template csv file to input dir
+    if not os.path.exists(TEMPLATE_CSV):
+        with open(TEMPLATE_CSV, 'w', newline='') as outcsv:
+            writer = csv.writer(outcsv)
+            writer.writerow(CSV_FIELDS)
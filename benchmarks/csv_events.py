@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# Program Name:         csv_events.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Benchmarks the csv-to-event transform in get_csv_events against the
+#   previous row-by-row implementation.
+#
+#   Usage: python benchmarks/csv_events.py [--rows 10000 100000 1000000]
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import argparse
+
+import sys
+
+import time
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'asg_to_calendar'))
+
+from settings import CSV_FIELDS, EVENT_MAP
+from events.events import df_to_events, make_event_id
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def make_frame(rows: int) -> pd.DataFrame:
+    '''
+    Builds a csv-shaped DataFrame with a few dozen courses and due dates
+    '''
+    idx = np.arange(rows)
+    return pd.DataFrame({
+        'course_key': pd.Series(idx % 40).map(lambda i: f'COSC-{2400 + i}'),
+        'course_name': pd.Series(idx % 40).map(lambda i: f'Programming {i}'),
+        'asg_name': pd.Series(idx).map(lambda i: f'Lab {i}'),
+        'asg_desc': 'Use course materials for the lab.',
+        'due_date': pd.Timestamp('2024-08-26') + pd.to_timedelta(idx % 120, unit='D'),
+        'due_location': 'Blackboard',
+    })[CSV_FIELDS]
+
+
+def legacy_csv_events(df: pd.DataFrame) -> list[dict]:
+    '''
+    The row-by-row transform get_csv_events used before vectorizing
+    '''
+    summary_col = CSV_FIELDS[0:3:2]
+    desc_col = CSV_FIELDS[1:5:2]
+
+    events_df = df.iloc[:, 4:].copy()
+    events_df['due_date'] = events_df['due_date'].map(lambda x: x.strftime('%Y-%m-%d'))
+    events_df['end'] = events_df['due_date']
+    events_df['id'] = [
+        make_event_id(key, name, date)
+        for key, name, date in zip(df['course_key'], df['asg_name'], events_df['due_date'])
+    ]
+    events_df['summary'] = df[summary_col].agg(': '.join, axis=1)
+    events_df['description'] = df[desc_col].agg('<br>'.join, axis=1)
+    events_df = events_df.rename(columns=EVENT_MAP)
+
+    events_list = events_df.to_dict(orient='records')
+
+    for item in events_list:
+        item['start'] = {'date': item['start']}
+        item['end'] = {'date': item['end']}
+
+    return events_list
+
+
+def vectorized_csv_events(df: pd.DataFrame) -> list[dict]:
+    return [event.to_body() for event in df_to_events(df)]
+
+
+def timed(func, df) -> tuple[float, list[dict]]:
+    start = time.perf_counter()
+    result = func(df)
+    return time.perf_counter() - start, result
+
+
+def main(sizes: list[int]) -> None:
+    print(f'{"rows":>10}{"legacy s":>12}{"vectorized s":>15}{"speedup":>10}')
+
+    for rows in sizes:
+        df = make_frame(rows)
+        legacy, expected = timed(legacy_csv_events, df)
+        vectorized, result = timed(vectorized_csv_events, df)
+
+        if result != expected:
+            raise AssertionError(f'Vectorized events differ from legacy events at {rows} rows')
+
+        print(f'{rows:>10}{legacy:>12.3f}{vectorized:>15.3f}{legacy / vectorized:>9.1f}x')
+
+
+# ::EXECUTE ------------------------------------------------------------------------ #
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the csv event transform')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    main(args.rows)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Program Name:         event_memory.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Compares the peak RSS of holding assignment events as nested request-body
+#   dicts against the slotted Event record. Each model is measured in its own
+#   interpreter so one does not inflate the other's peak.
+#
+#   Usage: python benchmarks/event_memory.py [--events 1000000]
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import argparse
+
+import resource
+
+import subprocess
+
+import sys
+
+from pathlib import Path
+
+SRC_DIR: Path = Path(__file__).resolve().parent.parent / 'asg_to_calendar'
+
+sys.path.insert(0, str(SRC_DIR))
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def source_rows(count: int):
+    '''
+    Yields (course, title, date, location, description) like a csv chunk does.
+    Strings are rebuilt per row, the way a parser hands them over.
+    '''
+    for i in range(count):
+        course = f'COSC-{2400 + i % 40}'
+        yield (
+            course,
+            f'Lab {i}',
+            f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+            ''.join(['Black', 'board']),
+            f'Programming {i % 40}<br>Use course materials for lab {i}.'
+        )
+
+
+def build(model: str, count: int) -> list:
+    '''
+    Builds count events with the given model and keeps them all in memory.
+    "none" only imports the modules, for the baseline.
+    '''
+    from events.events import make_event_id
+    from events.model import Event
+
+    events = []
+
+    if model == 'none':
+        return events
+
+    for course, title, date, location, description in source_rows(count):
+        event_id = make_event_id(course, title, date)
+
+        if model == 'dict':
+            events.append({
+                'id': event_id,
+                'summary': f'{course}: {title}',
+                'start': {'date': date},
+                'end': {'date': date},
+                'location': location,
+                'description': description
+            })
+        else:
+            events.append(Event(event_id, course, title, date, location, description))
+
+    return events
+
+
+def peak_rss_mb() -> float:
+    '''
+    Peak resident set size of this process in MB (ru_maxrss is KiB on Linux)
+    '''
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2**20 if sys.platform == 'darwin' else 2**10)
+
+
+def measure(model: str, count: int) -> float:
+    '''
+    Runs build() in a fresh interpreter and returns its peak RSS
+    '''
+    result = subprocess.run(
+        [sys.executable, __file__, '--child', model, '--events', str(count)],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(result.stdout)
+
+
+def main(count: int) -> None:
+    baseline = measure('none', 0)
+    dicts = measure('dict', count)
+    slotted = measure('event', count)
+
+    print(f'{"model":<10}{"peak RSS MB":>14}{"events MB":>12}')
+    print(f'{"baseline":<10}{baseline:>14.1f}{"-":>12}')
+    print(f'{"dict":<10}{dicts:>14.1f}{dicts - baseline:>12.1f}')
+    print(f'{"Event":<10}{slotted:>14.1f}{slotted - baseline:>12.1f}')
+    print(f'\nEvent records use {(slotted - baseline) / (dicts - baseline):.0%} of the dict memory')
+
+
+# ::EXECUTE ------------------------------------------------------------------------ #
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compares peak RSS of event models')
+    parser.add_argument('--events', type=int, default=1_000_000)
+    parser.add_argument('--child', choices=('none', 'dict', 'event'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        events = build(args.child, args.events)
+        print(peak_rss_mb())
+    else:
+        main(args.events)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# Program Name:         ingest_files.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Benchmarks importing a term's worth of per-course csv files: one file after
+#   another in this process against the parse_file worker on a process pool.
+#
+#   Usage: python benchmarks/ingest_files.py [--files 200] [--rows 500] [--processes 1 4]
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import argparse
+
+import csv
+
+import sys
+
+import tempfile
+
+import time
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'asg_to_calendar'))
+
+from settings import CSV_FIELDS
+from events.engine import process_map
+from events.events import parse_file, expand_paths
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def write_course(path: Path, course: int, rows: int) -> None:
+    '''
+    Writes one course's assignments in the template csv layout
+    '''
+    with open(path, 'w', newline='', encoding='utf-8') as out_file:
+        writer = csv.DictWriter(out_file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+
+        for i in range(rows):
+            writer.writerow({
+                'course_key': f'COSC-{2400 + course}',
+                'course_name': f'Programming {course}',
+                'asg_name': f'Lab {i}',
+                'asg_desc': 'Use course materials for the lab.',
+                'due_date': f'{i % 12 + 1:02d}/{i % 28 + 1:02d}/2024',
+                'due_location': 'Blackboard'
+            })
+
+
+def ingest(paths: list[str], processes: int) -> tuple[float, int]:
+    '''
+    Returns (seconds, events) for parsing every file with processes workers
+    '''
+    tasks = ((path, None, None, 'c', None) for path in paths)
+
+    start = time.perf_counter()
+    count = sum(len(result['events']) for result in process_map(parse_file, tasks, processes))
+
+    return time.perf_counter() - start, count
+
+
+def main(files: int, rows: int, processes: list[int]) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for course in range(files):
+            write_course(Path(tmp_dir) / f'COSC-{2400 + course}.csv', course, rows)
+
+        paths = expand_paths(tmp_dir, ['csv'])
+        print(f'{files} files x {rows} rows')
+        print(f'{"processes":>10}{"seconds":>10}{"events":>10}')
+
+        for count in processes:
+            seconds, events = ingest(paths, count)
+            print(f'{count:>10}{seconds:>10.3f}{events:>10}')
+
+
+# ::EXECUTE ------------------------------------------------------------------------ #
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks parallel file ingestion')
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 4])
+    args = parser.parse_args()
+
+    main(args.files, args.rows, args.processes)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# Program Name:         reimport_events.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Benchmarks re-importing a saved events.json: the previous json.load and
+#   list-based strip against streaming the file through strip_events.
+#
+#   Usage: python benchmarks/reimport_events.py [--events 10000 100000]
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import argparse
+
+import json
+
+import sys
+
+import tempfile
+
+import time
+
+import tracemalloc
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'asg_to_calendar'))
+
+from settings import EVENT_FIELDS
+from events.events import strip_events
+from events.jsonstream import iter_array
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def make_events(count: int) -> list[dict]:
+    '''
+    Builds full event resources like the ones create_events saves
+    '''
+    return [
+        {
+            'kind': 'calendar#event',
+            'etag': f'"{3400000000000000 + i}"',
+            'id': f'{i:040x}',
+            'status': 'confirmed',
+            'htmlLink': f'https://www.google.com/calendar/event?eid={i:040x}',
+            'created': '2024-10-21T18:00:00.000Z',
+            'updated': '2024-10-21T18:00:00.000Z',
+            'summary': f'COSC-{2400 + i % 40}: Lab {i}',
+            'description': f'Programming {i % 40}<br>Use course materials for the lab.',
+            'location': 'Blackboard',
+            'creator': {'email': 'student@example.com', 'self': True},
+            'organizer': {'email': 'student@example.com', 'self': True},
+            'start': {'date': f'2024-{i % 12 + 1:02d}-15'},
+            'end': {'date': f'2024-{i % 12 + 1:02d}-15'},
+            'iCalUID': f'{i:040x}@google.com',
+            'sequence': 0,
+            'reminders': {'useDefault': True},
+            'eventType': 'default'
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_reimport(path: str) -> int:
+    '''
+    json.load, then the list-based strip, then a generator over the list
+    '''
+    with open(path, 'r') as in_file:
+        data = json.load(in_file)
+
+    events_list = []
+
+    for item in data:
+        new_event = {}
+
+        for key, val in item.items():
+            if key in ['summary', 'start', 'end', 'location', 'description']:
+                new_event[key] = val
+
+        events_list.append(new_event)
+
+    return sum(1 for _ in (item for item in events_list))
+
+
+def streaming_reimport(path: str) -> int:
+    '''
+    Streams the file and strips each event as it is consumed
+    '''
+    with open(path, 'r', encoding='utf-8') as in_file:
+        return sum(1 for _ in strip_events(iter_array(in_file), frozenset(EVENT_FIELDS)))
+
+
+def measured(func, path: str) -> tuple[float, float, int]:
+    '''
+    Returns (seconds, peak MB, events) for one run of func
+    '''
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func(path)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+
+    return seconds, peak, count
+
+
+def main(sizes: list[int]) -> None:
+    print(f'{"events":>10}{"legacy s":>11}{"legacy MB":>11}{"stream s":>11}{"stream MB":>11}')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            path = str(Path(tmp_dir) / 'events.json')
+
+            with open(path, 'w', encoding='utf-8') as out_file:
+                json.dump(make_events(size), out_file, indent=4)
+
+            legacy_s, legacy_mb, legacy_count = measured(legacy_reimport, path)
+            stream_s, stream_mb, stream_count = measured(streaming_reimport, path)
+
+            if legacy_count != stream_count:
+                raise AssertionError(f'Streaming read {stream_count} of {legacy_count} events')
+
+            print(f'{size:>10}{legacy_s:>11.3f}{legacy_mb:>11.1f}{stream_s:>11.3f}{stream_mb:>11.1f}')
+
+
+# ::EXECUTE ------------------------------------------------------------------------ #
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks re-importing saved events')
+    parser.add_argument('--events', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    main(args.events)
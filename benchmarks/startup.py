@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# Program Name:         startup.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Startup-time regression check.  Imports each CLI module in a fresh
+#   interpreter with "-X importtime", reports the import cost per module and
+#   fails if a module pulls in a heavy dependency or goes over budget.
+#
+#   Usage: python benchmarks/startup.py [--budget MS]
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import argparse
+
+import subprocess
+
+import sys
+
+from pathlib import Path
+
+# ::GLOBALS ------------------------------------------------------------------------ #
+SRC_DIR: Path = Path(__file__).resolve().parent.parent / 'asg_to_calendar'
+
+# Modules imported when the CLI starts
+MODULES: tuple[str] = ('settings', 'logger', 'events', 'asg_to_calendar')
+
+# Dependencies that must only be imported once a command needs them
+HEAVY: tuple[str] = (
+    'pandas',
+    'googleapiclient.discovery',
+    'google_auth_oauthlib',
+    'google.oauth2.credentials',
+)
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    '''
+    Imports module in a new interpreter and returns {name: (self us, cumulative us)}
+    '''
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True
+    )
+
+    if result.returncode:
+        raise RuntimeError(f'Could not import {module}:\n{result.stderr}')
+
+    times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line.removeprefix('import time:').split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+
+    return times
+
+
+def main(budget: float) -> int:
+    '''
+    Prints the import cost of each module and returns 1 on a regression
+    '''
+    failed = False
+
+    print(f'{"module":<20}{"import ms":>12}  heavy imports')
+
+    for module in MODULES:
+        times = import_times(module)
+        cost = times[module][1] / 1000
+        heavy = [name for name in HEAVY if name in times]
+        print(f'{module:<20}{cost:>12.1f}  {", ".join(heavy) or "-"}')
+
+        if heavy or cost > budget:
+            failed = True
+
+    if failed:
+        print(f'\nStartup regression: a module is over {budget} ms or imports a heavy dependency')
+
+    return int(failed)
+
+
+# ::EXECUTE ------------------------------------------------------------------------ #
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reports the import cost of the CLI modules')
+    parser.add_argument('--budget', type=float, default=150.0, help='Max import time in ms')
+    args = parser.parse_args()
+
+    sys.exit(main(args.budget))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# Program Name:         conftest.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Puts asg_to_calendar on the import path, the way the entry points run it, and
+#   provides Events objects backed by a fake Calendar service
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import logging
+
+import sys
+
+import pytest
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'asg_to_calendar'))
+
+
+# ::Functions --------------------------------------------------------------------- #
+class Calendar:
+    '''
+    Builds Events objects that talk to one fake service, recording every sleep
+    '''
+    def __init__(self, service, sleeps: list[float]) -> None:
+        self.service = service
+        self.sleeps = sleeps
+
+    def events(self, **options):
+        from events.events import Events
+        return Events(interactive=False, **{'rate_limit': 0, **options})
+
+@pytest.fixture
+def calendar(monkeypatch, tmp_path) -> Calendar:
+    '''
+    Events against an in-memory Calendar service, run from tmp_path
+    '''
+    from fakes import Credentials, Service
+    from events import events
+    from logger import logger as log
+
+    service = Service()
+    sleeps = []
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'output').mkdir()
+    monkeypatch.setattr(events, 'CredentialManager', Credentials)
+    monkeypatch.setattr(events, 'build_service', lambda *args, **kwargs: service)
+    monkeypatch.setattr(events.time, 'sleep', sleeps.append)
+
+    # Errors are logged; keep the log file out of the working tree
+    for handler in log.handlers:
+        if isinstance(handler, logging.FileHandler):
+            monkeypatch.setattr(handler, 'baseFilename', str(tmp_path / 'output' / 'debug.log'))
+
+    return Calendar(service, sleeps)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# Program Name:         fakes.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   In-memory stand-ins for the Calendar service and credentials, so Events can
+#   be tested without a network connection
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import json
+
+import httplib2
+
+from typing import Callable
+
+from googleapiclient.errors import HttpError
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+class Request:
+    '''
+    One Calendar call; executing it records the call and asks the service for
+    the response
+    '''
+    def __init__(self, service: 'Service', method: str, params: dict) -> None:
+        self.service = service
+        self.method = method
+        self.params = params
+
+    def execute(self):
+        self.service.calls.append((self.method, self.params))
+        return self.service.respond(self.method, self.params)
+
+
+class Batch:
+    '''
+    A batch request that runs its requests in order and reports each through
+    the callback, the way googleapiclient does
+    '''
+    def __init__(self, service: 'Service', callback: Callable) -> None:
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request: Request, request_id: str) -> None:
+        self.requests.append((request_id, request))
+
+    def execute(self) -> None:
+        self.service.batches.append(len(self.requests))
+
+        if self.service.batch_error:
+            raise self.service.batch_error
+
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except HttpError as error:
+                self.callback(request_id, None, error)
+
+
+class Service:
+    '''
+    Calendar service holding its events in a dict. handler, if given, is asked
+    first with (method, params) and may return a response, raise an HttpError
+    or return None to fall through to the default behavior.
+    ---
+    Args:
+        handler (Callable | None): Overrides responses for some calls
+    '''
+    def __init__(self, handler: Callable | None = None) -> None:
+        self.handler = handler
+        self.calls: list[tuple] = []
+        self.batches: list[int] = []
+        self.batch_error: HttpError | None = None
+        self.events_by_id: dict[str, dict] = {}
+
+    def events(self) -> 'Service':
+        return self
+
+    def insert(self, **params) -> Request:
+        return Request(self, 'insert', params)
+
+    def get(self, **params) -> Request:
+        return Request(self, 'get', params)
+
+    def update(self, **params) -> Request:
+        return Request(self, 'update', params)
+
+    def patch(self, **params) -> Request:
+        return Request(self, 'patch', params)
+
+    def delete(self, **params) -> Request:
+        return Request(self, 'delete', params)
+
+    def list(self, **params) -> Request:
+        return Request(self, 'list', params)
+
+    def new_batch_http_request(self, callback: Callable) -> Batch:
+        return Batch(self, callback)
+
+    def respond(self, method: str, params: dict):
+        if self.handler:
+            response = self.handler(method, params)
+
+            if response is not None:
+                return response
+
+        if method == 'insert':
+            body = params['body']
+
+            if body['id'] in self.events_by_id:
+                raise http_error(409, 'duplicate')
+
+            event = {**body, 'status': 'confirmed', 'htmlLink': f'https://calendar/{body["id"]}'}
+            self.events_by_id[body['id']] = event
+            return event
+
+        if method == 'get':
+            if params['eventId'] not in self.events_by_id:
+                raise http_error(404, 'notFound')
+            return self.events_by_id[params['eventId']]
+
+        if method == 'update':
+            event = {**params['body'], 'htmlLink': f'https://calendar/{params["eventId"]}'}
+            self.events_by_id[params['eventId']] = event
+            return event
+
+        if method == 'patch':
+            event = {**self.events_by_id[params['eventId']], **params['body']}
+            self.events_by_id[params['eventId']] = event
+            return event
+
+        if method == 'delete':
+            if self.events_by_id.pop(params['eventId'], None) is None:
+                raise http_error(410, 'deleted')
+            return ''
+
+        return {'items': []}
+
+
+class Credentials:
+    '''
+    Stands in for CredentialManager
+    '''
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    def get(self) -> None:
+        return None
+
+
+# ::Functions --------------------------------------------------------------------- #
+def http_error(status: int, reason: str = '', headers: dict | None = None) -> HttpError:
+    '''
+    Builds the HttpError the client raises for a response with status
+    '''
+    resp = httplib2.Response({'status': status, **(headers or {})})
+    content = {'error': {'errors': [{'reason': reason}], 'message': reason}}
+
+    return HttpError(resp, json.dumps(content).encode())
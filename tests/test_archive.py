@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# Program Name:         test_archive.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests writing and reading back block-compressed event archives
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import gzip
+
+import pytest
+
+from events.archive import ArchiveReader, ArchiveWriter
+
+
+# ::Functions --------------------------------------------------------------------- #
+def event(i: int, course: str, date: str) -> dict:
+    return {
+        'id': f'{course.lower()}{i}',
+        'summary': f'{course}: Lab {i}',
+        'start': {'date': date},
+        'end': {'date': date}
+    }
+
+def sample() -> list[dict]:
+    '''
+    Ten events over two courses, one January day each, in blocks of three
+    '''
+    return [event(i, 'CS1' if i % 2 else 'MATH2', f'2024-01-{i + 10:02d}') for i in range(10)]
+
+def write(path, events: list[dict], block_size: int = 3) -> ArchiveReader:
+    with ArchiveWriter(str(path), block_size=block_size) as writer:
+        assert writer.write(events) == len(events)
+
+    return ArchiveReader(str(path))
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def test_round_trip_over_several_blocks(tmp_path):
+    archive = write(tmp_path / 'events.jsonl.gz', sample())
+
+    assert len(archive.index['blocks']) == 4
+    assert len(archive) == 10
+    assert list(archive.find()) == sample()
+    # Concatenated members still read as one gzip file
+    with gzip.open(tmp_path / 'events.jsonl.gz', 'rt') as in_file:
+        assert len(in_file.read().splitlines()) == 10
+
+def test_get_reads_events_by_id(tmp_path):
+    archive = write(tmp_path / 'events.jsonl.gz', sample())
+
+    found = archive.get(['cs19', 'math20', 'missing'])
+
+    assert [item['id'] for item in found] == ['math20', 'cs19']
+
+def test_find_by_course(tmp_path):
+    archive = write(tmp_path / 'events.jsonl.gz', sample())
+
+    assert archive.courses() == ['CS1', 'MATH2']
+    assert [item['id'] for item in archive.find(course='CS1')] == ['cs11', 'cs13', 'cs15', 'cs17', 'cs19']
+    assert list(archive.find(course='PHYS3')) == []
+
+def test_find_by_date_range(tmp_path):
+    archive = write(tmp_path / 'events.jsonl.gz', sample())
+
+    found = archive.find(start='2024-01-12', end='2024-01-15')
+    assert [item['start']['date'] for item in found] == [f'2024-01-{day}' for day in range(12, 16)]
+
+    found = archive.find(course='MATH2', start='2024-01-15')
+    assert [item['id'] for item in found] == ['math26', 'math28']
+
+def test_a_truncated_last_block_is_reported(tmp_path):
+    path = tmp_path / 'events.jsonl.gz'
+    archive = write(path, sample())
+    path.write_bytes(path.read_bytes()[:-10])
+
+    # Blocks before the damage still read
+    assert [item['id'] for item in archive.get(['math20'])] == ['math20']
+
+    with pytest.raises(ValueError, match='truncated or corrupt at block 3'):
+        archive.get(['cs19'])
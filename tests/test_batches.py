@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# Program Name:         test_batches.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests that inserts are sent as Calendar batch requests
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import json
+
+from fakes import http_error
+from events.model import Event
+
+
+# ::Functions --------------------------------------------------------------------- #
+def labs(count: int) -> list[Event]:
+    return [Event(f'lab{i}', 'CS1', f'Lab {i}', '2024-01-15') for i in range(count)]
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def test_inserts_are_split_into_batches_of_at_most_50(calendar):
+    summary = calendar.events().create_from(labs(120), batch_size=100, save=False)
+
+    assert calendar.service.batches == [50, 50, 20]
+    assert (summary['created'], summary['failed']) == (120, 0)
+
+def test_a_failed_sub_request_is_reported_against_its_item(calendar, caplog):
+    def reject_lab_57(method, params):
+        if method == 'insert' and params['body']['id'] == 'lab57':
+            raise http_error(400, 'invalid')
+
+    calendar.service.handler = reject_lab_57
+    summary = calendar.events().create_from(labs(120))
+
+    with open(summary['output'], 'r', encoding='utf-8') as in_file:
+        saved = [event['id'] for event in json.load(in_file)]
+
+    assert (summary['created'], summary['failed']) == (119, 1)
+    assert saved == [f'lab{i}' for i in range(120) if i != 57]
+    failures = [record.message for record in caplog.records if record.message.startswith('Event failed')]
+    assert len(failures) == 1 and failures[0].startswith('Event failed: CS1: Lab 57 - ')
+
+    # A 400 is not retried
+    assert calendar.service.batches == [50, 50, 20]
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# Program Name:         test_cache.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests which cached events count as upcoming
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+from datetime import datetime, timedelta, timezone
+
+from events.cache import EventCache
+
+
+# ::Functions --------------------------------------------------------------------- #
+def cache_of(*events: dict, tmp_path) -> EventCache:
+    cache = EventCache(str(tmp_path / 'cache.json'))
+    cache.apply(events)
+    return cache
+
+def stamp(value: datetime) -> str:
+    return value.isoformat()
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def test_events_that_already_ended_are_skipped(tmp_path):
+    now = datetime(2024, 3, 10, 15, 0, tzinfo=timezone.utc)
+    ended = {
+        'id': 'ended',
+        'start': {'dateTime': stamp(now - timedelta(hours=3))},
+        'end': {'dateTime': stamp(now - timedelta(hours=2))}
+    }
+    running = {
+        'id': 'running',
+        'start': {'dateTime': stamp(now - timedelta(hours=1))},
+        'end': {'dateTime': stamp(now + timedelta(hours=1))}
+    }
+    cache = cache_of(ended, running, tmp_path=tmp_path)
+
+    assert [event['id'] for event in cache.upcoming(stamp(now))] == ['running']
+
+def test_offsets_are_compared_as_times(tmp_path):
+    now = datetime(2024, 3, 10, 15, 0, tzinfo=timezone.utc)
+    # 16:30 at -05:00 is 21:30 UTC, after the 18:00 UTC event
+    late = {
+        'id': 'late',
+        'start': {'dateTime': '2024-03-10T16:30:00-05:00'},
+        'end': {'dateTime': '2024-03-10T17:30:00-05:00'}
+    }
+    early = {
+        'id': 'early',
+        'start': {'dateTime': '2024-03-10T18:00:00Z'},
+        'end': {'dateTime': '2024-03-10T19:00:00Z'}
+    }
+    cache = cache_of(late, early, tmp_path=tmp_path)
+
+    assert [event['id'] for event in cache.upcoming(stamp(now))] == ['early', 'late']
+
+def test_all_day_events_last_until_local_midnight(tmp_path):
+    now = datetime.now().astimezone()
+    today = now.date().isoformat()
+    yesterday = (now.date() - timedelta(days=1)).isoformat()
+    cache = cache_of(
+        {'id': 'today', 'start': {'date': today}, 'end': {'date': today}},
+        {'id': 'yesterday', 'start': {'date': yesterday}, 'end': {'date': yesterday}},
+        tmp_path=tmp_path
+    )
+
+    assert [event['id'] for event in cache.upcoming(stamp(now), limit=5)] == ['today']
+
+def test_limit_returns_the_earliest_events_in_order(tmp_path):
+    days = [f'2099-01-{day:02d}' for day in (9, 3, 7, 1, 5)]
+    cache = cache_of(
+        *({'id': day, 'start': {'date': day}, 'end': {'date': day}} for day in days),
+        tmp_path=tmp_path
+    )
+
+    assert [event['id'] for event in cache.upcoming('2024-01-01T00:00:00Z', 3)] == [
+        '2099-01-01', '2099-01-03', '2099-01-05'
+    ]
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# Program Name:         test_conflicts.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests that rerunning an import resolves existing event ids instead of failing
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+from events.model import Event
+
+
+# ::Functions --------------------------------------------------------------------- #
+def labs(count: int) -> list[Event]:
+    return [Event(f'lab{i}', 'CS1', f'Lab {i}', '2024-01-15') for i in range(count)]
+
+def methods(calendar) -> list[str]:
+    return [method for method, _ in calendar.service.calls]
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def test_rerunning_the_same_events_succeeds(calendar):
+    first = calendar.events().create_from(labs(3), save=False)
+    calendar.service.calls.clear()
+    second = calendar.events().create_from(labs(3), save=False)
+
+    assert first['created'] == second['created'] == 3
+    assert second['failed'] == 0
+    # Each insert conflicts and the existing event is fetched, not recreated
+    assert methods(calendar) == ['insert'] * 3 + ['get'] * 3
+    assert len(calendar.service.events_by_id) == 3
+
+def test_a_deleted_event_is_restored(calendar):
+    calendar.events().create_from(labs(2), save=False)
+    calendar.service.events_by_id['lab1']['status'] = 'cancelled'
+    calendar.service.calls.clear()
+
+    summary = calendar.events().create_from(labs(2), save=False)
+
+    assert summary['failed'] == 0
+    assert methods(calendar) == ['insert', 'insert', 'get', 'get', 'update']
+    assert calendar.service.calls[-1][1]['eventId'] == 'lab1'
+    assert calendar.service.events_by_id['lab1']['status'] == 'confirmed'
+    assert calendar.service.events_by_id['lab0']['status'] == 'confirmed'
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# Program Name:         test_csv_engines.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests that every csv engine rejects bad rows the same way
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import csv
+
+import pytest
+
+from datetime import datetime
+
+from settings import CSV_ENGINES
+from events.events import CSV_NA_VALUES, csv_file_events, make_event_id
+
+
+# ::Functions --------------------------------------------------------------------- #
+def write_csv(path, *dates: str) -> str:
+    rows = [f'COSC-2436,Programming,Lab {i},Lab,{date},Blackboard' for i, date in enumerate(dates)]
+    path.write_text(
+        'course_key,course_name,asg_name,asg_desc,due_date,due_location\n' + '\n'.join(rows) + '\n'
+    )
+
+    return str(path)
+
+def row_by_row_events(path: str, date_format: str) -> list[dict]:
+    '''
+    Builds event bodies one row at a time with the csv module and strptime,
+    the baseline the vectorized transform has to match
+    '''
+    bodies = []
+
+    with open(path, newline='', encoding='utf-8') as in_file:
+        for row in csv.DictReader(in_file):
+            row = {key: '' if val in CSV_NA_VALUES else val for key, val in row.items()}
+            date = datetime.strptime(row['due_date'].strip(), date_format).strftime('%Y-%m-%d')
+
+            bodies.append({
+                'id': make_event_id(row['course_key'], row['asg_name'], date),
+                'summary': f"{row['course_key']}: {row['asg_name']}",
+                'location': row['due_location'],
+                'description': f"{row['course_name']}<br>{row['asg_desc']}",
+                'start': {'date': date},
+                'end': {'date': date}
+            })
+
+    return bodies
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+@pytest.mark.parametrize('engine', CSV_ENGINES)
+def test_empty_due_date_is_one_value_error(tmp_path, engine):
+    path = write_csv(tmp_path / 'asg.csv', '01/02/2024', '')
+
+    with pytest.raises(ValueError, match='"due_date" has empty values'):
+        list(csv_file_events(path, '%m/%d/%Y', csv_engine=engine))
+
+@pytest.mark.parametrize('engine', CSV_ENGINES)
+def test_engines_read_the_same_events(tmp_path, engine):
+    path = write_csv(tmp_path / 'asg.csv', '01/02/2024', '03/04/2024')
+    events = list(csv_file_events(path, '%m/%d/%Y', csv_engine=engine))
+
+    assert [event.get('start') for event in events] == [{'date': '2024-01-02'}, {'date': '2024-03-04'}]
+
+@pytest.mark.parametrize('engine', CSV_ENGINES)
+def test_header_only_file_has_no_events(tmp_path, engine):
+    # e.g. the template csv that init_dirs writes to the input directory
+    path = write_csv(tmp_path / 'template.csv')
+
+    assert list(csv_file_events(path, '%m/%d/%Y', csv_engine=engine)) == []
+
+def test_every_engine_builds_identical_events(tmp_path):
+    path = write_csv(tmp_path / 'asg.csv', '01/02/2024', '03/04/2024', '01/02/2024')
+    built = {engine: list(csv_file_events(path, '%m/%d/%Y', csv_engine=engine)) for engine in CSV_ENGINES}
+
+    assert all(events == built['c'] for events in built.values())
+    assert [event.id for event in built['c']] == [
+        make_event_id('COSC-2436', f'Lab {i}', date)
+        for i, date in enumerate(['2024-01-02', '2024-03-04', '2024-01-02'])
+    ]
+
+@pytest.mark.parametrize('engine', CSV_ENGINES)
+def test_engines_match_the_row_by_row_baseline(tmp_path, engine):
+    path = tmp_path / 'asg.csv'
+    path.write_text(
+        'course_key,course_name,asg_name,asg_desc,due_date,due_location\n'
+        'COSC-2436,Programming,Lab 1,Lab,01/02/2024,Blackboard\n'
+        'COSC-2436,,Lab 2,NA,  03/04/2024 ,\n'
+        'COSC-2436,Programming,Lab 3,,1/5/2024,Room 101\n'
+        'COSC-2436,Programming,Lab 1,Lab,01/02/2024,Blackboard\n'
+    )
+    expected = row_by_row_events(str(path), '%m/%d/%Y')
+    events = list(csv_file_events(str(path), '%m/%d/%Y', csv_engine=engine))
+
+    assert [event.to_body() for event in events] == expected
+    assert [body['start']['date'] for body in expected] == [
+        '2024-01-02', '2024-03-04', '2024-01-05', '2024-01-02'
+    ]
+
+@pytest.mark.parametrize('engine', CSV_ENGINES)
+@pytest.mark.parametrize('date', ['   ', 'NA'])
+def test_blank_due_dates_are_one_value_error(tmp_path, engine, date):
+    path = write_csv(tmp_path / 'asg.csv', '01/02/2024', date)
+
+    with pytest.raises(ValueError, match='"due_date" has empty values'):
+        list(csv_file_events(path, '%m/%d/%Y', csv_engine=engine))
+
+@pytest.mark.parametrize('engine', CSV_ENGINES)
+def test_a_date_in_another_format_is_a_value_error(tmp_path, engine):
+    path = write_csv(tmp_path / 'asg.csv', '01/02/2024', '2024-03-04')
+
+    with pytest.raises(ValueError):
+        list(csv_file_events(path, '%m/%d/%Y', csv_engine=engine))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# Program Name:         test_dates.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests due date format inference and parsing
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import pandas as pd
+
+from settings import DATE_FORMATS
+from events.dates import DueDateConverter, infer_date_format, parse_dates, sample_column
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def test_infers_the_only_matching_format():
+    assert infer_date_format(['2024-01-15', '2024-12-31'], DATE_FORMATS) == '%Y-%m-%d'
+    assert infer_date_format(['01/15/2024', '12/31/2024'], DATE_FORMATS) == '%m/%d/%Y'
+    assert infer_date_format(['15/01/2024', '31/12/2024'], DATE_FORMATS) == '%d/%m/%Y'
+
+def test_ambiguous_samples_pick_the_first_format():
+    # Every value fits both month-first and day-first; DATE_FORMATS prefers month-first
+    assert infer_date_format(['01/02/2024', '03/04/2024'], DATE_FORMATS) == '%m/%d/%Y'
+    assert infer_date_format(['01/02/2024'], ['%d/%m/%Y', '%m/%d/%Y']) == '%d/%m/%Y'
+
+def test_unmatched_samples_return_none():
+    assert infer_date_format(['2024-01-15', 'next friday'], DATE_FORMATS) is None
+    assert infer_date_format(['13/13/2024'], DATE_FORMATS) is None
+
+def test_empty_samples_return_none():
+    assert infer_date_format([], DATE_FORMATS) is None
+
+def test_padded_values_parse_with_the_sampled_format(tmp_path):
+    path = tmp_path / 'asg.csv'
+    path.write_text('due_date\n 01/15/2024\n01/20/2024 \n')
+
+    samples = sample_column(str(path), 'due_date', 10)
+    date_format = infer_date_format(samples, DATE_FORMATS)
+    parsed = parse_dates(pd.Series([' 01/15/2024', '01/20/2024 ']), date_format)
+
+    assert date_format == '%m/%d/%Y'
+    assert list(parsed.dt.strftime('%Y-%m-%d')) == ['2024-01-15', '2024-01-20']
+
+def test_utc_due_dates_shift_to_the_zone():
+    converter = DueDateConverter('America/Chicago')
+
+    assert converter.convert(['2024-01-16T03:00:00Z', '2024-01-16T03:00:00+00:00', None]) == [
+        '2024-01-15', '2024-01-15', None
+    ]
+
+def test_naive_due_dates_are_local_to_the_zone():
+    converter = DueDateConverter('America/Chicago')
+
+    # No offset: read as Chicago time, like fromisoformat().astimezone() did
+    assert converter.convert(['2024-01-16T03:00:00', '2024-01-15T23:59:00Z']) == [
+        '2024-01-16', '2024-01-15'
+    ]
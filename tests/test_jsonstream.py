@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Program Name:         test_jsonstream.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests streaming JSON arrays out of files
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import json
+
+import pytest
+
+from events import events, jsonstream
+from events.events import json_file_events, read_jsonl_ranges
+from events.jsonstream import read_array, read_jsonl
+
+
+# ::Functions --------------------------------------------------------------------- #
+@pytest.fixture
+def opened(monkeypatch) -> list:
+    '''
+    Records every file read_array opens
+    '''
+    files = []
+
+    def record(*args, **kwargs):
+        files.append(open(*args, **kwargs))
+        return files[-1]
+
+    monkeypatch.setattr(jsonstream, 'open', record, raising=False)
+    return files
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def test_reads_the_results_array_or_a_plain_array(tmp_path):
+    export, plain = tmp_path / 'export.json', tmp_path / 'plain.json'
+    export.write_text(json.dumps({'paging': {}, 'results': [{'id': 1}, {'id': 2}]}))
+    plain.write_text(json.dumps([{'id': 3}]))
+
+    assert list(read_array(str(export), key='results')) == [{'id': 1}, {'id': 2}]
+    assert list(read_array(str(plain), key='results')) == [{'id': 3}]
+
+def test_stopping_early_closes_the_file(tmp_path, opened):
+    path = tmp_path / 'export.json'
+    path.write_text(json.dumps({'results': [{'id': 1}, {'id': 2}]}))
+
+    items = read_array(str(path), key='results')
+    assert next(items) == {'id': 1}
+
+    items.close()
+    assert opened[0].closed
+
+def test_invalid_json_closes_the_file(tmp_path, opened):
+    path = tmp_path / 'export.json'
+    path.write_text('{"results": [{"id": 1}, {"id": ')
+
+    with pytest.raises(json.JSONDecodeError):
+        list(read_array(str(path), key='results'))
+
+    assert opened[0].closed
+
+@pytest.mark.parametrize('jobs', [1, 4])
+def test_ranged_jsonl_reads_every_line_in_order(tmp_path, monkeypatch, jobs):
+    path = tmp_path / 'events.jsonl'
+    path.write_text(''.join(json.dumps({'id': i, 'summary': f'Lab {i}'}) + '\n' for i in range(500)))
+    monkeypatch.setattr(events, 'JSONL_RANGE_SIZE', 512)
+
+    assert list(read_jsonl_ranges(str(path), jobs)) == list(read_jsonl(str(path)))
+
+def test_items_that_are_not_objects_are_bad_input(tmp_path):
+    path = tmp_path / 'export.json'
+    path.write_text(json.dumps({'results': [{'id': 1}, 'Lab 2']}))
+
+    with pytest.raises(ValueError, match='Item 2 .* is a str'):
+        list(json_file_events(str(path)))
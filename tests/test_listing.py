@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# Program Name:         test_listing.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests listing and displaying upcoming Calendar events
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import os
+
+from settings import LIST_FIELDS, SYNC_FIELDS, EVENT_CACHE
+from events import events
+
+
+# ::Functions --------------------------------------------------------------------- #
+def page(*ids: str, next_page: str | None = None) -> dict:
+    items = [
+        {'id': event_id, 'summary': f'Lab {event_id}', 'start': {'date': '2099-01-15'}}
+        for event_id in ids
+    ]
+    return {'items': items, **({'nextPageToken': next_page} if next_page else {})}
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def test_display_streams_upcoming_events_with_partial_responses(calendar, monkeypatch):
+    monkeypatch.setattr(events, 'display_IntPrompt', lambda *args, **kwargs: 3)
+    monkeypatch.setattr(events.Confirm, 'ask', lambda *args, **kwargs: False)
+
+    pages = {None: page('a', 'b', next_page='p2'), 'p2': page('c', 'd')}
+    calendar.service.handler = lambda method, params: pages[params['pageToken']]
+
+    assert calendar.events().display_events()
+
+    lists = [params for method, params in calendar.service.calls if method == 'list']
+    assert [params['pageToken'] for params in lists] == [None, 'p2']
+    assert all(params['fields'] == LIST_FIELDS and 'timeMin' in params for params in lists)
+    assert all(params['maxResults'] == 3 and 'syncToken' not in params for params in lists)
+    assert not os.path.exists(EVENT_CACHE)
+
+def test_cached_display_is_opt_in_and_projects_fields(calendar, monkeypatch):
+    monkeypatch.setattr(events, 'display_IntPrompt', lambda *args, **kwargs: 2)
+    monkeypatch.setattr(events.Confirm, 'ask', lambda *args, **kwargs: False)
+
+    calendar.service.handler = lambda method, params: {**page('a', 'b', 'c'), 'nextSyncToken': 's1'}
+    service = calendar.events()
+
+    assert service.display_cached_events()
+
+    params = next(params for method, params in calendar.service.calls if method == 'list')
+    assert params['fields'] == SYNC_FIELDS and params['showDeleted']
+    assert os.path.exists(EVENT_CACHE)
+
+    # The next display only asks for the changes since the stored token
+    calendar.service.calls.clear()
+    assert service.display_cached_events()
+
+    params = next(params for method, params in calendar.service.calls if method == 'list')
+    assert params['syncToken'] == 's1'
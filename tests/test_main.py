@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# Program Name:         test_main.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests the exit codes and JSON summaries of the headless commands
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import json
+
+import sqlite3
+
+import pytest
+
+from typer.testing import CliRunner
+
+from httplib2 import ServerNotFoundError
+
+import main
+
+from events import AuthRequired
+
+
+
+# ::Functions --------------------------------------------------------------------- #
+class FailingEvents:
+    '''
+    Stands in for Events, raising error from every command
+    '''
+    error: Exception = None
+
+    def __init__(self, **options) -> None:
+        pass
+
+    def list_to(self, limit, save) -> dict:
+        raise FailingEvents.error
+
+
+def write_course(path, *dates: str) -> None:
+    rows = [f'{path.stem},Programming,Lab {i},Lab,{date},Blackboard' for i, date in enumerate(dates)]
+    path.write_text(
+        'course_key,course_name,asg_name,asg_desc,due_date,due_location\n' + '\n'.join(rows) + '\n'
+    )
+
+def run_list(monkeypatch, tmp_path, error: Exception):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, 'Events', FailingEvents)
+    FailingEvents.error = error
+
+    return CliRunner().invoke(main.app, ['list'])
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+@pytest.mark.parametrize('error, code', [
+    (ValueError('bad date'), main.EXIT_BAD_INPUT),
+    (FileNotFoundError('no file'), main.EXIT_BAD_INPUT),
+    (ConnectionError('offline'), main.EXIT_API_ERROR),
+    (ServerNotFoundError('Unable to find the server'), main.EXIT_API_ERROR),
+    (AuthRequired('No usable token'), main.EXIT_API_ERROR),
+    (PermissionError('output/events.json'), main.EXIT_LOCAL_ERROR),
+    (sqlite3.OperationalError('database is locked'), main.EXIT_LOCAL_ERROR)
+])
+def test_errors_print_a_summary_and_exit_code(monkeypatch, tmp_path, error, code):
+    result = run_list(monkeypatch, tmp_path, error)
+    summary = json.loads(result.stdout)
+
+    assert result.exit_code == code
+    assert summary['status'] == 'error'
+    assert str(error) in summary['error']
+
+def test_bugs_are_not_reported_as_bad_input(monkeypatch, tmp_path):
+    result = run_list(monkeypatch, tmp_path, KeyError('start'))
+
+    assert isinstance(result.exception, KeyError)
+
+def test_bugs_are_not_reported_as_api_errors(monkeypatch, tmp_path):
+    result = run_list(monkeypatch, tmp_path, RuntimeError('dictionary changed size during iteration'))
+
+    assert isinstance(result.exception, RuntimeError)
+
+def test_ingest_skips_a_bad_file_and_creates_the_rest(tmp_path, calendar):
+    (tmp_path / 'courses').mkdir()
+    write_course(tmp_path / 'courses' / 'COSC-1336.csv', '01/15/2024', '01/22/2024')
+    write_course(tmp_path / 'courses' / 'COSC-1437.csv', '01/15/2024', 'not a date')
+    write_course(tmp_path / 'courses' / 'COSC-2436.csv', '02/01/2024')
+
+    result = CliRunner().invoke(
+        main.app, ['--processes', '2', 'ingest', 'courses', '--date-format', '%m/%d/%Y']
+    )
+    summary = json.loads(result.stdout)
+
+    assert result.exit_code == main.EXIT_FAILED
+    assert summary['skipped'] == 1
+    assert summary['created'] == 3
+    assert [item['events'] for item in summary['files']] == [2, 0, 1]
+    assert 'COSC-1437.csv' in next(item['file'] for item in summary['files'] if item['error'])
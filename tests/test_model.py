@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# Program Name:         test_model.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests the Event record against the request body it stands for
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import pickle
+
+from events.model import Event
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def test_get_matches_the_request_body():
+    for event in (
+        Event('e1', 'CS1', 'Lab 1', '2024-01-15', 'Blackboard', 'Read chapter 1'),
+        Event('e2', 'CS1', 'Lab 2', '2024-01-20')
+    ):
+        body = event.to_body()
+
+        for key in ('id', 'summary', 'location', 'start', 'end', 'description', 'colorId'):
+            assert event.get(key, 'missing') == body.get(key, 'missing')
+
+def test_equal_events_hash_alike():
+    event = Event('e1', 'CS1', 'Lab 1', '2024-01-15')
+    copy = pickle.loads(pickle.dumps(event))
+
+    assert copy == event
+    assert len({event, copy}) == 1
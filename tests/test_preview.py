@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# Program Name:         test_preview.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests previewing rows whose keys differ
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+from events.preview import record_columns
+from events.events import preview_table
+
+
+# ::GLOBALS ------------------------------------------------------------------------ #
+ROWS = [
+    {'id': 'e1', 'summary': 'CS1: Lab 1'},
+    {'summary': 'CS1: Lab 2', 'description': 'Read chapter 2', 'id': 'e2'},
+    {'id': 'e3', 'location': 'Blackboard'}
+]
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def test_columns_are_the_union_of_the_shown_rows():
+    assert record_columns(ROWS, [0, 1, 2]) == ['id', 'summary', 'description', 'location']
+    assert record_columns(ROWS, [0, 2]) == ['id', 'summary', 'location']
+
+def test_cells_line_up_under_their_own_columns():
+    table = preview_table('events', None, ROWS, [0, 1, 2])
+    cells = {column.header: list(column.cells) for column in table.columns}
+
+    assert cells['id'] == ['e1', 'e2', 'e3']
+    assert cells['summary'] == ['CS1: Lab 1', 'CS1: Lab 2', '']
+    assert cells['description'] == ['', 'Read chapter 2', '']
+    assert cells['location'] == ['', '', 'Blackboard']
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# Program Name:         test_retry.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests retrying rate limited and failed Calendar batch requests
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import pytest
+
+from collections import Counter
+
+from settings import MAX_RETRIES
+from fakes import http_error
+from events.model import Event
+from events.ratelimit import is_retryable
+
+
+# ::Functions --------------------------------------------------------------------- #
+def labs(count: int) -> list[Event]:
+    return [Event(f'lab{i}', 'CS1', f'Lab {i}', '2024-01-15') for i in range(count)]
+
+def attempts(calendar) -> Counter:
+    '''
+    Counts the inserts sent for each event id
+    '''
+    return Counter(params['body']['id'] for method, params in calendar.service.calls if method == 'insert')
+
+def failing(ids: set[str], status: int, times: int | None = None, headers: dict | None = None):
+    '''
+    Fails inserts of ids with status, times times each (every time if None)
+    '''
+    failures = Counter()
+
+    def handler(method, params):
+        event_id = params.get('body', {}).get('id')
+
+        if method == 'insert' and event_id in ids and (times is None or failures[event_id] < times):
+            failures[event_id] += 1
+            raise http_error(status, 'backendError', headers)
+
+    return handler
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+@pytest.mark.parametrize('status, reason, retryable', [
+    (429, 'rateLimitExceeded', True),
+    (500, 'backendError', True),
+    (503, 'backendError', True),
+    (403, 'rateLimitExceeded', True),
+    (403, 'userRateLimitExceeded', True),
+    (403, 'forbidden', False),
+    (400, 'invalid', False),
+    (404, 'notFound', False),
+    (409, 'duplicate', False)
+])
+def test_only_rate_limit_and_server_errors_are_retryable(status, reason, retryable):
+    assert is_retryable(http_error(status, reason)) is retryable
+
+def test_only_throttled_items_are_resent_after_retry_after(calendar):
+    calendar.service.handler = failing({'lab3'}, 429, times=1, headers={'retry-after': '7'})
+    summary = calendar.events().create_from(labs(10), save=False)
+
+    assert summary['failed'] == 0
+    assert attempts(calendar) == Counter({f'lab{i}': 2 if i == 3 else 1 for i in range(10)})
+    # The whole batch went first, then only the throttled item
+    assert calendar.service.batches == [10]
+    assert calendar.sleeps == [7.0]
+
+def test_batch_level_failures_resend_every_item(calendar, monkeypatch):
+    from events import events
+
+    def sleep(delay: float) -> None:
+        calendar.sleeps.append(delay)
+        calendar.service.batch_error = None
+
+    calendar.service.batch_error = http_error(503)
+    monkeypatch.setattr(events.time, 'sleep', sleep)
+    summary = calendar.events().create_from(labs(5), save=False)
+
+    assert summary['failed'] == 0
+    assert calendar.service.batches == [5, 5]
+    assert len(calendar.sleeps) == 1
+
+def test_an_item_gives_up_after_max_retries(calendar):
+    calendar.service.handler = failing({'lab0'}, 500)
+    summary = calendar.events().create_from(labs(1), save=False)
+
+    assert summary['failed'] == 1
+    assert attempts(calendar)['lab0'] == MAX_RETRIES + 1
+    assert len(calendar.sleeps) == MAX_RETRIES
+
+def test_the_retry_budget_is_shared_by_the_whole_run(calendar):
+    calendar.service.handler = failing({'lab0', 'lab1'}, 500)
+    summary = calendar.events(retry_budget=3).create_from(labs(2), batch_size=1, save=False)
+
+    # The first event spends the budget; the second is not retried at all
+    assert summary['failed'] == 2
+    assert attempts(calendar) == Counter({'lab0': 4, 'lab1': 1})
+    assert len(calendar.sleeps) == 3
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Program Name:         test_sink.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests journaling created events and resuming an unfinished run
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+import json
+
+from events.sink import EventSink
+
+
+# ::Functions --------------------------------------------------------------------- #
+def events(*ids: str) -> list[dict]:
+    return [{'id': event_id, 'summary': f'Lab {event_id}'} for event_id in ids]
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def test_resumed_run_does_not_journal_ids_twice(tmp_path):
+    journal, out_path = tmp_path / 'events.partial', tmp_path / 'events.json'
+
+    # A crashed run created a and b, and left half of a line behind
+    with EventSink(str(journal)) as sink:
+        sink.write(events('a', 'b'))
+
+    with open(journal, 'a', encoding='utf-8') as out_file:
+        out_file.write('{"id": "c", "sum')
+
+    # Re-running the file resolves a and b as conflicts and creates c
+    with EventSink(str(journal)) as sink:
+        assert sink.resumed
+        assert sink.write(events('a', 'b', 'c')) == 1
+
+    count = sink.finalize(str(out_path))
+
+    with open(out_path, 'r', encoding='utf-8') as in_file:
+        assert [event['id'] for event in json.load(in_file)] == ['a', 'b', 'c']
+
+    assert count == 3
+
+def test_new_journal_replaces_an_old_one(tmp_path):
+    journal = tmp_path / 'events.partial'
+
+    with EventSink(str(journal)) as sink:
+        sink.write(events('a'))
+
+    with EventSink(str(journal), append=False) as sink:
+        assert not sink.resumed
+        assert sink.write(events('a')) == 1
+
+def test_only_resumed_ids_are_held(tmp_path):
+    journal = tmp_path / 'events.partial'
+
+    with EventSink(str(journal)) as sink:
+        assert sink.resumed_ids == frozenset()
+        sink.write(events('a', 'b'))
+        assert sink.resumed_ids == frozenset()
+
+    with EventSink(str(journal)) as sink:
+        assert sink.resumed_ids == {'a', 'b'}
+        sink.write(events('c'))
+        assert sink.resumed_ids == {'a', 'b'}
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# Program Name:         test_sync.py
+# Program Author:       Lew Kim
+# Date Created:         10/21/24
+# Program Description:
+#   Tests sync planning against stored records
+
+# ::IMPORTS ------------------------------------------------------------------------ #
+from events.sync import SyncStore, plan_sync, content_hash
+from events.model import Event
+
+
+# ::Functions --------------------------------------------------------------------- #
+def event(summary: str, date: str = '2024-01-15', **fields) -> dict:
+    return {'summary': summary, 'start': {'date': date}, 'end': {'date': date}, **fields}
+
+def stored(*events: tuple[str, dict, str]) -> dict:
+    '''
+    Builds SyncStore.records output from (key, event, event_id)
+    '''
+    return {key: (content_hash(body), event_id) for key, body, event_id in events}
+
+
+# ::CORE LOGIC --------------------------------------------------------------------- #
+def test_new_records_are_inserted():
+    plan = plan_sync([event('CS1: Lab 1'), event('CS1: Lab 2')], {})
+
+    assert [key for key, _, _ in plan.inserts] == ['CS1: Lab 1', 'CS1: Lab 2']
+    assert not plan.patches and not plan.deletes
+    assert plan.calls == 2
+    assert plan.avoided == 0
+
+def test_unchanged_records_send_nothing():
+    lab = event('CS1: Lab 1')
+    plan = plan_sync([lab], stored(('CS1: Lab 1', lab, 'e1')))
+
+    assert plan.calls == 0
+    assert plan.unchanged == 1
+    # A re-create would delete the stored event and insert it again
+    assert plan.avoided == 2
+
+def test_changed_records_are_patched_without_their_id():
+    old = event('CS1: Lab 1')
+    new = event('CS1: Lab 1', date='2024-01-20', id='ignored')
+    plan = plan_sync([new], stored(('CS1: Lab 1', old, 'e1')))
+
+    assert len(plan.patches) == 1
+    key, digest, event_id, body = plan.patches[0]
+    assert (key, event_id) == ('CS1: Lab 1', 'e1')
+    assert digest == content_hash(new)
+    assert 'id' not in body and body['start'] == {'date': '2024-01-20'}
+
+def test_removed_records_are_deleted():
+    lab1, lab2 = event('CS1: Lab 1'), event('CS1: Lab 2')
+    plan = plan_sync([lab1], stored(('CS1: Lab 1', lab1, 'e1'), ('CS1: Lab 2', lab2, 'e2')))
+
+    assert plan.deletes == [('CS1: Lab 2', 'e2')]
+    assert plan.calls == 1
+    assert plan.avoided == 2 + 1 - 1
+
+def test_repeated_summaries_get_running_keys():
+    plan = plan_sync([event('CS1: Quiz'), event('CS1: Quiz', '2024-02-01'), event('CS1: Quiz')], {})
+
+    assert [key for key, _, _ in plan.inserts] == ['CS1: Quiz', 'CS1: Quiz#2', 'CS1: Quiz#3']
+
+def test_repeated_summaries_match_their_own_records():
+    first, second = event('CS1: Quiz'), event('CS1: Quiz', '2024-02-01')
+    records = stored(('CS1: Quiz', first, 'e1'), ('CS1: Quiz#2', second, 'e2'))
+
+    # Dropping the second quiz deletes its event, not the first one's
+    plan = plan_sync([first], records)
+
+    assert plan.deletes == [('CS1: Quiz#2', 'e2')]
+    assert plan.unchanged == 1
+
+def test_store_keeps_sources_apart(tmp_path):
+    with SyncStore(str(tmp_path / 'sync.db')) as store:
+        store.upsert('/fall/COSC-2436.csv', [('CS1: Lab 1', 'd1', 'e1')])
+        store.upsert('/spring/COSC-2436.csv', [('CS1: Lab 1', 'd2', 'e2')])
+
+        assert store.records('/fall/COSC-2436.csv') == {'CS1: Lab 1': ('d1', 'e1')}
+        assert store.records('/spring/COSC-2436.csv') == {'CS1: Lab 1': ('d2', 'e2')}
+
+def test_same_day_repeats_get_their_own_event_ids():
+    quiz = event('CS1: Quiz', id='e1')
+    plan = plan_sync([quiz, dict(quiz), dict(quiz)], {})
+    ids = [body['id'] for _, _, body in plan.inserts]
+
+    # The first keeps the id create would give it; each repeat gets its own
+    assert ids[0] == 'e1'
+    assert len(set(ids)) == 3
+    assert plan_sync([quiz, dict(quiz)], {}).inserts[1][2]['id'] == ids[1]
+
+def test_removing_a_same_day_repeat_keeps_the_other_event(calendar, tmp_path):
+    quiz = Event('quiz-id', 'CS1', 'Quiz', '2024-01-15', 'Blackboard')
+    source = str(tmp_path / 'COSC-2436.csv')
+    service = calendar.events()
+
+    assert service.sync_from([quiz, quiz], source)['inserted'] == 2
+    assert len(calendar.service.events_by_id) == 2
+
+    summary = service.sync_from([quiz], source)
+
+    assert (summary['deleted'], summary['unchanged'], summary['failed']) == (1, 1, 0)
+    assert list(calendar.service.events_by_id) == ['quiz-id']